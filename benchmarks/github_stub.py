@@ -0,0 +1,223 @@
+"""
+🧪 Stub local da API do GitHub para benchmarks
+
+Servidor aiohttp em processo que responde aos endpoints usados pelas
+ferramentas, com latência, tamanho de payload, paginação, ETags e cabeçalhos
+de rate limit configuráveis. Não acessa a rede.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import socket
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+
+@dataclass
+class StubConfig:
+    org_size: int = 50               # repositórios na organização (1 em cada 5 não é xcloud-*)
+    latency: float = 0.005           # atraso por requisição, em segundos
+    jitter: float = 0.0              # variação aleatória somada à latência
+    payload_bytes: int = 512         # preenchimento da descrição de cada repositório
+    runs_per_repo: int = 30          # runs de workflow por repositório
+    max_per_page: int = 100          # limite de per_page, como no GitHub
+    etags: bool = True               # responde 304 para If-None-Match válido
+    rate_limit: int = 5000           # X-RateLimit-Limit
+    seed: int = 42
+
+
+def repo_name(index: int) -> str:
+    return f"other-{index:04d}" if index % 5 == 4 else f"xcloud-{index:04d}"
+
+
+class GitHubStub:
+    """Stub da API REST do GitHub servido em ``127.0.0.1`` numa porta livre."""
+
+    def __init__(self, config: Optional[StubConfig] = None):
+        self.config = config or StubConfig()
+        self.base_url = ""
+        self.requests = 0
+        self.not_modified = 0
+        self.issues_created = 0
+        self.charged = 0
+        self._random = random.Random(self.config.seed)
+        self._runner: Optional[web.AppRunner] = None
+
+        app = web.Application()
+        app.router.add_get("/orgs/{org}/repos", self._org_repos)
+        app.router.add_get("/repos/{owner}/{repo}", self._repo)
+        app.router.add_get("/repos/{owner}/{repo}/actions/workflows", self._workflows)
+        app.router.add_get("/repos/{owner}/{repo}/actions/runs", self._runs)
+        app.router.add_post("/repos/{owner}/{repo}/issues", self._create_issue)
+        self.app = app
+
+    async def start(self) -> str:
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(("127.0.0.1", 0))
+        await web.SockSite(self._runner, sock).start()
+        port = sock.getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self.base_url
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "GitHubStub":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    # Dados determinísticos da organização
+
+    def _repo_data(self, owner: str, index: int) -> Dict:
+        name = repo_name(index)
+        return {
+            "id": 1000 + index,
+            "name": name,
+            "full_name": f"{owner}/{name}",
+            "description": f"Repositório {name} " + "x" * self.config.payload_bytes,
+            "language": ("Python", "TypeScript", "Go")[index % 3],
+            "html_url": f"https://github.com/{owner}/{name}",
+            "stargazers_count": index * 3,
+            "forks_count": index,
+        }
+
+    def _index(self, repo: str) -> Optional[int]:
+        try:
+            index = int(repo.rsplit("-", 1)[1])
+        except (IndexError, ValueError):
+            return None
+        return index if 0 <= index < self.config.org_size and repo_name(index) == repo else None
+
+    def _run_data(self, owner: str, repo: str, index: int, number: int) -> Dict:
+        created = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(1_700_000_000 - number * 600))
+        sha = hashlib.sha1(f"{repo}{number}".encode()).hexdigest()
+        actor = {
+            "login": "xcloud-bot",
+            "id": 4242,
+            "avatar_url": "https://avatars.githubusercontent.com/u/4242?v=4",
+            "html_url": "https://github.com/xcloud-bot",
+            "type": "Bot",
+        }
+        # Como no GitHub, cada run traz objetos aninhados que as ferramentas não leem
+        return {
+            "id": index * 100_000 + number,
+            "name": "CI",
+            "status": "completed",
+            "conclusion": "failure" if (index + number) % 4 == 0 else "success",
+            "head_branch": "main",
+            "head_sha": sha,
+            "actor": actor,
+            "triggering_actor": actor,
+            "created_at": created,
+            "updated_at": created,
+            "html_url": f"https://github.com/{owner}/{repo}/actions/runs/{number}",
+            "head_commit": {
+                "id": sha,
+                "message": f"Commit {number} em {repo}",
+                "author": {"name": "xCloud Bot", "email": "bot@xcloud.dev"},
+            },
+            "repository": self._repo_data(owner, index),
+            "head_repository": self._repo_data(owner, index),
+        }
+
+    # Handlers
+
+    async def _org_repos(self, request: web.Request) -> web.Response:
+        org = request.match_info["org"]
+        repos = [self._repo_data(org, index) for index in range(self.config.org_size)]
+        return await self._paginated(request, repos)
+
+    async def _repo(self, request: web.Request) -> web.Response:
+        owner, repo = request.match_info["owner"], request.match_info["repo"]
+        index = self._index(repo)
+        if index is None:
+            return await self._respond(request, {"message": "Not Found"}, status=404)
+        return await self._respond(request, self._repo_data(owner, index))
+
+    async def _workflows(self, request: web.Request) -> web.Response:
+        index = self._index(request.match_info["repo"])
+        if index is None:
+            return await self._respond(request, {"message": "Not Found"}, status=404)
+        workflows = [] if index % 3 == 0 else [
+            {"id": 1, "name": "CI", "path": ".github/workflows/ci.yml", "state": "active"},
+            {"id": 2, "name": "Deploy", "path": ".github/workflows/deploy.yml", "state": "disabled_manually"},
+        ]
+        return await self._respond(request, {"total_count": len(workflows), "workflows": workflows})
+
+    async def _runs(self, request: web.Request) -> web.Response:
+        owner, repo = request.match_info["owner"], request.match_info["repo"]
+        index = self._index(repo)
+        if index is None:
+            return await self._respond(request, {"message": "Not Found"}, status=404)
+        runs = [self._run_data(owner, repo, index, number) for number in range(self.config.runs_per_repo)]
+        return await self._paginated(request, runs, items_key="workflow_runs")
+
+    async def _create_issue(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        self.issues_created += 1
+        owner, repo = request.match_info["owner"], request.match_info["repo"]
+        issue = {
+            "number": self.issues_created,
+            "title": data.get("title"),
+            "html_url": f"https://github.com/{owner}/{repo}/issues/{self.issues_created}",
+        }
+        return await self._respond(request, issue, status=201)
+
+    # Resposta comum: latência, paginação, ETag e rate limit
+
+    async def _paginated(self, request: web.Request, items: List[Dict], items_key: Optional[str] = None) -> web.Response:
+        per_page = min(int(request.query.get("per_page", "30")), self.config.max_per_page)
+        page = max(int(request.query.get("page", "1")), 1)
+        chunk = items[(page - 1) * per_page:page * per_page]
+        body = {"total_count": len(items), items_key: chunk} if items_key else chunk
+
+        headers = {}
+        last = max((len(items) + per_page - 1) // per_page, 1)
+        if page < last:
+            query = dict(request.query, page=str(page + 1))
+            next_url = request.url.with_query(query)
+            headers["Link"] = f'<{self.base_url}{next_url.path_qs}>; rel="next"'
+        return await self._respond(request, body, headers=headers)
+
+    async def _respond(self, request: web.Request, body, status: int = 200, headers: Optional[Dict] = None) -> web.Response:
+        self.requests += 1
+        delay = self.config.latency + (self._random.random() * self.config.jitter if self.config.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        raw = json.dumps(body, separators=(",", ":")).encode()
+        headers = dict(headers or {})
+        if self.config.etags and request.method == "GET" and status == 200:
+            etag = '"' + hashlib.sha1(raw).hexdigest() + '"'
+            headers["ETag"] = etag
+            if request.headers.get("If-None-Match") == etag:
+                # Respostas 304 não consomem o rate limit do GitHub
+                self.not_modified += 1
+                return web.Response(status=304, headers={**headers, **self._rate_limit_headers(charge=False)})
+
+        headers.update(self._rate_limit_headers(charge=True))
+        return web.Response(body=raw, status=status, headers=headers, content_type="application/json")
+
+    def _rate_limit_headers(self, charge: bool) -> Dict[str, str]:
+        if charge:
+            self.charged += 1
+        limit = self.config.rate_limit
+        used = self.charged % limit
+        return {
+            "X-RateLimit-Limit": str(limit),
+            "X-RateLimit-Remaining": str(limit - used),
+            "X-RateLimit-Reset": str(int(time.time()) + 3600),
+            "X-RateLimit-Resource": "core",
+        }
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+🚦 Teste de carga ponta a ponta dos transportes HTTP/SSE
+
+Sobe o servidor MCP em um subprocesso apontado para o stub local da API do
+GitHub, abre N sessões MCP concorrentes em cada transporte e repete uma
+mistura configurável de chamadas de ferramentas. Reporta tempo de abertura
+de sessão, percentis de latência por ferramenta, taxa de erro e memória do
+servidor (RSS), para dimensionar a instância atrás do ``deploy/nginx.conf``.
+
+Uso:
+    python benchmarks/load.py --transports http,sse --sessions 10,50,100 --output load.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+from fastmcp import Client
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.github_stub import GitHubStub, StubConfig, repo_name  # noqa: E402
+from benchmarks.stats import percentile  # noqa: E402
+
+SERVER_SCRIPT = os.path.join(ROOT, "src", "xcloud_mcp", "main.py")
+ORG = "PageCloudv1"
+
+# Caminho do endpoint MCP por transporte (padrões do FastMCP)
+TRANSPORT_PATHS = {"http": "/mcp", "streamable-http": "/mcp", "sse": "/sse"}
+
+DEFAULT_MIX = "monitor_ci_status=5,analyze_repository=3,get_xcloud_repositories=1,create_workflow_issue=1"
+
+# Por padrão o agendador de rate limit não limita o stub: mede-se o transporte.
+# Use --server-env para reproduzir a configuração de produção.
+DEFAULT_SERVER_ENV = {
+    "X_CLOUD_MCP_RATE_LIMIT_RATE": "100000",
+    "X_CLOUD_MCP_RATE_LIMIT_BURST": "100000",
+    # create_workflow_issue entra no mix; o espaçamento de 1s serializaria as sessões
+    "X_CLOUD_MCP_CONTENT_CREATION_INTERVAL": "0",
+}
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """``tool=peso,...`` -> pesos por ferramenta."""
+    mix = {}
+    for item in value.split(","):
+        if not item:
+            continue
+        tool, _, weight = item.partition("=")
+        mix[tool.strip()] = int(weight or 1)
+    return mix
+
+
+def tool_arguments(tool: str, rng: random.Random, org_size: int) -> Dict:
+    xcloud = [repo_name(index) for index in range(org_size) if repo_name(index).startswith("xcloud-")]
+    repo = f"{ORG}/{rng.choice(xcloud)}"
+    if tool == "analyze_repository":
+        return {"repo_url": repo}
+    if tool == "analyze_repositories":
+        return {"repos": [f"{ORG}/{name}" for name in rng.sample(xcloud, min(5, len(xcloud)))]}
+    if tool == "monitor_ci_status":
+        return {"repo": repo, "limit": 10}
+    if tool == "create_workflow_issue":
+        return {"repo": repo, "workflow_type": rng.choice(["ci", "cd", "build"])}
+    return {}
+
+
+class StubThread:
+    """Stub do GitHub em uma thread com event loop próprio, isolado da carga dos clientes."""
+
+    def __init__(self, config: StubConfig):
+        self.stub = GitHubStub(config)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> str:
+        self._thread.start()
+        self._ready.wait()
+        return self.stub.base_url
+
+    def stop(self) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+        self._thread.join()
+
+    def _run(self) -> None:
+        asyncio.run(self._serve())
+
+    async def _serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        async with self.stub:
+            self._ready.set()
+            await self._stopped.wait()
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_rss(pid: int) -> Optional[int]:
+    """RSS do processo em bytes (Linux; ``None`` em outras plataformas)."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+async def start_server(
+    transport: str,
+    api_base: str,
+    log_path: Optional[str],
+    server_env: Optional[Dict[str, str]] = None,
+) -> Tuple[subprocess.Popen, str]:
+    """Inicia o servidor e espera o /health responder."""
+    port = _free_port()
+    env = dict(
+        os.environ,
+        **DEFAULT_SERVER_ENV,
+        **(server_env or {}),
+        GITHUB_TOKEN="load-test-token",
+        X_CLOUD_MCP_GITHUB_API_BASE=api_base,
+        X_CLOUD_MCP_TRANSPORT=transport,
+        X_CLOUD_MCP_HOST="127.0.0.1",
+        X_CLOUD_MCP_PORT=str(port),
+    )
+    log = open(log_path, "ab") if log_path else subprocess.DEVNULL
+    process = subprocess.Popen([sys.executable, SERVER_SCRIPT], env=env, stdout=log, stderr=log)
+    base_url = f"http://127.0.0.1:{port}"
+
+    deadline = time.monotonic() + 30
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"Servidor encerrou na inicialização (código {process.returncode}).")
+            try:
+                async with session.get(f"{base_url}/health") as response:
+                    if response.status == 200:
+                        return process, base_url
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Servidor não respondeu /health em 30s.")
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+async def run_session(
+    url: str,
+    mix: Dict[str, int],
+    calls: int,
+    org_size: int,
+    seed: int,
+    timeout: float,
+) -> Dict:
+    """Abre uma sessão MCP, executa ``calls`` chamadas e mede cada etapa."""
+    rng = random.Random(seed)
+    tools, weights = list(mix), list(mix.values())
+    latencies: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    setup = None
+
+    started = time.perf_counter()
+    try:
+        async with Client(url, timeout=timeout) as client:
+            setup = time.perf_counter() - started
+            for _ in range(calls):
+                tool = rng.choices(tools, weights)[0]
+                call_started = time.perf_counter()
+                try:
+                    result = await client.call_tool(
+                        tool, tool_arguments(tool, rng, org_size), raise_on_error=False
+                    )
+                    content = result.structured_content or {}
+                    failed = result.is_error or (
+                        isinstance(content.get("result", content), dict) and "error" in content.get("result", content)
+                    )
+                except Exception:
+                    failed = True
+                latencies.setdefault(tool, []).append(time.perf_counter() - call_started)
+                if failed:
+                    errors[tool] = errors.get(tool, 0) + 1
+    except Exception as e:
+        return {"setup": setup, "latencies": latencies, "errors": errors, "session_error": str(e) or type(e).__name__}
+    return {"setup": setup, "latencies": latencies, "errors": errors, "session_error": None}
+
+
+def _ms(value: float) -> float:
+    return round(value * 1000, 3)
+
+
+async def run_level(
+    transport: str,
+    base_url: str,
+    process: subprocess.Popen,
+    sessions: int,
+    mix: Dict[str, int],
+    calls: int,
+    org_size: int,
+    timeout: float,
+) -> Dict:
+    url = base_url + TRANSPORT_PATHS[transport]
+    peak_rss = server_rss(process.pid)
+    stop_sampling = asyncio.Event()
+
+    async def sample_memory() -> None:
+        nonlocal peak_rss
+        while not stop_sampling.is_set():
+            rss = server_rss(process.pid)
+            if rss is not None:
+                peak_rss = max(peak_rss or 0, rss)
+            try:
+                await asyncio.wait_for(stop_sampling.wait(), timeout=0.2)
+            except asyncio.TimeoutError:
+                pass
+
+    sampler = asyncio.create_task(sample_memory())
+    started = time.perf_counter()
+    try:
+        results = await asyncio.gather(*(
+            run_session(url, mix, calls, org_size, seed=index, timeout=timeout)
+            for index in range(sessions)
+        ))
+    finally:
+        elapsed = time.perf_counter() - started
+        stop_sampling.set()
+        await sampler
+
+    setups = [result["setup"] for result in results if result["setup"] is not None]
+    session_errors = [result["session_error"] for result in results if result["session_error"]]
+    per_tool: Dict[str, Dict] = {}
+    all_latencies: List[float] = []
+    total_errors = 0
+    for tool in mix:
+        latencies = [value for result in results for value in result["latencies"].get(tool, [])]
+        tool_errors = sum(result["errors"].get(tool, 0) for result in results)
+        total_errors += tool_errors
+        all_latencies += latencies
+        if latencies:
+            per_tool[tool] = {
+                "calls": len(latencies),
+                "errors": tool_errors,
+                "p50_ms": _ms(percentile(latencies, 0.50)),
+                "p95_ms": _ms(percentile(latencies, 0.95)),
+                "p99_ms": _ms(percentile(latencies, 0.99)),
+            }
+
+    total_calls = len(all_latencies)
+    end_rss = server_rss(process.pid)
+    return {
+        "transport": transport,
+        "sessions": sessions,
+        "calls": total_calls,
+        "duration_s": round(elapsed, 3),
+        "throughput": round(total_calls / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round(total_errors / total_calls, 4) if total_calls else 0.0,
+        "session_errors": len(session_errors),
+        "session_error_samples": session_errors[:3],
+        "setup_p50_ms": _ms(percentile(setups, 0.50)),
+        "setup_p99_ms": _ms(percentile(setups, 0.99)),
+        "call_p50_ms": _ms(percentile(all_latencies, 0.50)),
+        "call_p99_ms": _ms(percentile(all_latencies, 0.99)),
+        "server_rss_peak_mb": round(peak_rss / 2**20, 1) if peak_rss else None,
+        "server_rss_end_mb": round(end_rss / 2**20, 1) if end_rss else None,
+        "tools": per_tool,
+    }
+
+
+async def run_load(
+    transports: List[str],
+    session_levels: List[int],
+    mix: Dict[str, int],
+    calls: int,
+    org_size: int = 50,
+    latency: float = 0.02,
+    timeout: float = 60.0,
+    server_log: Optional[str] = None,
+    server_env: Optional[Dict[str, str]] = None,
+) -> List[Dict]:
+    stub = StubThread(StubConfig(org_size=org_size, latency=latency))
+    api_base = stub.start()
+    results = []
+    try:
+        for transport in transports:
+            process, base_url = await start_server(transport, api_base, server_log, server_env)
+            try:
+                for sessions in session_levels:
+                    result = await run_level(transport, base_url, process, sessions, mix, calls, org_size, timeout)
+                    results.append(result)
+                    print(
+                        f"{transport:<16} sessões={sessions:<5} {result['throughput']:>8.1f} calls/s  "
+                        f"setup p50={result['setup_p50_ms']:>8.2f}ms  call p50={result['call_p50_ms']:>8.2f}ms  "
+                        f"p99={result['call_p99_ms']:>8.2f}ms  erros={result['error_rate']:.2%}  "
+                        f"RSS pico={result['server_rss_peak_mb']}MB",
+                        flush=True,
+                    )
+            finally:
+                stop_server(process)
+    finally:
+        stub.stop()
+    return results
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Teste de carga dos transportes MCP do xCloud MCP Server")
+    parser.add_argument("--transports", default="http,sse", help="Transportes, separados por vírgula")
+    parser.add_argument("--sessions", type=_int_list, default=[10, 50, 100], help="Sessões concorrentes por nível")
+    parser.add_argument("--calls", type=int, default=20, help="Chamadas por sessão")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Pesos das ferramentas (tool=peso,...)")
+    parser.add_argument("--org-size", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.02, help="Latência do stub do GitHub (s)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Timeout por requisição MCP (s)")
+    parser.add_argument("--server-log", help="Arquivo para a saída do servidor")
+    parser.add_argument(
+        "--server-env",
+        action="append",
+        default=[],
+        metavar="NOME=VALOR",
+        help="Variável de ambiente extra para o servidor (repetível)",
+    )
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    transports = [transport for transport in args.transports.split(",") if transport]
+    unknown = set(transports) - set(TRANSPORT_PATHS)
+    if unknown:
+        parser.error(f"Transportes desconhecidos: {', '.join(sorted(unknown))}")
+
+    logging.getLogger().setLevel(logging.WARNING)
+    mix = parse_mix(args.mix)
+    server_env = dict(item.split("=", 1) for item in args.server_env)
+    results = asyncio.run(run_load(
+        transports,
+        args.sessions,
+        mix,
+        args.calls,
+        org_size=args.org_size,
+        latency=args.latency,
+        timeout=args.timeout,
+        server_log=args.server_log,
+        server_env=server_env,
+    ))
+    if args.output:
+        report = {
+            "meta": {
+                "timestamp": datetime.now().isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+                "config": {
+                    "calls_per_session": args.calls,
+                    "mix": mix,
+                    "org_size": args.org_size,
+                    "latency": args.latency,
+                    "server_env": {**DEFAULT_SERVER_ENV, **server_env},
+                },
+            },
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+        print(f"Resultados gravados em {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
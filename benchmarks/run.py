@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+⏱️ Benchmarks das ferramentas MCP contra o stub local da API do GitHub
+
+Mede throughput e latência p50/p99 de cada ferramenta em vários níveis de
+concorrência e tamanhos de organização, e grava o resultado em JSON para
+comparação entre commits. Com ``--baseline``, sai com código 1 se algum
+cenário regredir além de ``--max-regression``.
+
+Uso:
+    python benchmarks/run.py --output bench.json
+    python benchmarks/run.py --baseline bench.json --max-regression 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, ROOT)
+
+from benchmarks.github_stub import GitHubStub, StubConfig, repo_name  # noqa: E402
+from benchmarks.stats import percentile  # noqa: E402
+from xcloud_mcp import github_client, main  # noqa: E402
+from xcloud_mcp.rate_limit import ContentPacer, RateLimitScheduler  # noqa: E402
+from xcloud_mcp.response_cache import ResponseCache  # noqa: E402
+from xcloud_mcp.run_history import RunHistoryStore  # noqa: E402
+from xcloud_mcp.singleflight import SingleFlight  # noqa: E402
+
+ORG = "PageCloudv1"
+
+# Modos de cache: sem cache, revalidação por ETag (304) a cada chamada, ou cache fresco
+CACHE_MODES = ("off", "revalidate", "fresh")
+
+
+def _repo(call: int, org_size: int) -> str:
+    xcloud = [index for index in range(org_size) if repo_name(index).startswith("xcloud-")]
+    return f"{ORG}/{repo_name(xcloud[call % len(xcloud)])}"
+
+
+# Cada ferramenta recebe (número da chamada, tamanho da organização)
+TOOLS: Dict[str, Callable[[int, int], Awaitable]] = {
+    "analyze_repository": lambda call, org_size: main.analyze_repository.fn(_repo(call, org_size)),
+    "analyze_repositories": lambda call, org_size: main.analyze_repositories.fn(
+        [_repo(call * 5 + offset, org_size) for offset in range(5)]
+    ),
+    "create_workflow_issue": lambda call, org_size: main.create_workflow_issue.fn(_repo(call, org_size), "ci"),
+    "monitor_ci_status": lambda call, org_size: main.monitor_ci_status.fn(_repo(call, org_size), limit=10),
+    "get_xcloud_repositories": lambda call, org_size: main.get_xcloud_repositories.fn(),
+}
+
+
+@contextmanager
+def isolated_server(base_url: str, cache_mode: str) -> Iterator[None]:
+    """Aponta o servidor para o stub, com cache, agendador, coalescência e histórico novos."""
+    fresh_ttl = 0.0 if cache_mode != "fresh" else ResponseCache().fresh_ttl
+    replacements = {
+        "GITHUB_TOKEN": "benchmark-token",
+        "GITHUB_API_BASE": base_url,
+        "github_cache": ResponseCache(max_entries=0 if cache_mode == "off" else 10_000, fresh_ttl=fresh_ttl),
+        # O benchmark mede o servidor, não o token bucket
+        "github_scheduler": RateLimitScheduler(rate=1e9, burst=1e9, reserve=0),
+        "github_singleflight": SingleFlight(),
+        # Nem o espaçamento de criação de conteúdo, senão mede-se o asyncio.sleep
+        "content_pacer": ContentPacer(0),
+        "recent_issue_creations": OrderedDict(),
+        "run_history_store": RunHistoryStore(),
+        "run_history_backfills": {},
+        "run_history_syncs": SingleFlight(),
+    }
+    saved = {name: getattr(main, name) for name in replacements}
+    for name, value in replacements.items():
+        setattr(main, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(main, name, value)
+
+
+def _is_error(result) -> bool:
+    return isinstance(result, dict) and "error" in result
+
+
+async def run_scenario(tool: str, org_size: int, concurrency: int, calls: int, stub: GitHubStub, cache_mode: str) -> Dict:
+    """Executa ``calls`` chamadas de ``tool`` com ``concurrency`` workers."""
+    invoke = TOOLS[tool]
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(calls))
+    requests_before, not_modified_before = stub.requests, stub.not_modified
+
+    async def worker() -> None:
+        nonlocal errors
+        for call in counter:
+            started = time.perf_counter()
+            try:
+                result = await invoke(call, org_size)
+                errors += _is_error(result)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    with isolated_server(stub.base_url, cache_mode):
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "tool": tool,
+        "org_size": org_size,
+        "concurrency": concurrency,
+        "calls": calls,
+        "errors": errors,
+        "throughput": round(calls / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "upstream_requests": stub.requests - requests_before,
+        "upstream_not_modified": stub.not_modified - not_modified_before,
+    }
+
+
+async def run_suite(
+    tools: List[str],
+    org_sizes: List[int],
+    concurrency_levels: List[int],
+    calls: int,
+    latency: float = 0.005,
+    payload_bytes: int = 512,
+    cache_mode: str = "revalidate",
+) -> List[Dict]:
+    results = []
+    try:
+        for org_size in org_sizes:
+            config = StubConfig(
+                org_size=org_size,
+                latency=latency,
+                payload_bytes=payload_bytes,
+                etags=cache_mode != "off",
+            )
+            async with GitHubStub(config) as stub:
+                for tool in tools:
+                    for concurrency in concurrency_levels:
+                        result = await run_scenario(tool, org_size, concurrency, calls, stub, cache_mode)
+                        results.append(result)
+                        print(
+                            f"{tool:<24} org={org_size:<5} c={concurrency:<4} "
+                            f"{result['throughput']:>9.1f} ops/s  p50={result['p50_ms']:>8.2f}ms  "
+                            f"p99={result['p99_ms']:>8.2f}ms  erros={result['errors']}",
+                            flush=True,
+                        )
+    finally:
+        await github_client.close_session()
+    return results
+
+
+def scenario_key(result: Dict) -> str:
+    return f"{result['tool']}|org={result['org_size']}|c={result['concurrency']}"
+
+
+def compare(results: List[Dict], baseline: List[Dict], max_regression: float) -> List[str]:
+    """Cenários em que p50 ou throughput pioraram mais que ``max_regression``."""
+    previous = {scenario_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        base = previous.get(scenario_key(result))
+        if base is None:
+            continue
+        if base["p50_ms"] and result["p50_ms"] > base["p50_ms"] * (1 + max_regression):
+            regressions.append(f"{scenario_key(result)}: p50 {base['p50_ms']}ms -> {result['p50_ms']}ms")
+        if base["throughput"] and result["throughput"] < base["throughput"] / (1 + max_regression):
+            regressions.append(
+                f"{scenario_key(result)}: throughput {base['throughput']} -> {result['throughput']} ops/s"
+            )
+        if result["errors"] > base["errors"]:
+            regressions.append(f"{scenario_key(result)}: erros {base['errors']} -> {result['errors']}")
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks das ferramentas do xCloud MCP Server")
+    parser.add_argument("--tools", default=",".join(TOOLS), help="Ferramentas, separadas por vírgula")
+    parser.add_argument("--org-sizes", type=_int_list, default=[20, 200])
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 8, 32])
+    parser.add_argument("--calls", type=int, default=64, help="Chamadas por cenário")
+    parser.add_argument("--latency", type=float, default=0.005, help="Latência do stub por requisição (s)")
+    parser.add_argument("--payload-bytes", type=int, default=512)
+    parser.add_argument("--cache", choices=CACHE_MODES, default="revalidate")
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparação")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    tools = [tool for tool in args.tools.split(",") if tool]
+    unknown = set(tools) - set(TOOLS)
+    if unknown:
+        parser.error(f"Ferramentas desconhecidas: {', '.join(sorted(unknown))}")
+
+    # O log por chamada das ferramentas distorceria as medições
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = asyncio.run(run_suite(
+        tools,
+        args.org_sizes,
+        args.concurrency,
+        args.calls,
+        latency=args.latency,
+        payload_bytes=args.payload_bytes,
+        cache_mode=args.cache,
+    ))
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {
+                "calls": args.calls,
+                "latency": args.latency,
+                "payload_bytes": args.payload_bytes,
+                "cache": args.cache,
+            },
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+        print(f"Resultados gravados em {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+        regressions = compare(results, baseline, args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSÃO {regression}")
+        if regressions:
+            return 1
+        print(f"Sem regressões acima de {args.max_regression:.0%} em relação a {args.baseline}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+🧊 Benchmark de partida a frio do transporte stdio
+
+Clientes MCP de desktop iniciam ``xcloud_mcp/main.py`` em um processo novo a
+cada sessão. Este script mede, em vários processos novos, o tempo até a
+resposta do ``initialize`` e até a lista de ferramentas (``tools/list``), além
+do tempo de import do módulo principal (``python -X importtime``) e os
+módulos que mais pesam nele.
+
+Uso:
+    python benchmarks/startup.py --runs 10 --output startup.json
+    python benchmarks/startup.py --baseline startup.json --max-regression 0.2
+"""
+
+import argparse
+import json
+import os
+import platform
+import selectors
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.stats import percentile  # noqa: E402
+
+SERVER_SCRIPT = os.path.join(ROOT, "src", "xcloud_mcp", "main.py")
+
+SERVER_ENV = {
+    "GITHUB_TOKEN": "startup-benchmark-token",
+    "X_CLOUD_MCP_TRANSPORT": "stdio",
+    # Evita que o refresher em segundo plano dispare chamadas ao GitHub
+    "X_CLOUD_MCP_REFRESH_INTERVAL": "0",
+}
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-06-18",
+        "capabilities": {},
+        "clientInfo": {"name": "startup-benchmark", "version": "1.0"},
+    },
+}
+INITIALIZED = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+LIST_TOOLS = {"jsonrpc": "2.0", "id": 2, "method": "tools/list"}
+
+
+def _send(process: subprocess.Popen, message: Dict) -> None:
+    process.stdin.write((json.dumps(message) + "\n").encode())
+    process.stdin.flush()
+
+
+def _wait_response(process: subprocess.Popen, request_id: int, deadline: float) -> Dict:
+    """Lê linhas JSON-RPC do stdout até a resposta de ``request_id``."""
+    with selectors.DefaultSelector() as selector:
+        selector.register(process.stdout, selectors.EVENT_READ)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not selector.select(remaining):
+                raise TimeoutError(f"Sem resposta para a requisição {request_id}.")
+            line = process.stdout.readline()
+            if not line:
+                raise RuntimeError(f"Servidor encerrou (código {process.poll()}) antes de responder.")
+            message = json.loads(line)
+            if message.get("id") == request_id:
+                return message
+
+
+def measure_cold_start(timeout: float = 30.0, env: Optional[Dict[str, str]] = None) -> Dict[str, float]:
+    """Inicia um servidor stdio novo e mede até ``initialize`` e ``tools/list``."""
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, SERVER_SCRIPT],
+        env=dict(os.environ, **SERVER_ENV, **(env or {})),
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    try:
+        _send(process, INITIALIZE)
+        _wait_response(process, 1, deadline)
+        initialize = time.perf_counter() - started
+        _send(process, INITIALIZED)
+        _send(process, LIST_TOOLS)
+        tools = _wait_response(process, 2, deadline)["result"]["tools"]
+        list_tools = time.perf_counter() - started
+    finally:
+        process.stdin.close()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+    return {"initialize": initialize, "list_tools": list_tools, "tools": len(tools)}
+
+
+def import_profile(module: str = "xcloud_mcp.main", top: int = 10) -> Tuple[float, List[Dict]]:
+    """
+    Tempo total de import de ``module`` e os ``top`` módulos mais caros
+    (tempo cumulativo dos imports de primeiro nível).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=dict(os.environ, **SERVER_ENV, PYTHONPATH=os.path.join(ROOT, "src")),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0.0
+    modules: List[Dict] = []
+    # Os filhos aparecem antes do pai; ``children`` acumula os do próximo import de topo
+    children: List[Dict] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        seconds = int(cumulative) / 1e6
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth == 1:
+            children.append({"module": name.strip(), "cumulative_ms": round(seconds * 1000, 1)})
+        elif depth == 0:
+            if name.strip() == module:
+                total, modules = seconds, children
+            children = []
+    modules.sort(key=lambda item: item["cumulative_ms"], reverse=True)
+    return total, modules[:top]
+
+
+def run_startup(runs: int, timeout: float = 30.0, env: Optional[Dict[str, str]] = None) -> Dict:
+    samples = [measure_cold_start(timeout, env) for _ in range(runs)]
+    import_total, heaviest = import_profile()
+    initialize = [sample["initialize"] for sample in samples]
+    list_tools = [sample["list_tools"] for sample in samples]
+    return {
+        "runs": runs,
+        "tools": samples[0]["tools"] if samples else 0,
+        "initialize_p50_ms": round(percentile(initialize, 0.50) * 1000, 1),
+        "initialize_max_ms": round(max(initialize) * 1000, 1) if initialize else 0.0,
+        "list_tools_p50_ms": round(percentile(list_tools, 0.50) * 1000, 1),
+        "import_ms": round(import_total * 1000, 1),
+        "heaviest_imports": heaviest,
+    }
+
+
+def compare(result: Dict, baseline: Dict, max_regression: float) -> List[str]:
+    """Métricas de partida que pioraram mais que ``max_regression``."""
+    regressions = []
+    for key in ("initialize_p50_ms", "list_tools_p50_ms", "import_ms"):
+        if baseline.get(key) and result[key] > baseline[key] * (1 + max_regression):
+            regressions.append(f"{key}: {baseline[key]}ms -> {result[key]}ms")
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de partida a frio do xCloud MCP Server (stdio)")
+    parser.add_argument("--runs", type=int, default=10, help="Processos iniciados")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Tempo máximo por processo (s)")
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparação")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    result = run_startup(args.runs, args.timeout)
+    print(
+        f"initialize p50={result['initialize_p50_ms']:.1f}ms  max={result['initialize_max_ms']:.1f}ms  "
+        f"tools/list p50={result['list_tools_p50_ms']:.1f}ms  import={result['import_ms']:.1f}ms"
+    )
+    for item in result["heaviest_imports"]:
+        print(f"  {item['module']:<32} {item['cumulative_ms']:>8.1f}ms")
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "result": result,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+        print(f"Resultados gravados em {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)["result"]
+        regressions = compare(result, baseline, args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSÃO {regression}")
+        if regressions:
+            return 1
+        print(f"Sem regressões acima de {args.max_regression:.0%} em relação a {args.baseline}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,13 @@
+"""Estatísticas compartilhadas pelos benchmarks."""
+
+import math
+from typing import List
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Percentil pelo método nearest-rank."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(fraction * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
@@ -0,0 +1,70 @@
+"""
+👀 Cursor incremental para o modo watch de ``monitor_ci_status``
+
+O cursor é opaco para o cliente: um JSON em base64 com o instante a partir
+do qual buscar runs (``created>=``) e o último status conhecido de cada run
+nessa janela. Assim o servidor não guarda estado entre chamadas.
+"""
+
+import base64
+import binascii
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+# 🔧 Configuração do modo watch
+WATCH_MAX_WAIT = float(os.getenv("X_CLOUD_MCP_WATCH_MAX_WAIT", "60"))
+WATCH_POLL_INTERVAL = float(os.getenv("X_CLOUD_MCP_WATCH_POLL_INTERVAL", "5"))
+WATCH_MAX_RUNS = int(os.getenv("X_CLOUD_MCP_WATCH_MAX_RUNS", "300"))
+
+
+class InvalidCursor(ValueError):
+    """Cursor malformado ou de outro repositório."""
+
+
+def encode_cursor(repo: str, since: Optional[str], known: Dict[str, str]) -> str:
+    payload = {"repo": repo, "since": since, "runs": known}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, repo: str) -> Tuple[Optional[str], Dict[str, str]]:
+    """Retorna ``(since, runs conhecidas)`` de um cursor emitido para ``repo``."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        since, known = payload["since"], payload["runs"]
+        same_repo = payload["repo"] == repo
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor("Cursor inválido.") from e
+    if not same_repo or not isinstance(known, dict):
+        raise InvalidCursor("Cursor inválido para este repositório.")
+    return since, known
+
+
+def run_state(run: Dict) -> str:
+    return f"{run.get('status')}/{run.get('conclusion')}"
+
+
+def diff_runs(runs: List[Dict], known: Dict[str, str]) -> List[Dict]:
+    """Runs novas ou cujo status/conclusão mudou desde o cursor."""
+    return [run for run in runs if known.get(str(run["id"])) != run_state(run)]
+
+
+def advance(runs: List[Dict], since: Optional[str]) -> Tuple[Optional[str], Dict[str, str]]:
+    """
+    Calcula a janela do próximo cursor.
+
+    A janela começa na run mais antiga ainda não concluída (para captar sua
+    mudança de status) ou, se todas terminaram, na mais recente.
+    """
+    if not runs:
+        return since, {}
+    open_runs = [run["created_at"] for run in runs if run.get("status") != "completed"]
+    next_since = min(open_runs) if open_runs else max(run["created_at"] for run in runs)
+    known = {
+        str(run["id"]): run_state(run)
+        for run in runs
+        if run["created_at"] >= next_since
+    }
+    return next_since, known
@@ -0,0 +1,154 @@
+"""
+🔌 Cliente HTTP compartilhado para a API do GitHub
+
+Mantém uma única ``aiohttp.ClientSession`` por processo, reaproveitando
+conexões TCP/TLS e o cache de DNS entre as chamadas das ferramentas.
+
+O ``aiohttp`` só é importado na primeira chamada ao GitHub: processos stdio
+respondem ao ``initialize`` sem pagar o import da pilha HTTP.
+"""
+
+import asyncio
+import logging
+import os
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    import aiohttp
+
+# 🔧 Configuração do pool de conexões
+HTTP_POOL_LIMIT = int(os.getenv("X_CLOUD_MCP_HTTP_POOL_LIMIT", "100"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("X_CLOUD_MCP_HTTP_POOL_LIMIT_PER_HOST", "20"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("X_CLOUD_MCP_HTTP_KEEPALIVE_TIMEOUT", "30"))
+HTTP_DNS_CACHE_TTL = int(os.getenv("X_CLOUD_MCP_HTTP_DNS_CACHE_TTL", "300"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("X_CLOUD_MCP_HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("X_CLOUD_MCP_HTTP_READ_TIMEOUT", "30"))
+
+_session: Optional["aiohttp.ClientSession"] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+_session_lock: Optional[asyncio.Lock] = None
+# Loop do lock; só ``_session_loop`` diz a que loop a sessão pertence
+_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _build_session() -> "aiohttp.ClientSession":
+    """Cria a sessão com pool limitado, keep-alive e cache de DNS."""
+    import aiohttp
+
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        use_dns_cache=True,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=None,
+        connect=HTTP_CONNECT_TIMEOUT,
+        sock_connect=HTTP_CONNECT_TIMEOUT,
+        sock_read=HTTP_READ_TIMEOUT,
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+
+async def get_session() -> "aiohttp.ClientSession":
+    """
+    Retorna a sessão compartilhada, criando-a sob demanda.
+
+    A sessão fica presa ao event loop em que foi criada; se o loop mudar
+    (ex: testes ou reinício do servidor), uma nova sessão é criada.
+    """
+    global _session, _session_loop, _session_lock, _lock_loop
+
+    loop = asyncio.get_running_loop()
+    if _session is not None and not _session.closed and _session_loop is loop:
+        return _session
+
+    if _session_lock is None or _lock_loop is not loop:
+        _session_lock = asyncio.Lock()
+        _lock_loop = loop
+
+    async with _session_lock:
+        if _session is None or _session.closed or _session_loop is not loop:
+            _session = _build_session()
+            _session_loop = loop
+            logging.info(
+                "Pool HTTP do GitHub criado (limite por host: %s, keep-alive: %ss)",
+                HTTP_POOL_LIMIT_PER_HOST,
+                HTTP_KEEPALIVE_TIMEOUT,
+            )
+    return _session
+
+
+async def close_session() -> None:
+    """Fecha a sessão compartilhada e libera as conexões do pool."""
+    global _session, _session_loop, _session_lock, _lock_loop
+
+    session, _session = _session, None
+    _session_loop = None
+    _session_lock = None
+    _lock_loop = None
+    if session is not None and not session.closed:
+        await session.close()
+        logging.info("Pool HTTP do GitHub encerrado.")
+
+
+def pool_stats() -> Dict:
+    """
+    Ocupação do pool de conexões: conexões em uso no total e no host mais
+    ocupado, e a fração do limite mais apertado (1.0 = saturado).
+
+    O ``TCPConnector`` não expõe essas contagens publicamente; sem sessão
+    aberta, o pool é reportado vazio.
+    """
+    in_use, busiest_host = 0, 0
+    session = _session
+    if session is not None and not session.closed:
+        connector = session.connector
+        in_use = len(getattr(connector, "_acquired", ()))
+        per_host = getattr(connector, "_acquired_per_host", {})
+        busiest_host = max((len(conns) for conns in per_host.values()), default=0)
+    utilization = max(
+        in_use / HTTP_POOL_LIMIT if HTTP_POOL_LIMIT else 0.0,
+        busiest_host / HTTP_POOL_LIMIT_PER_HOST if HTTP_POOL_LIMIT_PER_HOST else 0.0,
+    )
+    return {
+        "in_use": in_use,
+        "busiest_host_in_use": busiest_host,
+        "limit": HTTP_POOL_LIMIT,
+        "limit_per_host": HTTP_POOL_LIMIT_PER_HOST,
+        "utilization": round(utilization, 3),
+    }
+
+
+def client_error() -> type:
+    """
+    Classe base dos erros de conexão do cliente HTTP.
+
+    Usada em cláusulas ``except``, que só a avaliam quando há uma exceção.
+    """
+    import aiohttp
+
+    return aiohttp.ClientError
+
+
+def parse_link_header(value: Optional[str]) -> Dict[str, str]:
+    """
+    Converte um cabeçalho ``Link`` do GitHub em ``{rel: url}``.
+
+    Ex: ``<https://api.github.com/x?page=2>; rel="next"`` -> ``{"next": "..."}``
+    """
+    links = {}
+    if not value:
+        return links
+    for part in value.split(","):
+        section = part.split(";")
+        url = section[0].strip()
+        if not (url.startswith("<") and url.endswith(">")):
+            continue
+        for param in section[1:]:
+            name, _, rel = param.strip().partition("=")
+            if name == "rel":
+                for rel_name in rel.strip('"').split():
+                    links[rel_name] = url[1:-1]
+    return links
@@ -0,0 +1,135 @@
+"""
+🧬 Consultas GraphQL em lote para metadados de vários repositórios
+
+Monta uma única query com aliases (``r0``, ``r1``...) para buscar dados de
+muitos repositórios de uma vez. A API de Actions não existe no GraphQL, então
+a presença de workflows vem da árvore ``.github/workflows`` do branch padrão;
+a query pede só essa árvore, o único dado que a listagem usa.
+
+A mesma técnica busca as issues abertas de vários repositórios de uma vez
+(``build_open_issues_query``), usada pela criação de issues em lote.
+"""
+
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# 🔧 Configuração do backend GraphQL
+GRAPHQL_ENABLED = os.getenv("X_CLOUD_MCP_GITHUB_GRAPHQL", "false").lower() in ("1", "true", "yes")
+# Mantém cada query bem abaixo dos limites de nós (500k) e de complexidade do GitHub
+GRAPHQL_BATCH_SIZE = int(os.getenv("X_CLOUD_MCP_GRAPHQL_BATCH_SIZE", "25"))
+GRAPHQL_OPEN_ISSUES = int(os.getenv("X_CLOUD_MCP_GRAPHQL_OPEN_ISSUES", "50"))
+
+WORKFLOW_EXTENSIONS = (".yml", ".yaml")
+
+REPOSITORY_FRAGMENT = """
+fragment RepoFields on Repository {
+  workflowFiles: object(expression: "HEAD:.github/workflows") {
+    ... on Tree { entries { name } }
+  }
+}
+"""
+
+OPEN_ISSUES_FRAGMENT = """
+fragment OpenIssues on Repository {
+  issues(states: OPEN, labels: $labels, first: $first, orderBy: {field: CREATED_AT, direction: DESC}) {
+    pageInfo { hasNextPage }
+    nodes { number title url body }
+  }
+}
+"""
+
+
+def chunked(items: List[str], size: int = GRAPHQL_BATCH_SIZE) -> Iterator[List[str]]:
+    """Divide a lista de repositórios em lotes do tamanho configurado."""
+    size = max(size, 1)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def build_repositories_query(full_names: List[str]) -> Tuple[str, Dict]:
+    """
+    Monta a query com um alias por repositório.
+
+    Returns:
+        (query, variables) prontos para o endpoint ``/graphql``
+    """
+    return _aliased_query(full_names, "RepoFields", REPOSITORY_FRAGMENT, [], {})
+
+
+def build_open_issues_query(
+    full_names: List[str], labels: List[str], first: int = GRAPHQL_OPEN_ISSUES
+) -> Tuple[str, Dict]:
+    """Monta a query das issues abertas (mais recentes primeiro) com as ``labels``."""
+    return _aliased_query(
+        full_names,
+        "OpenIssues",
+        OPEN_ISSUES_FRAGMENT,
+        ["$labels: [String!]", "$first: Int!"],
+        {"labels": labels, "first": first},
+    )
+
+
+def _aliased_query(
+    full_names: List[str], fragment_name: str, fragment: str, declarations: List[str], variables: Dict
+) -> Tuple[str, Dict]:
+    declarations = list(declarations)
+    variables = dict(variables)
+    selections = []
+    for index, full_name in enumerate(full_names):
+        owner, name = full_name.split("/")[-2:]
+        declarations.append(f"$o{index}: String!, $n{index}: String!")
+        selections.append(f"  r{index}: repository(owner: $o{index}, name: $n{index}) {{ ...{fragment_name} }}")
+        variables[f"o{index}"] = owner
+        variables[f"n{index}"] = name
+
+    query = (
+        f"query ({', '.join(declarations)}) {{\n"
+        + "\n".join(selections)
+        + "\n}\n"
+        + fragment
+    )
+    return query, variables
+
+
+def parse_repositories_response(full_names: List[str], data: Dict) -> Dict[str, Optional[Dict]]:
+    """
+    Normaliza a resposta da query em ``{full_name: dados}``.
+
+    Repositórios ausentes ou inacessíveis ficam como ``None`` para que o
+    chamador possa recorrer à API REST.
+    """
+    results: Dict[str, Optional[Dict]] = {}
+    for index, full_name in enumerate(full_names):
+        node = (data or {}).get(f"r{index}")
+        results[full_name] = _normalize_repository(node) if node else None
+    return results
+
+
+def parse_open_issues_response(full_names: List[str], data: Dict) -> Dict[str, Optional[List[Dict]]]:
+    """
+    Normaliza a resposta em ``{full_name: [issues]}`` com ``number``, ``title``,
+    ``html_url`` e ``body``. Repositórios inacessíveis, ou com mais issues do
+    que a página da consulta, ficam como ``None``.
+    """
+    results: Dict[str, Optional[List[Dict]]] = {}
+    for index, full_name in enumerate(full_names):
+        node = (data or {}).get(f"r{index}")
+        issues = (node or {}).get("issues") or {}
+        if not node or (issues.get("pageInfo") or {}).get("hasNextPage"):
+            results[full_name] = None
+            continue
+        results[full_name] = [
+            {"number": issue.get("number"), "title": issue.get("title"), "html_url": issue.get("url"), "body": issue.get("body")}
+            for issue in issues.get("nodes") or []
+        ]
+    return results
+
+
+def _normalize_repository(node: Dict) -> Dict:
+    tree = node.get("workflowFiles") or {}
+    workflow_files = [
+        entry["name"]
+        for entry in tree.get("entries") or []
+        if entry.get("name", "").endswith(WORKFLOW_EXTENSIONS)
+    ]
+    return {"workflow_files": workflow_files}
@@ -0,0 +1,190 @@
+"""
+📝 Logging não bloqueante
+
+Os registros vão para uma fila (``QueueHandler``) e são formatados e
+escritos por uma thread (``QueueListener``), fora do event loop. A
+interpolação de argumentos ``%`` escalares também acontece na thread. Mensagens
+repetitivas (mesmo template) são limitadas por janela de tempo, e a saída
+pode ser texto ou JSON estruturado.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, TextIO, Tuple
+
+# 🔧 Configuração do logging
+LOG_LEVEL = os.getenv("X_CLOUD_MCP_LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("X_CLOUD_MCP_LOG_FORMAT", "text").lower()
+LOG_RATE_LIMIT = int(os.getenv("X_CLOUD_MCP_LOG_RATE_LIMIT", "10"))
+LOG_RATE_WINDOW = float(os.getenv("X_CLOUD_MCP_LOG_RATE_WINDOW", "60"))
+
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Deixa passar no máximo ``limit`` registros por template a cada ``window``
+    segundos.
+
+    O template é a mensagem antes da interpolação, então avisos por
+    repositório (``"... para %s: %s"``) contam juntos. Erros nunca são
+    descartados. O primeiro registro de uma nova janela leva em
+    ``suppressed`` quantos foram descartados na anterior.
+
+    Uma vez por janela, templates cuja janela expirou sem supressões são
+    esquecidos, para que mensagens pré-formatadas (f-strings) não façam o
+    dicionário crescer sem limite.
+    """
+
+    def __init__(self, limit: int = LOG_RATE_LIMIT, window: float = LOG_RATE_WINDOW):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        # (logger, nível, template) -> [início da janela, emitidos, suprimidos]
+        self._windows: Dict[Tuple[str, int, str], list] = {}
+        self._pruned_at = time.monotonic()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.limit <= 0 or record.levelno >= logging.ERROR:
+            return True
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        if now - self._pruned_at >= self.window:
+            self._prune(now)
+        state = self._windows.get(key)
+        if state is None or now - state[0] >= self.window:
+            suppressed = state[2] if state is not None else 0
+            self._windows[key] = [now, 1, 0]
+            if suppressed:
+                record.suppressed = suppressed
+            return True
+        if state[1] < self.limit:
+            state[1] += 1
+            return True
+        state[2] += 1
+        return False
+
+    def _prune(self, now: float) -> None:
+        # ``list`` copia os itens de uma vez, mesmo com outras threads registrando
+        self._windows = {
+            key: state
+            for key, state in list(self._windows.items())
+            if now - state[0] < self.window or state[2]
+        }
+        self._pruned_at = now
+
+
+# Argumentos que podem ser interpolados depois, na thread, sem risco de mudarem
+_DEFERRABLE_ARGS = (str, int, float, bool, bytes, type(None))
+_exception_formatter = logging.Formatter()
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    ``QueueHandler`` que enfileira o registro sem formatá-lo.
+
+    O ``QueueHandler`` padrão interpola a mensagem no ``prepare`` (ou seja,
+    no event loop); aqui isso fica para o formatter da thread do listener
+    quando todos os argumentos são escalares imutáveis. Argumentos mutáveis
+    (dicts, listas, objetos) são interpolados na hora, para que o registro
+    mostre o estado do momento da chamada, e o traceback é renderizado antes
+    de o registro sair da thread que o gerou.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        if args and not (isinstance(args, tuple) and all(isinstance(arg, _DEFERRABLE_ARGS) for arg in args)):
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__(TEXT_FORMAT, datefmt=DATE_FORMAT)
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            message += f" (+{suppressed} mensagens semelhantes suprimidas)"
+        return message
+
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por registro."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging(
+    level: str = LOG_LEVEL,
+    fmt: str = LOG_FORMAT,
+    stream: Optional[TextIO] = None,
+    rate_limit: int = LOG_RATE_LIMIT,
+    rate_window: float = LOG_RATE_WINDOW,
+    logger: Optional[logging.Logger] = None,
+) -> Optional[logging.handlers.QueueListener]:
+    """
+    Instala o pipeline fila -> thread no logger raiz (ou em ``logger``).
+
+    Assim como ``logging.basicConfig``, não altera um logger raiz que já
+    tenha handlers (ex: quando o servidor é embutido em outra aplicação).
+    """
+    global _listener
+    target = logger or logging.getLogger()
+    if logger is None and target.handlers:
+        return None
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    handler = LazyQueueHandler(records)
+    handler.addFilter(RateLimitFilter(rate_limit, rate_window))
+    target.addHandler(handler)
+    target.setLevel(level)
+
+    listener = logging.handlers.QueueListener(records, output, respect_handler_level=True)
+    listener.start()
+    if logger is None:
+        _listener = listener
+        atexit.register(shutdown_logging)
+    return listener
+
+
+def shutdown_logging() -> None:
+    """Esvazia a fila e encerra a thread do listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
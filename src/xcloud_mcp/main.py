@@ -5,22 +5,59 @@
 FastMCP server para integração com AI e ferramentas de automação
 """
 
-from fastmcp import FastMCP
+from fastmcp import Context, FastMCP
 import asyncio
+import contextvars
+import hashlib
+import hmac
 import json
 import os
-import subprocess
-from typing import Dict, List
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import aclosing
+from typing import AsyncIterator, Awaitable, Dict, List, Optional, Tuple, Union
+from urllib.parse import quote, urlsplit
 from datetime import datetime
-import aiohttp
 import logging
 
-# Configuração de logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
+if __package__ in (None, ""):
+    # Permite executar `python xcloud_mcp/main.py` diretamente (Containerfile, clientes stdio)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from xcloud_mcp import (
+    ci_watch,
+    github_client,
+    github_graphql,
+    logging_config,
+    metrics,
+    readiness,
+    refresher,
+    resilience,
+    run_history,
+    tracing,
+    webhooks,
+    workers,
 )
+from xcloud_mcp.rate_limit import (
+    CONTENT_CREATION_INTERVAL,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_RATE,
+    ContentPacer,
+    Priority,
+    RateLimitExceeded,
+    RateLimitScheduler,
+)
+from xcloud_mcp.persistent_cache import CACHE_PATH, PersistentCache
+from xcloud_mcp.projection import Projection, loads as decode_json
+from xcloud_mcp.response_cache import CacheEntry, ResponseCache
+from xcloud_mcp.shared_state import SharedRateLimitState
+from xcloud_mcp.singleflight import SingleFlight
+from starlette.responses import JSONResponse, PlainTextResponse
+
+# Configuração de logging (fila + thread, fora do event loop)
+logging_config.configure_logging()
 
 app = FastMCP("xcloud-bot")
 
@@ -28,24 +65,268 @@ app = FastMCP("xcloud-bot")
 async def health_check(req):
     """Health check endpoint"""
     logging.info("Health check endpoint was called.")
-    return {"status": "ok"}
+    return JSONResponse({
+        "status": "ok",
+        "rate_limit": github_scheduler.stats(),
+        "coalescing": github_singleflight.stats(),
+        "circuit_breakers": github_breakers.stats(),
+        "run_history": run_history_store.stats(),
+        "snapshot_age": org_refresher.age(),
+    })
+
+
+@app.custom_route("/ready", methods=["GET"])
+async def readiness_check(req):
+    """Prontidão para o balanceador: 503 quando algum limiar é cruzado"""
+    pool = github_client.pool_stats()
+    checks = {
+        "event_loop": loop_monitor.stats(),
+        "tools_in_flight": int(server_metrics.tools_in_flight.total()),
+        "http_pool": pool,
+        "cache": github_cache.stats(),
+        "rate_limit": {
+            "remaining": github_scheduler.remaining,
+            "limit": github_scheduler.limit,
+            "reset_at": github_scheduler.reset_at,
+        },
+    }
+    failing = readiness.failing_checks(
+        loop_lag=loop_monitor.lag(),
+        tools_in_flight=checks["tools_in_flight"],
+        pool_utilization=pool["utilization"],
+        rate_limit_remaining=github_scheduler.remaining,
+    )
+    if failing:
+        logging.warning("Instância não pronta: %s.", ", ".join(failing))
+    return JSONResponse(
+        {"status": "not_ready" if failing else "ready", "failing": failing, "checks": checks},
+        status_code=503 if failing else 200,
+    )
+
+
+@app.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(req):
+    """Métricas no formato texto do Prometheus"""
+    return PlainTextResponse(server_metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+def _admin_denied(req) -> Optional[JSONResponse]:
+    """Exige ``Authorization: Bearer <X_CLOUD_MCP_ADMIN_TOKEN>`` nas rotas de administração."""
+    if not ADMIN_TOKEN:
+        return JSONResponse({"error": "Rotas de administração desativadas (X_CLOUD_MCP_ADMIN_TOKEN)."}, status_code=503)
+    if not hmac.compare_digest(req.headers.get("Authorization", ""), f"Bearer {ADMIN_TOKEN}"):
+        return JSONResponse({"error": "Não autorizado."}, status_code=401)
+    return None
+
+
+@app.custom_route("/admin/profile", methods=["GET"])
+async def admin_profile(req):
+    """Profiling por amostragem do event loop; retorna pilhas colapsadas"""
+    denied = _admin_denied(req)
+    if denied is not None:
+        return denied
+    try:
+        seconds = float(req.query_params.get("seconds", "5"))
+        interval = float(req.query_params.get("interval", "0.005"))
+    except ValueError:
+        return JSONResponse({"error": "Parâmetros 'seconds' e 'interval' devem ser numéricos."}, status_code=400)
+
+    logging.info("Profiling do event loop por %ss (intervalo %ss).", seconds, interval)
+    stacks = await asyncio.to_thread(tracing.sample_stacks, threading.get_ident(), seconds, interval)
+    return PlainTextResponse(tracing.collapsed(stacks))
+
+
+@app.custom_route("/admin/traces", methods=["GET"])
+async def admin_traces(req):
+    """Últimas chamadas de ferramentas acima do limiar de lentidão"""
+    denied = _admin_denied(req)
+    if denied is not None:
+        return denied
+    return JSONResponse({
+        "enabled": tracing.TRACE_ENABLED,
+        "threshold_seconds": tracing.TRACE_SLOW_THRESHOLD,
+        "traces": list(tracing.slow_traces),
+    })
+
+
+@app.custom_route("/webhooks/github", methods=["POST"])
+async def github_webhook(req):
+    """Recebe webhooks do GitHub e invalida/atualiza o estado em cache"""
+    if not webhooks.WEBHOOK_SECRET:
+        return JSONResponse({"error": "Webhook não configurado (X_CLOUD_MCP_WEBHOOK_SECRET)."}, status_code=503)
+
+    body = await req.body()
+    if not webhooks.verify_signature(webhooks.WEBHOOK_SECRET, body, req.headers.get("X-Hub-Signature-256")):
+        logging.warning("Webhook do GitHub rejeitado: assinatura inválida.")
+        return JSONResponse({"error": "Assinatura inválida."}, status_code=401)
+
+    event = req.headers.get("X-GitHub-Event", "")
+    if event not in webhooks.SUPPORTED_EVENTS:
+        return JSONResponse({"status": "ignored", "event": event})
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return JSONResponse({"error": "Payload JSON inválido."}, status_code=400)
+    if event == "ping":
+        return JSONResponse({"status": "pong"})
+
+    invalidated = sum(
+        github_cache.invalidate(endpoint, exact=exact)
+        for endpoint, exact in webhooks.invalidation_targets(event, payload)
+    )
+    snapshot_updated = _apply_webhook_to_snapshot(event, payload)
+    if event == "workflow_run" and "workflow_run" in payload:
+        history = run_history_store.get((payload.get("repository") or {}).get("full_name", ""))
+        if history is not None:
+            history.ingest([payload["workflow_run"]])
+    logging.info(
+        "Webhook '%s' (%s) de %s: %s entradas invalidadas.",
+        event,
+        payload.get("action", "-"),
+        (payload.get("repository") or {}).get("full_name"),
+        invalidated,
+    )
+    return JSONResponse({
+        "status": "ok",
+        "event": event,
+        "invalidated": invalidated,
+        "snapshot_updated": snapshot_updated,
+    })
 
 # 🔧 Configuração
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-GITHUB_API_BASE = "https://api.github.com"
+# URL base da API (GitHub Enterprise ou o stub dos benchmarks)
+GITHUB_API_BASE = os.getenv("X_CLOUD_MCP_GITHUB_API_BASE", "https://api.github.com").rstrip("/")
 
 # Configuração de transporte do servidor
 DEFAULT_TRANSPORT = os.getenv("X_CLOUD_MCP_TRANSPORT", "http")
 DEFAULT_HOST = os.getenv("X_CLOUD_MCP_HOST", "0.0.0.0")
 DEFAULT_PORT_RAW = os.getenv("X_CLOUD_MCP_PORT", "8000")
 
+# Token das rotas /admin/* (sem token, as rotas ficam desativadas)
+ADMIN_TOKEN = os.getenv("X_CLOUD_MCP_ADMIN_TOKEN", "")
+
+# Verificação de workflows por repositório em get_xcloud_repositories
+WORKFLOW_PROBE_CONCURRENCY = int(os.getenv("X_CLOUD_MCP_WORKFLOW_PROBE_CONCURRENCY", "8"))
+WORKFLOW_PROBE_TIMEOUT = float(os.getenv("X_CLOUD_MCP_WORKFLOW_PROBE_TIMEOUT", "10"))
+
+# Concorrência da análise em lote (analyze_repositories)
+BATCH_ANALYSIS_CONCURRENCY = int(os.getenv("X_CLOUD_MCP_BATCH_ANALYSIS_CONCURRENCY", "6"))
 
+# Criações concorrentes de issues em lote (create_workflow_issues); o início de
+# cada uma ainda é espaçado pelo content_pacer
+ISSUE_ROLLOUT_CONCURRENCY = int(os.getenv("X_CLOUD_MCP_ISSUE_ROLLOUT_CONCURRENCY", "4"))
 
-async def github_api_request(endpoint: str, method: str = "GET", data: Dict = None) -> Dict:
-    """Faz requisições para a API do GitHub, com tratamento de erros."""
+# Cache de respostas GET com revalidação por ETag/Last-Modified
+github_cache = ResponseCache()
+
+# Cópia em disco do cache para reinícios a quente (X_CLOUD_MCP_CACHE_PATH);
+# no modo multi-worker, é também o cache compartilhado entre os workers
+github_persistent_cache = PersistentCache(CACHE_PATH, shared=workers.is_worker()) if CACHE_PATH else None
+
+# Agendador de requisições ciente do rate limit do GitHub. Com vários workers,
+# cada um recebe uma fração da taxa e todos compartilham orçamento e back-off.
+github_scheduler = RateLimitScheduler(
+    rate=RATE_LIMIT_RATE / workers.WORKER_COUNT,
+    burst=max(RATE_LIMIT_BURST / workers.WORKER_COUNT, 1.0),
+    shared=SharedRateLimitState(workers.SHARED_STATE_PATH) if workers.SHARED_STATE_PATH else None,
+)
+
+# Coalescência de GETs idênticos em andamento
+github_singleflight = SingleFlight()
+
+# Histórico de workflow runs por repositório, sincronizado de forma incremental
+run_history_store = run_history.RunHistoryStore()
+# Sincronizações em andamento por repositório: chamadas concorrentes
+# compartilham o mesmo ``RunHistory`` em vez de criar um cada
+run_history_syncs = SingleFlight()
+# Backfills em segundo plano, por repositório
+run_history_backfills: Dict[str, asyncio.Task] = {}
+
+# Circuit breaker por host da API do GitHub
+github_breakers = resilience.CircuitBreakers()
+
+# Espaçamento das requisições que criam conteúdo (limite secundário do GitHub)
+content_pacer = ContentPacer(CONTENT_CREATION_INTERVAL * workers.WORKER_COUNT)
+
+# Criações de issue em andamento e recentes, por (repositório, chave de idempotência)
+issue_singleflight = SingleFlight()
+recent_issue_creations: "OrderedDict[Tuple[str, str], Dict]" = OrderedDict()
+RECENT_ISSUE_CREATIONS_MAX = 1024
+
+# Campos lidos de cada endpoint; o restante do payload é descartado na decodificação
+REPO_FIELDS = Projection("description", "language", "stargazers_count", "forks_count")
+ORG_REPO_FIELDS = Projection("name", "full_name", "description", "language", "html_url")
+WORKFLOWS_FIELDS = Projection("total_count", "workflows.state")
+ISSUE_FIELDS = Projection("number", "title", "html_url", "body", "pull_request.url")
+RUNS_FIELDS = Projection(
+    "total_count",
+    "workflow_runs.id",
+    "workflow_runs.name",
+    "workflow_runs.status",
+    "workflow_runs.conclusion",
+    "workflow_runs.head_branch",
+    "workflow_runs.head_sha",
+    "workflow_runs.actor.login",
+    "workflow_runs.created_at",
+    "workflow_runs.html_url",
+)
+RUN_HISTORY_FIELDS = Projection(
+    "total_count",
+    "workflow_runs.id",
+    "workflow_runs.workflow_id",
+    "workflow_runs.conclusion",
+    "workflow_runs.created_at",
+    "workflow_runs.run_started_at",
+    "workflow_runs.updated_at",
+    "workflow_runs.run_attempt",
+    "workflow_runs.head_sha",
+)
+
+# Atraso do event loop, medido em segundo plano para /ready e /metrics
+loop_monitor = readiness.LoopLagMonitor()
+
+# Métricas expostas em /metrics
+server_metrics = metrics.Metrics(
+    rate_limit_remaining=lambda: github_scheduler.remaining,
+    event_loop_lag=loop_monitor.lag,
+    worker=workers.WORKER_ID,
+)
+app.add_middleware(metrics.ToolMetricsMiddleware(server_metrics))
+
+# Árvore de spans por chamada de ferramenta (X_CLOUD_MCP_TRACE)
+app.add_middleware(tracing.TracingMiddleware())
+
+
+async def github_api_request(
+    endpoint: str,
+    method: str = "GET",
+    data: Dict = None,
+    priority: int = Priority.NORMAL,
+    links: Optional[Dict[str, str]] = None,
+    fields: Optional[Projection] = None,
+) -> Dict:
+    """
+    Faz requisições para a API do GitHub, com tratamento de erros.
+
+    GETs idênticos em andamento ao mesmo tempo compartilham uma única
+    requisição ao GitHub.
+
+    Args:
+        endpoint: Caminho da API (ex: /repos/owner/repo)
+        method: Método HTTP
+        data: Corpo JSON para métodos diferentes de GET
+        priority: Classe de prioridade no agendador de rate limit
+        links: Se fornecido, é preenchido com as relações do cabeçalho Link (next, last...)
+        fields: Campos a manter em respostas de sucesso; o restante é descartado
+            na decodificação e não chega ao cache
+    """
     if not GITHUB_TOKEN:
         logging.error("GITHUB_TOKEN não configurado. Configure o token antes de chamar a API do GitHub.")
+        server_metrics.github_requests.inc(
+            method=method, endpoint=metrics.endpoint_template(endpoint), status="none", error_type="CONFIG_ERROR"
+        )
         return {
             "error": {
                 "type": "CONFIG_ERROR",
@@ -53,35 +334,363 @@ async def github_api_request(endpoint: str, method: str = "GET", data: Dict = No
             }
         }
 
+    if method == "GET":
+        cache_endpoint = _cache_endpoint(endpoint, fields)
+        cached = github_cache.get(method, cache_endpoint)
+        if cached is None or not github_cache.is_fresh(cached):
+            cached = await _adopt_shared_entry(method, cache_endpoint, cached)
+        if cached is not None and github_cache.is_fresh(cached):
+            github_cache.record_hit()
+            response_data, link = cached.data, cached.link
+        else:
+            key = (method, cache_endpoint, _auth_key(GITHUB_TOKEN))
+            response_data, link = await github_singleflight.do(
+                key, lambda: _github_api_send(endpoint, method, data, priority, fields)
+            )
+    else:
+        response_data, link = await _github_api_send(endpoint, method, data, priority)
+
+    if links is not None:
+        links.update(github_client.parse_link_header(link))
+    return response_data
+
+
+async def _adopt_shared_entry(method: str, cache_endpoint: str, cached: Optional[CacheEntry]) -> Optional[CacheEntry]:
+    """
+    Com vários workers, adota a entrada do cache compartilhado quando ela é
+    mais recente que a local (obtida ou revalidada por outro worker).
+    """
+    backend = github_cache.backend
+    if backend is None or not backend.shared:
+        return cached
+    # Sem janela de frescor, a entrada local já basta para a revalidação condicional
+    if cached is not None and github_cache.fresh_ttl <= 0:
+        return cached
+    shared = await backend.fetch((method, cache_endpoint))
+    if shared is None or (cached is not None and shared.validated_at <= cached.validated_at):
+        return cached
+    github_cache.restore((method, cache_endpoint), shared)
+    return shared
+
+
+def _auth_key(token: str) -> str:
+    """Identifica a credencial sem manter o token em claro nas chaves."""
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+def _cache_endpoint(endpoint: str, fields: Optional[Projection]) -> str:
+    """Respostas projetadas ficam em entradas próprias do cache."""
+    return endpoint if fields is None else f"{endpoint}#fields={fields.key}"
+
+
+async def _github_api_send(
+    endpoint: str, method: str, data: Optional[Dict], priority: int, fields: Optional[Projection] = None
+) -> Tuple[Dict, Optional[str]]:
+    """Envia a requisição ao GitHub; retorna (payload, cabeçalho Link)."""
+    server_metrics.github_in_flight.inc()
+    started = time.perf_counter()
+    response_data, status = None, "none"
+    try:
+        with tracing.span("github", method=method, endpoint=endpoint):
+            response_data, link, status = await _github_api_attempts(endpoint, method, data, priority, fields)
+        return response_data, link
+    finally:
+        server_metrics.github_in_flight.dec()
+        server_metrics.observe_github(
+            method, endpoint, time.perf_counter() - started, status, metrics.error_type(response_data)
+        )
+
+
+async def _github_api_attempts(
+    endpoint: str, method: str, data: Optional[Dict], priority: int, fields: Optional[Projection]
+) -> Tuple[Dict, Optional[str], str]:
+    """
+    Passa pelo circuit breaker do host e repete falhas transitórias de
+    métodos idempotentes com back-off e jitter, dentro de ``RETRY_BUDGET``.
+    """
+    breaker = github_breakers.get(urlsplit(GITHUB_API_BASE).netloc)
+    attempts = max(resilience.RETRY_MAX_ATTEMPTS, 1) if method in resilience.IDEMPOTENT_METHODS else 1
+    deadline = time.monotonic() + resilience.RETRY_BUDGET
+    for attempt in range(attempts):
+        retry_in, probe = breaker.before_call()
+        if retry_in is not None:
+            return {
+                "error": {
+                    "type": "CIRCUIT_OPEN",
+                    "retry_after": max(round(retry_in), 1),
+                    "message": "GitHub instável; chamadas suspensas temporariamente pelo circuit breaker.",
+                }
+            }, None, "none"
+
+        transient = None
+        try:
+            response_data, link, status = await _github_api_exchange(endpoint, method, data, priority, fields)
+            transient = resilience.is_transient(status, response_data)
+        finally:
+            # Cancelamentos e exceções só liberam a sonda, sem contar como falha
+            breaker.record(transient, probe)
+
+        if not transient or attempt == attempts - 1:
+            break
+        delay = resilience.backoff_delay(attempt)
+        if time.monotonic() + delay > deadline:
+            break
+        logging.warning(
+            "Falha transitória do GitHub em %s %s (%s); nova tentativa em %.2fs.",
+            method, endpoint, status if status != "none" else "rede", delay,
+        )
+        with tracing.span("retry.backoff", attempt=attempt + 1):
+            await asyncio.sleep(delay)
+    return response_data, link, status
+
+
+async def _github_api_exchange(
+    endpoint: str, method: str, data: Optional[Dict], priority: int, fields: Optional[Projection]
+) -> Tuple[Dict, Optional[str], str]:
+    """Executa a troca HTTP; retorna (payload, cabeçalho Link, status HTTP ou "none")."""
     headers = {
         "Authorization": f"Bearer {GITHUB_TOKEN}",
         "Accept": "application/vnd.github.v3+json"
     }
 
+    cache_endpoint = _cache_endpoint(endpoint, fields)
+    cached = github_cache.get(method, cache_endpoint) if method == "GET" else None
+    if cached is not None:
+        headers.update(cached.conditional_headers())
+
+    try:
+        with tracing.span("rate_limit.acquire"):
+            await github_scheduler.acquire(priority)
+    except RateLimitExceeded as e:
+        logging.warning("Requisição ao GitHub adiada pelo agendador: %s (%s)", endpoint, e)
+        return {
+            "error": {
+                "type": "RATE_LIMITED",
+                "retry_after": round(e.retry_after),
+                "message": str(e)
+            }
+        }, None, "none"
+
     try:
-        async with aiohttp.ClientSession() as session:
-            url = f"{GITHUB_API_BASE}{endpoint}"
-
-            async with session.request(method, url, headers=headers, json=data if method != "GET" else None) as response:
-                response_data = await response.json()
-                if response.status >= 400:
-                    logging.error(f"GitHub API request failed: {response.status} {response.reason} | URL: {url} | Response: {response_data}")
-                    return {
-                        "error": {
-                            "type": "GITHUB_API_ERROR",
-                            "status_code": response.status,
-                            "message": response_data.get("message", "Erro desconhecido da API do GitHub.")
-                        }
+        session = await github_client.get_session()
+        url = f"{GITHUB_API_BASE}{endpoint}"
+
+        async with session.request(method, url, headers=headers, json=data if method != "GET" else None) as response:
+            github_scheduler.update(response.status, response.headers)
+            if response.status == 304 and cached is not None:
+                github_cache.mark_revalidated(cached)
+                return cached.data, cached.link, "304"
+
+            with tracing.span("http.body"):
+                await response.read()
+            with tracing.span("json.decode"):
+                if fields is not None and response.status < 400:
+                    response_data = await response.json(loads=fields.decoder())
+                elif response.status < 500:
+                    response_data = await response.json(loads=decode_json)
+                else:
+                    # Erros 5xx de proxies/balanceadores costumam vir em HTML
+                    try:
+                        response_data = await response.json(loads=decode_json, content_type=None)
+                    except ValueError:
+                        response_data = None
+                    if not isinstance(response_data, dict):
+                        response_data = {"message": response.reason or "Erro do servidor do GitHub."}
+            if response.status >= 400:
+                message = response_data.get("message", "")
+                if response.status in (403, 429) and "secondary rate limit" in message.lower():
+                    github_scheduler.backoff()
+                logging.error(
+                    "GitHub API request failed: %s %s | URL: %s | Message: %s",
+                    response.status, response.reason, url, message,
+                )
+                logging.debug("Resposta completa do GitHub para %s: %s", url, response_data)
+                return {
+                    "error": {
+                        "type": "GITHUB_API_ERROR",
+                        "status_code": response.status,
+                        "message": response_data.get("message", "Erro desconhecido da API do GitHub.")
                     }
-                return response_data
-    except aiohttp.ClientError as e:
-        logging.error(f"Erro de conexão com a API do GitHub: {str(e)}")
+                }, None, str(response.status)
+            if method == "GET":
+                github_cache.record_miss()
+                github_cache.store(method, cache_endpoint, response_data, response.headers)
+            return response_data, response.headers.get("Link"), str(response.status)
+    except asyncio.TimeoutError:
+        logging.error("Timeout na requisição à API do GitHub: %s", endpoint)
+        return {
+            "error": {
+                "type": "NETWORK_ERROR",
+                "message": f"Tempo limite excedido ao acessar a API do GitHub: {endpoint}"
+            }
+        }, None, "none"
+    except github_client.client_error() as e:
+        logging.error("Erro de conexão com a API do GitHub: %s", e)
         return {
             "error": {
                 "type": "NETWORK_ERROR",
                 "message": f"Não foi possível conectar à API do GitHub: {str(e)}"
             }
-        }
+        }, None, "none"
+
+
+async def github_api_gather(
+    requests: Dict[str, Union[str, Awaitable]],
+    priority: int = Priority.NORMAL,
+    fields: Optional[Dict[str, Projection]] = None,
+) -> Dict:
+    """
+    Executa várias requisições GET independentes de forma concorrente.
+
+    Args:
+        requests: Mapeamento nome -> endpoint, ou -> awaitable para buscas com
+            mais de uma requisição (ex: paginação); um ``GitHubAPIError``
+            levantado por ele conta como payload de erro
+        priority: Classe de prioridade no agendador de rate limit
+        fields: Projeção opcional por nome de requisição (só endpoints)
+
+    Returns:
+        Dict nome -> resposta. Se alguma requisição falhar, retorna o primeiro
+        payload de erro recebido e cancela as requisições ainda pendentes.
+    """
+    tasks = {
+        asyncio.ensure_future(
+            github_api_request(request, priority=priority, fields=(fields or {}).get(name))
+            if isinstance(request, str)
+            else request
+        ): name
+        for name, request in requests.items()
+    }
+    results = {}
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                try:
+                    result = task.result()
+                except GitHubAPIError as e:
+                    result = e.payload
+                if isinstance(result, dict) and "error" in result:
+                    request = requests[tasks[task]]
+                    logging.error(
+                        "Falha ao buscar %s: %s",
+                        request if isinstance(request, str) else tasks[task],
+                        result["error"],
+                    )
+                    return result
+                results[tasks[task]] = result
+    finally:
+        for task in pending:
+            task.cancel()
+    return {name: results[name] for name in requests}
+
+def _api_endpoint(url: str) -> str:
+    """URL absoluta da API (ex: ``Link: rel="next"``) -> endpoint relativo."""
+    return url[len(GITHUB_API_BASE):] if url.startswith(GITHUB_API_BASE) else url
+
+
+class GitHubAPIError(Exception):
+    """Erro da API do GitHub encontrado durante uma paginação."""
+
+    def __init__(self, payload: Dict):
+        super().__init__(str(payload.get("error")))
+        self.payload = payload
+
+
+async def github_api_paginate(
+    endpoint: str,
+    items_key: Optional[str] = None,
+    limit: Optional[int] = None,
+    priority: int = Priority.NORMAL,
+    fields: Optional[Projection] = None,
+) -> AsyncIterator[Dict]:
+    """
+    Itera sobre os itens de um endpoint paginado, seguindo `Link: rel="next"`.
+
+    A próxima página é buscada enquanto os itens da atual são consumidos. A
+    iteração termina ao atingir `limit` ou quando o chamador interrompe o loop
+    (use `contextlib.aclosing` para cancelar a página pré-carregada).
+
+    Args:
+        endpoint: Endpoint da primeira página (ex: /orgs/PageCloudv1/repos?per_page=100)
+        items_key: Chave da lista de itens em respostas objeto (ex: workflow_runs)
+        limit: Número máximo de itens a produzir
+        priority: Classe de prioridade no agendador de rate limit
+        fields: Projeção aplicada a cada página (inclui ``items_key``, se houver)
+
+    Raises:
+        GitHubAPIError: Se alguma página retornar um payload de erro
+    """
+    if limit is not None and limit <= 0:
+        return
+
+    def fetch(page_endpoint: str):
+        links: Dict[str, str] = {}
+        request = github_api_request(page_endpoint, priority=priority, links=links, fields=fields)
+        return asyncio.ensure_future(request), links
+
+    pending, links = fetch(endpoint)
+    produced = 0
+    try:
+        while pending is not None:
+            page = await pending
+            pending = None
+            if isinstance(page, dict) and "error" in page:
+                raise GitHubAPIError(page)
+
+            items = page.get(items_key, []) if items_key else page
+            next_url = links.get("next")
+            if next_url and items and (limit is None or produced + len(items) < limit):
+                pending, links = fetch(_api_endpoint(next_url))
+
+            for item in items:
+                yield item
+                produced += 1
+                if limit is not None and produced >= limit:
+                    return
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+async def github_graphql_repositories(
+    full_names: List[str],
+    priority: int = Priority.NORMAL,
+) -> Dict[str, Optional[Dict]]:
+    """
+    Busca metadados de vários repositórios via GraphQL, em lotes com aliases.
+
+    Args:
+        full_names: Repositórios no formato owner/repo
+        priority: Classe de prioridade no agendador de rate limit
+
+    Returns:
+        Dict full_name -> dados normalizados, ou None quando o repositório deve
+        ser consultado via REST (lote com erro ou repositório inacessível).
+    """
+    async def fetch(chunk: List[str]) -> Dict[str, Optional[Dict]]:
+        query, variables = github_graphql.build_repositories_query(chunk)
+        response = await github_api_request(
+            "/graphql",
+            method="POST",
+            data={"query": query, "variables": variables},
+            priority=priority,
+        )
+        if "error" in response or not isinstance(response.get("data"), dict):
+            logging.warning(
+                "Consulta GraphQL falhou para %s repositórios; usando REST: %s",
+                len(chunk), response.get("error") or response.get("errors"),
+            )
+            return {full_name: None for full_name in chunk}
+        if response.get("errors"):
+            logging.warning("Consulta GraphQL retornou erros parciais: %s", response["errors"])
+        return github_graphql.parse_repositories_response(chunk, response["data"])
+
+    results: Dict[str, Optional[Dict]] = {}
+    chunks = list(github_graphql.chunked(full_names))
+    for chunk_result in await asyncio.gather(*(fetch(chunk) for chunk in chunks)):
+        results.update(chunk_result)
+    return results
 
 @app.tool()
 async def analyze_repository(repo_url: str, analysis_type: str = "general") -> Dict:
@@ -92,82 +701,244 @@ async def analyze_repository(repo_url: str, analysis_type: str = "general") -> D
         repo_url: URL do repositório (ex: PageCloudv1/xcloud-bot)
         analysis_type: Tipo de análise (general, workflows, security, performance)
     """
-    logging.info(f"Iniciando análise do repositório: {repo_url} (Tipo: {analysis_type})")
+    return await _analyze_repository(repo_url, analysis_type)
+
+
+@app.tool()
+async def analyze_repositories(
+    repos: List[str],
+    analysis_type: str = "general",
+    ctx: Optional[Context] = None,
+) -> Dict:
+    """
+    Analisa vários repositórios GitHub em paralelo e sugere melhorias
+
+    Cada resultado é enviado como notificação de progresso MCP assim que fica
+    pronto. Falhas de um repositório não interrompem os demais.
+
+    Args:
+        repos: Lista de repositórios (ex: ["PageCloudv1/xcloud-bot", "PageCloudv1/xcloud-mcp"])
+        analysis_type: Tipo de análise (general, workflows, security, performance)
+    """
+    repo_urls = list(dict.fromkeys(repos))
+    logging.info("Iniciando análise em lote de %s repositórios (Tipo: %s)", len(repo_urls), analysis_type)
+    semaphore = asyncio.Semaphore(max(BATCH_ANALYSIS_CONCURRENCY, 1))
+
+    async def analyze(repo_url: str):
+        async with semaphore:
+            return repo_url, await _analyze_repository(repo_url, analysis_type, priority=Priority.BULK)
+
+    results: Dict[str, Dict] = {}
+    errors: Dict[str, object] = {}
+    for completed, next_result in enumerate(asyncio.as_completed([analyze(url) for url in repo_urls]), start=1):
+        repo_url, result = await next_result
+        if "error" in result:
+            errors[repo_url] = result["error"]
+        else:
+            results[repo_url] = result
+        if ctx is not None:
+            await ctx.report_progress(
+                completed,
+                len(repo_urls),
+                json.dumps({"repo": repo_url, **result}, ensure_ascii=False, default=str),
+            )
+
+    logging.info("Análise em lote concluída: %s sucesso(s), %s falha(s).", len(results), len(errors))
+    return {
+        "total": len(repo_urls),
+        "succeeded": len(results),
+        "failed": len(errors),
+        "results": {url: results[url] for url in repo_urls if url in results},
+        "errors": {url: errors[url] for url in repo_urls if url in errors},
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+async def _analyze_repository(repo_url: str, analysis_type: str, priority: int = Priority.NORMAL) -> Dict:
+    """Análise de um repositório, compartilhada pelas ferramentas individual e em lote."""
+    logging.info("Iniciando análise do repositório: %s (Tipo: %s)", repo_url, analysis_type)
     try:
         # Extrai owner/repo da URL
         if "/" not in repo_url:
-            logging.warning(f"URL inválida fornecida: {repo_url}")
+            logging.warning("URL inválida fornecida: %s", repo_url)
             return {"error": "URL inválida. Use formato: owner/repo"}
 
         owner, repo = repo_url.split("/")[-2:]
 
-        # Busca informações do repositório
-        repo_data = await github_api_request(f"/repos/{owner}/{repo}")
-        if "error" in repo_data:
-            logging.error(f"Falha ao buscar dados do repositório {owner}/{repo}: {repo_data['error']}")
-            return repo_data
-
-        # Busca workflows
-        workflows = await github_api_request(f"/repos/{owner}/{repo}/actions/workflows")
-        if "error" in workflows:
-            logging.error(f"Falha ao buscar workflows para {owner}/{repo}: {workflows['error']}")
-            return workflows
-
-        # Busca runs recentes
-        runs = await github_api_request(f"/repos/{owner}/{repo}/actions/runs?per_page=20")
-        if "error" in runs:
-            logging.error(f"Falha ao buscar runs para {owner}/{repo}: {runs['error']}")
-            return runs
-
-        # Análise básica
-        analysis = {
-            "repository": f"{owner}/{repo}",
-            "description": repo_data.get("description", ""),
-            "language": repo_data.get("language", ""),
-            "stars": repo_data.get("stargazers_count", 0),
-            "forks": repo_data.get("forks_count", 0),
-            "workflows": {
-                "total": workflows.get("total_count", 0),
-                "active": len([w for w in workflows.get("workflows", []) if w["state"] == "active"])
+        # Busca repositório e workflows e sincroniza o histórico de runs em paralelo
+        responses = await github_api_gather(
+            {
+                "repo": f"/repos/{owner}/{repo}",
+                "workflows": f"/repos/{owner}/{repo}/actions/workflows",
+                "runs": _sync_run_history(owner, repo, priority),
             },
-            "recent_activity": {
-                "total_runs": runs.get("total_count", 0),
-                "successful_runs": len([r for r in runs.get("workflow_runs", []) if r["conclusion"] == "success"]),
-                "failed_runs": len([r for r in runs.get("workflow_runs", []) if r["conclusion"] == "failure"])
+            priority=priority,
+            fields={"repo": REPO_FIELDS, "workflows": WORKFLOWS_FIELDS},
+        )
+        if "error" in responses:
+            return responses
+
+        repo_data, workflows, history = responses["repo"], responses["workflows"], responses["runs"]
+
+        with tracing.span("postprocess"):
+            ci_stats = history.stats()
+            # Primeira análise: as estatísticas cobrem só a primeira página por enquanto
+            ci_stats["backfilling"] = f"{owner}/{repo}" in run_history_backfills
+            # Análise básica
+            analysis = {
+                "repository": f"{owner}/{repo}",
+                "description": repo_data.get("description", ""),
+                "language": repo_data.get("language", ""),
+                "stars": repo_data.get("stargazers_count", 0),
+                "forks": repo_data.get("forks_count", 0),
+                "workflows": {
+                    "total": workflows.get("total_count", 0),
+                    "active": len([w for w in workflows.get("workflows", []) if w["state"] == "active"])
+                },
+                "recent_activity": {
+                    # Total de runs no GitHub, como antes do histórico local
+                    "total_runs": history.total_count if history.total_count is not None else ci_stats["runs"],
+                    "successful_runs": ci_stats["successes"],
+                    "failed_runs": ci_stats["failures"],
+                },
+                "ci_statistics": ci_stats,
             }
-        }
 
-        # Sugestões baseadas na análise
-        suggestions = []
+            # Sugestões baseadas na análise
+            suggestions = []
 
-        if analysis["workflows"]["total"] == 0:
-            suggestions.append({
-                "type": "workflow",
-                "priority": "high",
-                "title": "Implementar workflows CI/CD",
-                "description": "Repositório não possui workflows GitHub Actions configurados"
-            })
+            if analysis["workflows"]["total"] == 0:
+                suggestions.append({
+                    "type": "workflow",
+                    "priority": "high",
+                    "title": "Implementar workflows CI/CD",
+                    "description": "Repositório não possui workflows GitHub Actions configurados"
+                })
 
-        if analysis["recent_activity"]["failed_runs"] > 0:
-            failure_rate = analysis["recent_activity"]["failed_runs"] / max(analysis["recent_activity"]["total_runs"], 1)
-            if failure_rate > 0.2:  # 20% de falha
+            failure_rate = ci_stats["failure_rate"]
+            if failure_rate is not None and failure_rate > 0.2:  # 20% de falha
                 suggestions.append({
                     "type": "reliability",
                     "priority": "high",
                     "title": "Melhorar confiabilidade dos workflows",
-                    "description": f"Taxa de falha alta: {failure_rate:.1%}"
+                    "description": (
+                        f"Taxa de falha alta: {failure_rate:.1%} "
+                        f"em {ci_stats['successes'] + ci_stats['failures']} runs concluídas"
+                    ),
                 })
 
-        analysis["suggestions"] = suggestions
-        analysis["timestamp"] = datetime.now().isoformat()
+            flaky_rate = ci_stats["flaky_rate"]
+            if flaky_rate is not None and flaky_rate > 0.1:  # 10% dos commits
+                suggestions.append({
+                    "type": "reliability",
+                    "priority": "medium",
+                    "title": "Investigar workflows instáveis",
+                    "description": (
+                        f"{ci_stats['flaky_commits']} commits com resultado inconsistente "
+                        f"entre execuções ({flaky_rate:.1%})"
+                    ),
+                })
+
+            analysis["suggestions"] = suggestions
+            analysis["timestamp"] = datetime.now().isoformat()
 
-        logging.info(f"Análise do repositório {repo_url} concluída com sucesso.")
+        logging.info("Análise do repositório %s concluída com sucesso.", repo_url)
         return analysis
 
     except Exception as e:
-        logging.error(f"Erro na análise do repositório {repo_url}: {str(e)}")
+        logging.error("Erro na análise do repositório %s: %s", repo_url, e)
         return {"error": f"Erro na análise: {str(e)}"}
 
+async def _sync_run_history(owner: str, repo: str, priority: int = Priority.NORMAL) -> run_history.RunHistory:
+    """
+    Traz o histórico local de runs do repositório em dia.
+
+    A primeira sincronização busca só a primeira página no caminho da
+    requisição e completa até ``RUN_HISTORY_BACKFILL`` runs em segundo plano;
+    as seguintes buscam só as runs criadas a partir da marca d'água do
+    histórico (runs novas e as ainda em andamento). Sincronizações mais
+    próximas que ``RUN_HISTORY_SYNC_INTERVAL`` reaproveitam o histórico sem
+    ir ao GitHub, e sincronizações concorrentes do mesmo repositório são
+    coalescidas.
+
+    Raises:
+        GitHubAPIError: Se alguma página retornar um payload de erro
+    """
+    full_name = f"{owner}/{repo}"
+    return await run_history_syncs.do(full_name, lambda: _run_history_sync(owner, repo, priority))
+
+
+async def _run_history_sync(owner: str, repo: str, priority: int) -> run_history.RunHistory:
+    """Uma sincronização do histórico de runs (ver ``_sync_run_history``)."""
+    full_name = f"{owner}/{repo}"
+    history = run_history_store.get(full_name) or run_history.RunHistory(run_history_store.max_runs)
+    if history.synced_at is not None and time.monotonic() - history.synced_at < run_history.RUN_HISTORY_SYNC_INTERVAL:
+        return history
+
+    since = history.watermark()
+    next_url = None
+    if since:
+        runs = await _collect_runs(
+            f"/repos/{owner}/{repo}/actions/runs?per_page=100&created={quote(f'>={since}')}",
+            history.max_runs,
+            priority,
+        )
+    else:
+        links: Dict[str, str] = {}
+        page = await github_api_request(
+            f"/repos/{owner}/{repo}/actions/runs?per_page=100",
+            priority=priority,
+            links=links,
+            fields=RUN_HISTORY_FIELDS,
+        )
+        if isinstance(page, dict) and "error" in page:
+            raise GitHubAPIError(page)
+        runs = page.get("workflow_runs", [])[:run_history.RUN_HISTORY_BACKFILL]
+        next_url = links.get("next")
+        history.total_count = page.get("total_count")
+
+    # Na primeira página, as runs já estão no total_count informado pelo GitHub
+    changed = history.ingest(runs, counted=not since)
+    history.synced_at = time.monotonic()
+    # Só repositórios sincronizados com sucesso ocupam o store
+    run_history_store.put(full_name, history)
+    logging.info(
+        "Histórico de runs de %s sincronizado: %s runs lidas, %s novas ou alteradas, %s no total.",
+        full_name, len(runs), changed, len(history),
+    )
+    if next_url and len(runs) < run_history.RUN_HISTORY_BACKFILL and full_name not in run_history_backfills:
+        # Contexto vazio: os spans do backfill não entram no trace da ferramenta
+        task = asyncio.get_running_loop().create_task(
+            _backfill_run_history(full_name, history, _api_endpoint(next_url), run_history.RUN_HISTORY_BACKFILL - len(runs)),
+            context=contextvars.Context(),
+        )
+        run_history_backfills[full_name] = task
+        task.add_done_callback(lambda _: run_history_backfills.pop(full_name, None))
+    return history
+
+
+async def _collect_runs(endpoint: str, limit: int, priority: int) -> List[Dict]:
+    """Runs de todas as páginas de ``endpoint``, até ``limit``."""
+    runs = []
+    workflow_runs = github_api_paginate(
+        endpoint, items_key="workflow_runs", limit=limit, priority=priority, fields=RUN_HISTORY_FIELDS
+    )
+    async with aclosing(workflow_runs):
+        async for run in workflow_runs:
+            runs.append(run)
+    return runs
+
+
+async def _backfill_run_history(full_name: str, history: run_history.RunHistory, endpoint: str, limit: int) -> None:
+    """Completa o histórico da primeira sincronização com as páginas seguintes, como BULK."""
+    try:
+        runs = await _collect_runs(endpoint, limit, Priority.BULK)
+    except GitHubAPIError as e:
+        logging.warning("Backfill do histórico de runs de %s interrompido: %s", full_name, e.payload["error"])
+        return
+    changed = history.ingest(runs, counted=True)
+    logging.info("Backfill do histórico de runs de %s: %s runs, %s novas.", full_name, len(runs), changed)
+
 @app.tool()
 async def create_workflow_issue(repo: str, workflow_type: str, title: str = None) -> Dict:
     """
@@ -178,119 +949,24 @@ async def create_workflow_issue(repo: str, workflow_type: str, title: str = None
         workflow_type: Tipo do workflow (ci, cd, build, test, deploy, main)
         title: Título customizado (opcional)
     """
-    logging.info(f"Tentando criar issue de workflow '{workflow_type}' no repositório {repo}")
+    logging.info("Tentando criar issue de workflow '%s' no repositório %s", workflow_type, repo)
     try:
         owner, repo_name = repo.split("/")[-2:]
 
-        workflow_templates = {
-            "ci": {
-                "title": "🔄 Implementar Workflow CI (Integração Contínua)",
-                "labels": ["enhancement", "ci-cd", "workflow", "priority-high"],
-                "body": """## 🔄 Implementar Workflow CI
-
-### 📋 Objetivo
-Implementar workflow de Integração Contínua seguindo o padrão xCloud.
-
-### ✅ Checklist de Implementação
-- [ ] Criar arquivo `.github/workflows/ci.yml`
-- [ ] Configurar triggers (push/PR para main/develop)
-- [ ] Implementar quality checks (lint, format, audit)
-- [ ] Configurar build do projeto
-- [ ] Adicionar execução de testes
-- [ ] Upload de artefatos de build
-- [ ] Configurar coverage reports
-
-### 🎯 Referência
-- [Padrão de Workflows xCloud](../xcloud-docs/docs/guides/github-actions-workflows.md)
-- [Implementação de Referência](../xcloud-bot/.github/workflows/ci.yml)
-
-### 📊 Critérios de Aceite
-- [ ] Workflow executado em push/PR
-- [ ] Quality checks passando
-- [ ] Build gerado com sucesso
-- [ ] Testes executados
-- [ ] Cobertura reportada
-- [ ] Documentação atualizada
-
-_Issue criada automaticamente pelo xCloud Bot_"""
-            },
-            "cd": {
-                "title": "🚀 Implementar Workflow CD (Entrega Contínua)",
-                "labels": ["enhancement", "ci-cd", "workflow", "deployment"],
-                "body": """## 🚀 Implementar Workflow CD
-
-### 📋 Objetivo
-Implementar workflow de Entrega Contínua para deploy automático.
-
-### ✅ Checklist de Implementação
-- [ ] Criar arquivo `.github/workflows/cd.yml`
-- [ ] Configurar trigger pós-CI
-- [ ] Implementar deploy para staging
-- [ ] Configurar deploy manual para production
-- [ ] Adicionar notificações
-- [ ] Configurar environments no GitHub
-
-### 🎯 Ambientes
-- **Staging**: Deploy automático após CI
-- **Production**: Deploy manual com aprovação
-
-### 📊 Critérios de Aceite
-- [ ] Deploy staging automático
-- [ ] Deploy production manual
-- [ ] Notificações funcionando
-- [ ] Rollback em caso de falha
-
-_Issue criada automaticamente pelo xCloud Bot_"""
-            },
-            "build": {
-                "title": "🏗️ Implementar Workflow Build Especializado",
-                "labels": ["enhancement", "build", "workflow"],
-                "body": """## 🏗️ Implementar Workflow Build
-
-### 📋 Objetivo
-Implementar workflow especializado para builds reutilizáveis.
-
-### ✅ Checklist de Implementação
-- [ ] Criar arquivo `.github/workflows/build.yml`
-- [ ] Configurar `workflow_call`
-- [ ] Implementar build otimizado
-- [ ] Análise de artefatos
-- [ ] Build de documentação
-- [ ] Cache inteligente
-
-### 📊 Critérios de Aceite
-- [ ] Reutilizável por outros workflows
-- [ ] Build otimizado e rápido
-- [ ] Artefatos bem organizados
-- [ ] Documentação gerada
-
-_Issue criada automaticamente pelo xCloud Bot_"""
-            }
-        }
+        # Importado sob demanda: a tabela de templates não pesa na partida
+        from xcloud_mcp import workflow_templates
 
-        if workflow_type not in workflow_templates:
-            logging.error(f"Tipo de workflow inválido solicitado: {workflow_type}")
+        if workflow_type not in workflow_templates.WORKFLOW_TEMPLATES:
+            logging.error("Tipo de workflow inválido solicitado: %s", workflow_type)
             return {"error": f"Tipo de workflow inválido: {workflow_type}"}
 
-        template = workflow_templates[workflow_type]
-
-        issue_data = {
-            "title": title or template["title"],
-            "body": template["body"],
-            "labels": template["labels"]
-        }
-
-        result = await github_api_request(
-            f"/repos/{owner}/{repo_name}/issues",
-            method="POST",
-            data=issue_data
-        )
+        result = await _post_issue(owner, repo_name, workflow_templates.issue_data(workflow_type, title))
 
         if "error" in result:
-            logging.error(f"Erro ao criar issue em {repo}: {result['error']}")
+            logging.error("Erro ao criar issue em %s: %s", repo, result["error"])
             return result
 
-        logging.info(f"Issue {result.get('number')} criada com sucesso em {repo}")
+        logging.info("Issue %s criada com sucesso em %s", result.get("number"), repo)
         return {
             "success": True,
             "issue_url": result.get("html_url"),
@@ -299,49 +975,293 @@ _Issue criada automaticamente pelo xCloud Bot_"""
         }
 
     except Exception as e:
-        logging.error(f"Exceção ao criar issue em {repo}: {str(e)}")
+        logging.error("Exceção ao criar issue em %s: %s", repo, e)
         return {"error": f"Erro: {str(e)}"}
 
 @app.tool()
-async def monitor_ci_status(repo: str, limit: int = 10) -> List[Dict]:
+async def create_workflow_issues(
+    repos: List[str],
+    workflow_type: str,
+    title: str = None,
+    idempotency_key: str = None,
+    ctx: Optional[Context] = None,
+) -> Dict:
+    """
+    Cria a issue de implementação de um workflow em vários repositórios
+
+    Repositórios que já têm uma issue aberta do mesmo template são pulados
+    (busca em lote). As issues faltantes são criadas em paralelo, respeitando
+    o limite secundário do GitHub para criação de conteúdo. Repetir a chamada
+    com a mesma chave de idempotência nunca duplica issues.
+
+    Args:
+        repos: Lista de repositórios (owner/repo)
+        workflow_type: Tipo do workflow (ci, cd, build)
+        title: Título customizado (opcional)
+        idempotency_key: Chave da rodada (opcional; padrão derivado do tipo e do título)
+    """
+    from xcloud_mcp import workflow_templates
+
+    if workflow_type not in workflow_templates.WORKFLOW_TEMPLATES:
+        logging.error("Tipo de workflow inválido solicitado: %s", workflow_type)
+        return {"error": f"Tipo de workflow inválido: {workflow_type}"}
+
+    repo_names = list(dict.fromkeys(repos))
+    issue_title = title or workflow_templates.WORKFLOW_TEMPLATES[workflow_type]["title"]
+    key = idempotency_key or workflow_templates.default_key(workflow_type, issue_title)
+    issue_data = workflow_templates.issue_data(workflow_type, issue_title, key)
+    logging.info("Criando issues de workflow '%s' em %s repositórios (chave %s)", workflow_type, len(repo_names), key)
+
+    valid = [name for name in repo_names if "/" in name]
+    open_issues = await _find_open_workflow_issues(valid, [workflow_templates.LOOKUP_LABEL])
+    semaphore = asyncio.Semaphore(max(ISSUE_ROLLOUT_CONCURRENCY, 1))
+
+    async def rollout(repo: str) -> Tuple[str, Dict]:
+        if "/" not in repo:
+            return repo, {"status": "failed", "error": "Repositório inválido. Use formato: owner/repo"}
+        issues = open_issues.get(repo)
+        if isinstance(issues, dict):
+            return repo, {"status": "failed", "error": issues["error"]}
+        existing = workflow_templates.find_existing(issues, workflow_type, issue_title, key)
+        if existing is not None:
+            return repo, {"status": "skipped", "issue_number": existing["number"], "issue_url": existing["html_url"]}
+        async with semaphore:
+            return repo, await _create_issue_once(repo, key, issue_data)
+
+    results: Dict[str, Dict] = {}
+    for completed, next_result in enumerate(asyncio.as_completed([rollout(repo) for repo in repo_names]), start=1):
+        repo, result = await next_result
+        results[repo] = result
+        if ctx is not None:
+            await ctx.report_progress(
+                completed,
+                len(repo_names),
+                json.dumps({"repo": repo, **result}, ensure_ascii=False, default=str),
+            )
+
+    counts = {status: sum(result["status"] == status for result in results.values()) for status in ("created", "skipped", "failed")}
+    logging.info(
+        "Issues de workflow '%s': %s criada(s), %s pulada(s), %s falha(s).",
+        workflow_type, counts["created"], counts["skipped"], counts["failed"],
+    )
+    return {
+        "workflow_type": workflow_type,
+        "idempotency_key": key,
+        "total": len(repo_names),
+        **counts,
+        "results": {repo: results[repo] for repo in repo_names},
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+async def _find_open_workflow_issues(full_names: List[str], labels: List[str]) -> Dict[str, Union[List[Dict], Dict]]:
+    """
+    Issues abertas com ``labels`` em cada repositório, numa consulta GraphQL
+    por lote; lotes ou repositórios sem resposta, ou com mais issues do que
+    cabem numa página da consulta, são consultados via REST, paginando.
+
+    Returns:
+        Dict full_name -> lista de issues, ou o payload de erro da consulta
+    """
+    async def fetch(chunk: List[str]) -> Dict[str, Optional[List[Dict]]]:
+        query, variables = github_graphql.build_open_issues_query(chunk, labels)
+        response = await github_api_request(
+            "/graphql",
+            method="POST",
+            data={"query": query, "variables": variables},
+            priority=Priority.BULK,
+        )
+        if "error" in response or not isinstance(response.get("data"), dict):
+            logging.warning(
+                "Consulta GraphQL de issues falhou para %s repositórios; usando REST: %s",
+                len(chunk), response.get("error") or response.get("errors"),
+            )
+            return {full_name: None for full_name in chunk}
+        return github_graphql.parse_open_issues_response(chunk, response["data"])
+
+    async def fetch_rest(full_name: str) -> Union[List[Dict], Dict]:
+        owner, repo = full_name.split("/")[-2:]
+        pages = github_api_paginate(
+            f"/repos/{owner}/{repo}/issues?state=open&labels={quote(','.join(labels))}&per_page=100",
+            priority=Priority.BULK,
+            fields=ISSUE_FIELDS,
+        )
+        try:
+            async with aclosing(pages):
+                # O endpoint de issues também lista pull requests
+                return [issue async for issue in pages if "pull_request" not in issue]
+        except GitHubAPIError as e:
+            return e.payload
+
+    results: Dict[str, Union[List[Dict], Dict, None]] = {}
+    for chunk_result in await asyncio.gather(*(fetch(chunk) for chunk in github_graphql.chunked(full_names))):
+        results.update(chunk_result)
+    missing = [full_name for full_name, issues in results.items() if issues is None]
+    for full_name, issues in zip(missing, await asyncio.gather(*(fetch_rest(name) for name in missing))):
+        results[full_name] = issues
+    return results
+
+
+async def _create_issue_once(repo: str, key: str, issue_data: Dict) -> Dict:
+    """
+    Cria a issue no máximo uma vez por (repositório, chave): chamadas
+    concorrentes compartilham a mesma criação, e repetições logo depois dela
+    (antes que a busca a enxergue) reaproveitam o resultado.
+    """
+    created = recent_issue_creations.get((repo, key))
+    if created is not None:
+        return {**created, "status": "skipped"}
+
+    owner, repo_name = repo.split("/")[-2:]
+    result = await issue_singleflight.do((repo, key), lambda: _post_issue(owner, repo_name, issue_data, Priority.BULK))
+    if "error" in result:
+        return {"status": "failed", "error": result["error"]}
+
+    outcome = {"issue_number": result.get("number"), "issue_url": result.get("html_url")}
+    recent_issue_creations[(repo, key)] = outcome
+    while len(recent_issue_creations) > RECENT_ISSUE_CREATIONS_MAX:
+        recent_issue_creations.popitem(last=False)
+    return {**outcome, "status": "created"}
+
+
+async def _post_issue(owner: str, repo_name: str, issue_data: Dict, priority: int = Priority.NORMAL) -> Dict:
+    """Cria uma issue, espaçada das demais criações de conteúdo."""
+    await content_pacer.wait()
+    result = await github_api_request(
+        f"/repos/{owner}/{repo_name}/issues",
+        method="POST",
+        data=issue_data,
+        priority=priority,
+    )
+    if "error" not in result:
+        github_cache.invalidate(f"/repos/{owner}/{repo_name}/issues")
+    return result
+
+@app.tool()
+async def monitor_ci_status(
+    repo: str,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    wait: float = 0,
+) -> Union[List[Dict], Dict]:
     """
     Monitora status de workflows CI em um repositório
 
     Args:
         repo: Repositório (owner/repo)
         limit: Número máximo de runs para analisar
+        cursor: Modo incremental. Passe "" na primeira chamada e, nas seguintes, o
+            cursor retornado; só runs novas ou com status alterado são retornadas
+        wait: No modo incremental, segundos para aguardar uma mudança (long-poll)
     """
-    logging.info(f"Monitorando status de CI para o repositório {repo} (limite: {limit})")
+    logging.info("Monitorando status de CI para o repositório %s (limite: %s)", repo, limit)
     try:
         owner, repo_name = repo.split("/")[-2:]
 
-        runs = await github_api_request(f"/repos/{owner}/{repo_name}/actions/runs?per_page={limit}")
+        if cursor is not None:
+            return await _watch_ci_status(owner, repo_name, limit, cursor, wait)
 
-        if "error" in runs:
-            logging.error(f"Erro ao buscar workflow runs para {repo}: {runs['error']}")
-            return runs
+        snapshot = org_refresher.get()
+        if snapshot is not None:
+            data, age = snapshot
+            cached_runs = data["runs"].get(f"{owner}/{repo_name}")
+            if cached_runs is not None and (limit <= len(cached_runs) or len(cached_runs) < refresher.REFRESH_RUNS):
+                logging.info("Respondendo CI de %s com snapshot de %.0fs.", repo, age)
+                return [
+                    {**{k: v for k, v in run.items() if k != "id"}, "snapshot_age": round(age, 1)}
+                    for run in cached_runs[:limit]
+                ]
 
         status_data = []
-        workflow_runs = runs.get("workflow_runs", [])
-        for run in workflow_runs:
-            status_data.append({
-                "workflow": run["name"],
-                "status": run["status"],
-                "conclusion": run["conclusion"],
-                "branch": run["head_branch"],
-                "commit": run["head_sha"][:7],
-                "actor": run["actor"]["login"],
-                "created_at": run["created_at"],
-                "html_url": run["html_url"]
-            })
-
-        logging.info(f"Monitoramento de CI para {repo} concluído. {len(status_data)} runs encontradas.")
+        workflow_runs = github_api_paginate(
+            f"/repos/{owner}/{repo_name}/actions/runs?per_page={min(max(limit, 1), 100)}",
+            items_key="workflow_runs",
+            limit=limit,
+            priority=Priority.INTERACTIVE,
+            fields=RUNS_FIELDS,
+        )
+        async with aclosing(workflow_runs):
+            async for run in workflow_runs:
+                status_data.append(_summarize_run(run))
+
+        logging.info("Monitoramento de CI para %s concluído. %s runs encontradas.", repo, len(status_data))
         return status_data
 
+    except GitHubAPIError as e:
+        logging.error("Erro ao buscar workflow runs para %s: %s", repo, e.payload["error"])
+        return e.payload
+
+    except ci_watch.InvalidCursor as e:
+        logging.warning("Cursor inválido recebido para %s", repo)
+        return {"error": str(e)}
+
     except Exception as e:
-        logging.error(f"Exceção ao monitorar CI para {repo}: {str(e)}")
+        logging.error("Exceção ao monitorar CI para %s: %s", repo, e)
         return {"error": f"Erro: {str(e)}"}
 
+
+def _summarize_run(run: Dict) -> Dict:
+    """Campos de uma workflow run expostos pelas ferramentas de CI."""
+    return {
+        "workflow": run["name"],
+        "status": run["status"],
+        "conclusion": run["conclusion"],
+        "branch": run["head_branch"],
+        "commit": run["head_sha"][:7],
+        "actor": run["actor"]["login"],
+        "created_at": run["created_at"],
+        "html_url": run["html_url"]
+    }
+
+
+async def _watch_ci_status(owner: str, repo_name: str, limit: int, cursor: str, wait: float) -> Dict:
+    """
+    Modo incremental de monitor_ci_status.
+
+    Busca só as runs criadas a partir da janela do cursor (`created>=`), com
+    requisições condicionais: enquanto nada muda, o GitHub responde 304.
+    """
+    full_name = f"{owner}/{repo_name}"
+    since, known = ci_watch.decode_cursor(cursor, full_name) if cursor else (None, {})
+
+    if since:
+        created = quote(f">={since}")
+        endpoint = f"/repos/{owner}/{repo_name}/actions/runs?per_page=100&created={created}"
+        max_runs = ci_watch.WATCH_MAX_RUNS
+    else:
+        endpoint = f"/repos/{owner}/{repo_name}/actions/runs?per_page={min(max(limit, 1), 100)}"
+        max_runs = limit
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + min(max(wait, 0), ci_watch.WATCH_MAX_WAIT)
+    while True:
+        runs = []
+        workflow_runs = github_api_paginate(
+            endpoint,
+            items_key="workflow_runs",
+            limit=max_runs,
+            priority=Priority.INTERACTIVE,
+            fields=RUNS_FIELDS,
+        )
+        async with aclosing(workflow_runs):
+            async for run in workflow_runs:
+                runs.append(run)
+
+        changed = ci_watch.diff_runs(runs, known)
+        remaining = deadline - loop.time()
+        if changed or remaining <= 0:
+            break
+        await asyncio.sleep(min(ci_watch.WATCH_POLL_INTERVAL, remaining))
+
+    next_since, next_known = ci_watch.advance(runs, since) if runs else (since, known)
+    logging.info("Watch de CI para %s: %s runs novas ou alteradas.", full_name, len(changed))
+    return {
+        "repository": full_name,
+        "runs": [{"id": run["id"], **_summarize_run(run)} for run in changed],
+        "changed": bool(changed),
+        "cursor": ci_watch.encode_cursor(full_name, next_since, next_known),
+    }
+
 @app.tool()
 async def get_xcloud_repositories() -> List[Dict]:
     """
@@ -349,12 +1269,38 @@ async def get_xcloud_repositories() -> List[Dict]:
     """
     logging.info("Buscando repositórios xCloud da organização PageCloudv1")
     try:
-        repos = await github_api_request("/orgs/PageCloudv1/repos?per_page=100")
+        snapshot = org_refresher.get()
+        if snapshot is not None:
+            data, age = snapshot
+            logging.info("Respondendo com snapshot de %.0fs (%s repositórios).", age, len(data["repositories"]))
+            return [{**repo, "snapshot_age": round(age, 1)} for repo in data["repositories"]]
+
+        xcloud_repos = await _fetch_xcloud_repositories()
+
+        logging.info("Encontrados %s repositórios xCloud.", len(xcloud_repos))
+        return xcloud_repos
+
+    except GitHubAPIError as e:
+        logging.error("Erro ao buscar repositórios da organização: %s", e.payload["error"])
+        return e.payload
+
+    except Exception as e:
+        logging.error("Exceção ao buscar repositórios xCloud: %s", e)
+        return {"error": f"Erro: {str(e)}"}
 
-        if "error" in repos:
-            logging.error(f"Erro ao buscar repositórios da organização: {repos['error']}")
-            return repos
 
+async def _fetch_xcloud_repositories() -> List[Dict]:
+    """
+    Lista os repositórios xcloud-* e verifica quais possuem workflows.
+
+    Raises:
+        GitHubAPIError: Se a listagem da organização falhar
+    """
+    repos = github_api_paginate(
+        "/orgs/PageCloudv1/repos?per_page=100", priority=Priority.BULK, fields=ORG_REPO_FIELDS
+    )
+
+    async with aclosing(repos):
         xcloud_repos = [
             {
                 "name": repo["name"],
@@ -364,26 +1310,155 @@ async def get_xcloud_repositories() -> List[Dict]:
                 "html_url": repo["html_url"],
                 "has_workflows": False  # Será verificado depois
             }
-            for repo in repos
+            async for repo in repos
             if repo["name"].startswith("xcloud-")
         ]
 
-        # Verifica se cada repo tem workflows
+    # Verifica se cada repo tem workflows, com concorrência limitada
+    semaphore = asyncio.Semaphore(max(WORKFLOW_PROBE_CONCURRENCY, 1))
+
+    async def check_workflows(repo: Dict) -> None:
+        async with semaphore:
+            try:
+                workflows = await asyncio.wait_for(
+                    github_api_request(
+                        f"/repos/{repo['full_name']}/actions/workflows",
+                        priority=Priority.BULK,
+                        fields=WORKFLOWS_FIELDS,
+                    ),
+                    timeout=WORKFLOW_PROBE_TIMEOUT,
+                )
+            except asyncio.TimeoutError:
+                workflows = {
+                    "error": {
+                        "type": "NETWORK_ERROR",
+                        "message": f"Tempo limite de {WORKFLOW_PROBE_TIMEOUT}s excedido ao verificar workflows."
+                    }
+                }
+        if "error" in workflows:
+            logging.warning("Não foi possível verificar workflows para %s: %s", repo["full_name"], workflows["error"])
+            repo["has_workflows"] = False
+            repo["error_checking_workflows"] = workflows['error']
+        else:
+            repo["has_workflows"] = workflows.get("total_count", 0) > 0
+
+    # Com o backend GraphQL, um lote por query substitui as sondagens REST
+    pending = xcloud_repos
+    if github_graphql.GRAPHQL_ENABLED and xcloud_repos:
+        metadata = await github_graphql_repositories(
+            [repo["full_name"] for repo in xcloud_repos],
+            priority=Priority.BULK,
+        )
+        pending = []
         for repo in xcloud_repos:
-            workflows = await github_api_request(f"/repos/{repo['full_name']}/actions/workflows")
-            if "error" in workflows:
-                logging.warning(f"Não foi possível verificar workflows para {repo['full_name']}: {workflows['error']}")
-                repo["has_workflows"] = False
-                repo["error_checking_workflows"] = workflows['error']
+            info = metadata.get(repo["full_name"])
+            if info is None:
+                pending.append(repo)
             else:
-                repo["has_workflows"] = workflows.get("total_count", 0) > 0
+                repo["has_workflows"] = bool(info["workflow_files"])
 
-        logging.info(f"Encontrados {len(xcloud_repos)} repositórios xCloud.")
-        return xcloud_repos
+    await asyncio.gather(*(check_workflows(repo) for repo in pending))
+    return xcloud_repos
 
-    except Exception as e:
-        logging.error(f"Exceção ao buscar repositórios xCloud: {str(e)}")
-        return {"error": f"Erro: {str(e)}"}
+
+async def _refresh_org_snapshot() -> Optional[Dict]:
+    """
+    Ciclo do refresher: repositórios, presença de workflows e runs recentes.
+
+    Pula o ciclo quando o orçamento do GitHub está na reserva das chamadas
+    interativas.
+    """
+    remaining = github_scheduler.remaining
+    if remaining is not None and remaining <= github_scheduler.reserve:
+        logging.warning("Orçamento do GitHub baixo (%s); atualização do snapshot adiada.", remaining)
+        return None
+
+    repositories = await _fetch_xcloud_repositories()
+    semaphore = asyncio.Semaphore(max(WORKFLOW_PROBE_CONCURRENCY, 1))
+
+    async def recent_runs(repo: Dict) -> Optional[List[Dict]]:
+        if not repo["has_workflows"]:
+            return []
+        workflow_runs = github_api_paginate(
+            f"/repos/{repo['full_name']}/actions/runs?per_page={refresher.REFRESH_RUNS}",
+            items_key="workflow_runs",
+            limit=refresher.REFRESH_RUNS,
+            priority=Priority.BULK,
+            fields=RUNS_FIELDS,
+        )
+        try:
+            async with semaphore, aclosing(workflow_runs):
+                return [{"id": run["id"], **_summarize_run(run)} async for run in workflow_runs]
+        except GitHubAPIError as e:
+            logging.warning("Runs de %s fora do snapshot: %s", repo["full_name"], e.payload["error"])
+            return None
+
+    runs = await asyncio.gather(*(recent_runs(repo) for repo in repositories))
+    return {
+        "repositories": repositories,
+        "runs": {
+            repo["full_name"]: repo_runs
+            for repo, repo_runs in zip(repositories, runs)
+            if repo_runs is not None
+        },
+    }
+
+
+def _apply_webhook_to_snapshot(event: str, payload: Dict) -> bool:
+    """
+    Atualiza o snapshot da organização com um evento de webhook, sem ir ao GitHub.
+
+    Returns:
+        True se o snapshot foi alterado
+    """
+    data = org_refresher.data
+    repository = payload.get("repository") or {}
+    full_name = repository.get("full_name")
+    if data is None or not full_name:
+        return False
+
+    if event == "workflow_run" and "workflow_run" in payload:
+        # Só repositórios com runs no snapshot: para os demais (fora do xCloud
+        # ou cuja busca falhou), uma run isolada passaria por histórico completo
+        if full_name not in data["runs"]:
+            return False
+        run = payload["workflow_run"]
+        runs = [cached for cached in data["runs"][full_name] if cached["id"] != run["id"]]
+        runs.append({"id": run["id"], **_summarize_run(run)})
+        runs.sort(key=lambda cached: cached["created_at"], reverse=True)
+        data["runs"][full_name] = runs[:refresher.REFRESH_RUNS]
+        for repo in data["repositories"]:
+            if repo["full_name"] == full_name:
+                repo["has_workflows"] = True
+        return True
+
+    if event == "repository":
+        action = payload.get("action")
+        old_name = (((payload.get("changes") or {}).get("repository") or {}).get("name") or {}).get("from")
+        owner = (repository.get("owner") or {}).get("login")
+        previous = f"{owner}/{old_name}" if old_name and owner else full_name
+        known = [repo for repo in data["repositories"] if repo["full_name"] in (full_name, previous)]
+        data["repositories"] = [repo for repo in data["repositories"] if repo not in known]
+        runs = data["runs"].pop(previous, None)
+        if action in ("deleted", "archived", "transferred") or not repository.get("name", "").startswith("xcloud-"):
+            return bool(known)
+        data["repositories"].append({
+            "name": repository["name"],
+            "full_name": full_name,
+            "description": repository.get("description"),
+            "language": repository.get("language"),
+            "html_url": repository.get("html_url"),
+            "has_workflows": known[0]["has_workflows"] if known else False,
+        })
+        if runs is not None:
+            data["runs"][full_name] = runs
+        return True
+
+    return False
+
+
+# Snapshot da organização atualizado em segundo plano (X_CLOUD_MCP_REFRESH_INTERVAL)
+org_refresher = refresher.SnapshotRefresher(_refresh_org_snapshot)
 
 
 def run_server(
@@ -407,9 +1482,64 @@ def run_server(
             )
             port_int = 8000
 
-        app.run(transport=transport, host=host, port=port_int, **transport_kwargs)
-    else:
-        app.run(transport=transport, **transport_kwargs)
+        transport_kwargs.update(host=host, port=port_int)
+
+        if workers.WORKERS > 1 and not workers.is_worker():
+            # O snapshot da organização vive na memória de um processo: com
+            # vários workers, só uma fração das requisições e dos webhooks o veria
+            per_process = [
+                name for name, enabled in (
+                    ("X_CLOUD_MCP_REFRESH_INTERVAL", refresher.REFRESH_INTERVAL > 0),
+                    ("X_CLOUD_MCP_WEBHOOK_SECRET", bool(webhooks.WEBHOOK_SECRET)),
+                ) if enabled
+            ]
+            if transport not in workers.MULTI_WORKER_TRANSPORTS:
+                logging.warning(
+                    "Transporte '%s' mantém sessões em memória; ignorando X_CLOUD_MCP_WORKERS=%s e usando um worker.",
+                    transport,
+                    workers.WORKERS,
+                )
+            elif per_process:
+                logging.warning(
+                    "%s mantém o snapshot da organização em memória; ignorando X_CLOUD_MCP_WORKERS=%s e usando um worker.",
+                    " e ".join(per_process),
+                    workers.WORKERS,
+                )
+            else:
+                workers.supervise(transport, host, port_int)
+                return
+
+    if transport == "stdio":
+        # Clientes stdio iniciam um processo por sessão; o banner (rich) atrasa
+        # a resposta ao initialize e ninguém o vê
+        transport_kwargs.setdefault("show_banner", False)
+
+    if workers.is_worker():
+        # Todos os workers escutam a mesma porta; sem estado de sessão, qualquer
+        # worker atende qualquer requisição
+        listener = workers.bind_reuseport(host, transport_kwargs["port"])
+        transport_kwargs.update(uvicorn_config={"fd": listener.fileno()}, stateless_http=True)
+
+    asyncio.run(_serve(transport, **transport_kwargs))
+
+
+async def _serve(transport: str, **transport_kwargs) -> None:
+    """Executa o servidor e libera os recursos compartilhados ao encerrar."""
+    if github_persistent_cache is not None:
+        await github_persistent_cache.open(github_cache)
+    if workers.is_primary():
+        org_refresher.start()
+    if transport != "stdio":
+        # Só os transportes HTTP expõem /ready
+        loop_monitor.start()
+    try:
+        await app.run_async(transport=transport, **transport_kwargs)
+    finally:
+        await loop_monitor.stop()
+        await org_refresher.stop()
+        if github_persistent_cache is not None:
+            await github_persistent_cache.close()
+        await github_client.close_session()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,264 @@
+"""
+📈 Métricas no formato texto do Prometheus
+
+Histogramas de latência por ferramenta MCP e por endpoint do GitHub
+(normalizado em templates), contadores de resultado e gauges de requisições
+em andamento. Tudo é atualizado a partir do event loop, que é
+single-threaded: o registro é só aritmética em listas/dicts, sem locks.
+"""
+
+import re
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastmcp.server.middleware import Middleware
+
+# Limites dos buckets de latência, em segundos
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# Segmentos do caminho que viram placeholders no template do endpoint
+_ENDPOINT_PATTERNS = [
+    (re.compile(r"^/repos/[^/]+/[^/]+"), "/repos/{owner}/{repo}"),
+    (re.compile(r"^/orgs/[^/]+"), "/orgs/{org}"),
+    (re.compile(r"^/users/[^/]+"), "/users/{user}"),
+    (re.compile(r"/actions/workflows/[^/]+"), "/actions/workflows/{workflow}"),
+    (re.compile(r"/git/refs/.+"), "/git/refs/{ref}"),
+    (re.compile(r"/contents/.+"), "/contents/{path}"),
+    (re.compile(r"/\d+(?=/|$)"), "/{id}"),
+]
+
+
+def endpoint_template(endpoint: str) -> str:
+    """``/repos/PageCloudv1/xcloud-a/actions/runs?page=2`` -> ``/repos/{owner}/{repo}/actions/runs``."""
+    path = endpoint.split("?", 1)[0]
+    for pattern, replacement in _ENDPOINT_PATTERNS:
+        path = pattern.sub(replacement, path)
+    return path
+
+
+def _labels(**labels: str) -> Labels:
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    body = ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs)
+    return "{" + body + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, const_labels: Labels = ()):
+        self.name = name
+        self.help = help_text
+        self.const_labels = const_labels
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = _labels(**labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in sorted(self.values.items()):
+            yield f"{self.name}{_format_labels(self.const_labels + labels)} {_format_value(value)}"
+
+
+class Gauge:
+    """Gauge com valor mantido pelo chamador ou lido de ``source`` na coleta."""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        source: Optional[Callable[[], Optional[float]]] = None,
+        const_labels: Labels = (),
+    ):
+        self.name = name
+        self.help = help_text
+        self.source = source
+        self.const_labels = const_labels
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = _labels(**labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        self.values[_labels(**labels)] = value
+
+    def total(self) -> float:
+        """Soma de todas as séries."""
+        return sum(self.values.values())
+
+    def render(self) -> Iterable[str]:
+        values = self.values
+        if self.source is not None:
+            value = self.source()
+            values = {(): value} if value is not None else {}
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} gauge"
+        for labels, value in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.const_labels + labels)} {_format_value(value)}"
+
+
+class Histogram:
+    """Histograma com buckets fixos; cada série guarda contagens não cumulativas."""
+
+    def __init__(
+        self, name: str, help_text: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS, const_labels: Labels = ()
+    ):
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        self.const_labels = const_labels
+        # labels -> [contagem por bucket (+Inf no fim), soma]
+        self.series: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _labels(**labels)
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = series
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, (counts, total) in sorted(self.series.items()):
+            labels = self.const_labels + labels
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield f"{self.name}_bucket{_format_labels(labels, ('le', _format_value(bound)))} {cumulative}"
+            cumulative += counts[-1]
+            yield f"{self.name}_bucket{_format_labels(labels, ('le', '+Inf'))} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(labels)} {_format_value(total[0])}"
+            yield f"{self.name}_count{_format_labels(labels)} {cumulative}"
+
+
+class Metrics:
+    """
+    Conjunto de métricas do servidor.
+
+    No modo multi-worker cada processo tem seus próprios contadores; com
+    ``worker``, toda série leva o rótulo ``worker`` e os contadores de
+    workers diferentes não se confundem (nem parecem reinícios) no Prometheus.
+    """
+
+    def __init__(
+        self,
+        rate_limit_remaining: Optional[Callable[[], Optional[float]]] = None,
+        event_loop_lag: Optional[Callable[[], Optional[float]]] = None,
+        worker: str = "",
+    ):
+        const = _labels(worker=worker) if worker else ()
+        self.tool_duration = Histogram(
+            "xcloud_mcp_tool_duration_seconds", "Latência das ferramentas MCP.", const_labels=const
+        )
+        self.tool_calls = Counter(
+            "xcloud_mcp_tool_calls_total", "Chamadas de ferramentas MCP por resultado.", const_labels=const
+        )
+        self.tools_in_flight = Gauge(
+            "xcloud_mcp_tools_in_flight", "Chamadas de ferramentas MCP em andamento.", const_labels=const
+        )
+        self.github_duration = Histogram(
+            "xcloud_mcp_github_request_duration_seconds", "Latência das requisições à API do GitHub.", const_labels=const
+        )
+        self.github_requests = Counter(
+            "xcloud_mcp_github_requests_total", "Requisições à API do GitHub por status e tipo de erro.", const_labels=const
+        )
+        self.github_in_flight = Gauge(
+            "xcloud_mcp_github_requests_in_flight", "Requisições à API do GitHub em andamento.", const_labels=const
+        )
+        self.rate_limit_remaining = Gauge(
+            "xcloud_mcp_github_rate_limit_remaining",
+            "Último valor de X-RateLimit-Remaining visto.",
+            source=rate_limit_remaining,
+            const_labels=const,
+        )
+        self.event_loop_lag = Gauge(
+            "xcloud_mcp_event_loop_lag_seconds",
+            "Atraso do event loop medido pelo ticker de prontidão.",
+            source=event_loop_lag,
+            const_labels=const,
+        )
+
+    def observe_github(
+        self, method: str, endpoint: str, duration: float, status: str, error_type: str = ""
+    ) -> None:
+        template = endpoint_template(endpoint)
+        self.github_duration.observe(duration, method=method, endpoint=template)
+        self.github_requests.inc(method=method, endpoint=template, status=status, error_type=error_type)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in (
+            self.tool_duration,
+            self.tool_calls,
+            self.tools_in_flight,
+            self.github_duration,
+            self.github_requests,
+            self.github_in_flight,
+            self.rate_limit_remaining,
+            self.event_loop_lag,
+        ):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Rótulo dos erros retornados como texto (``{"error": "mensagem"}``)
+TOOL_ERROR = "TOOL_ERROR"
+
+
+def error_type(result) -> str:
+    """
+    Tipo do payload ``{"error": {"type": ...}}``, ``TOOL_ERROR`` para
+    ``{"error": "mensagem"}`` ou ``""`` se não for erro.
+    """
+    if not isinstance(result, dict) or "error" not in result:
+        return ""
+    if isinstance(result["error"], dict):
+        return result["error"].get("type", "UNKNOWN")
+    return TOOL_ERROR
+
+
+class ToolMetricsMiddleware(Middleware):
+    """Mede latência e resultado de cada chamada de ferramenta MCP."""
+
+    def __init__(self, metrics: Metrics):
+        self.metrics = metrics
+
+    async def on_call_tool(self, context, call_next):
+        tool = context.message.name
+        self.metrics.tools_in_flight.inc(tool=tool)
+        started = time.perf_counter()
+        outcome = "exception"
+        try:
+            result = await call_next(context)
+            content = result.structured_content or {}
+            # Retornos que não são objetos chegam embrulhados em {"result": ...}
+            outcome = error_type(content.get("result", content)) or "ok"
+            return result
+        finally:
+            self.metrics.tools_in_flight.dec(tool=tool)
+            self.metrics.tool_duration.observe(time.perf_counter() - started, tool=tool)
+            self.metrics.tool_calls.inc(tool=tool, outcome=outcome)
@@ -0,0 +1,286 @@
+"""
+💾 Cache persistente em SQLite para reinícios a quente
+
+Espelha as entradas do ``ResponseCache`` em disco, com seus validadores e
+expiração. Depois de um reinício, as entradas são recarregadas e a primeira
+chamada de cada endpoint faz uma requisição condicional (``304``) em vez de
+baixar tudo de novo. As escritas são agrupadas e executadas fora do event
+loop. Leituras e escritas têm cada uma sua thread, dona de uma conexão SQLite
+aberta uma única vez.
+
+Com ``shared=True`` o mesmo arquivo é usado por vários workers: cada um
+consulta o disco (``fetch``) antes de ir ao GitHub, então uma resposta
+obtida ou revalidada por um worker é reaproveitada pelos demais.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from xcloud_mcp.response_cache import CacheEntry, CacheKey, ResponseCache
+
+# 🔧 Configuração do cache persistente (desativado sem caminho)
+CACHE_PATH = os.getenv("X_CLOUD_MCP_CACHE_PATH", "")
+CACHE_DISK_MAX_BYTES = int(os.getenv("X_CLOUD_MCP_CACHE_DISK_MAX_BYTES", str(256 * 1024 * 1024)))
+CACHE_FLUSH_INTERVAL = float(os.getenv("X_CLOUD_MCP_CACHE_FLUSH_INTERVAL", "2"))
+CACHE_FLUSH_BATCH = int(os.getenv("X_CLOUD_MCP_CACHE_FLUSH_BATCH", "200"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    method TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    data TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    link TEXT,
+    size INTEGER NOT NULL,
+    validated_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (method, endpoint)
+)
+"""
+
+# Operações pendentes por chave: ("put", entry), ("touch", entry) ou ("delete", None)
+PendingOp = Tuple[str, Optional[CacheEntry]]
+
+
+class PersistentCache:
+    """
+    Backend SQLite do ``ResponseCache``.
+
+    ``put``/``touch``/``delete`` só registram a operação em memória; uma task
+    em segundo plano grava o lote em disco a cada ``flush_interval`` segundos
+    ou quando ``batch_size`` operações se acumulam.
+    """
+
+    def __init__(
+        self,
+        path: str = CACHE_PATH,
+        max_bytes: int = CACHE_DISK_MAX_BYTES,
+        flush_interval: float = CACHE_FLUSH_INTERVAL,
+        batch_size: int = CACHE_FLUSH_BATCH,
+        shared: bool = False,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.shared = shared
+        self.ttl = 0.0
+        self._pending: Dict[CacheKey, PendingOp] = {}
+        self._flush_now: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        # Uma thread para leituras (caminho das requisições) e outra para os lotes
+        self._reader: Optional[ThreadPoolExecutor] = None
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._local = threading.local()
+        self.writes = 0
+        self.evictions = 0
+
+    async def open(self, cache: ResponseCache) -> int:
+        """Recarrega as entradas válidas no cache em memória e inicia o flusher."""
+        self.ttl = cache.ttl
+        self._reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="xcloud-cache-read")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="xcloud-cache-write")
+        try:
+            rows = await self._run_in(self._writer, self._load)
+        except (sqlite3.Error, OSError) as e:
+            logging.error("Cache persistente indisponível em %s; seguindo só em memória: %s", self.path, e)
+            await self._shutdown()
+            return 0
+        now_wall, now_monotonic = time.time(), time.monotonic()
+        for method, endpoint, data, etag, last_modified, link, size, validated_at in rows:
+            entry = CacheEntry(
+                data=data,
+                etag=etag,
+                last_modified=last_modified,
+                link=link,
+                size=size,
+                validated_at=now_monotonic - max(now_wall - validated_at, 0.0),
+            )
+            cache.restore((method, endpoint), entry)
+        cache.backend = self
+
+        self._flush_now = asyncio.Event()
+        self._flusher = asyncio.create_task(self._run())
+        logging.info("Cache persistente carregado de %s (%s entradas).", self.path, len(rows))
+        return len(rows)
+
+    async def close(self) -> None:
+        """Grava as operações pendentes e encerra o flusher."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+        await self._shutdown()
+
+    async def fetch(self, key: CacheKey) -> Optional[CacheEntry]:
+        """Lê do disco a entrada gravada (possivelmente por outro worker), se ainda válida."""
+        if key in self._pending or self._reader is None:
+            # A versão deste processo ainda não foi gravada; a memória já a tem
+            return None
+        try:
+            row = await self._run_in(self._reader, self._read, key)
+        except (sqlite3.Error, OSError) as e:
+            logging.warning("Falha ao ler o cache persistente em %s: %s", self.path, e)
+            return None
+        if row is None:
+            return None
+        data, etag, last_modified, link, size, validated_at = row
+        return CacheEntry(
+            data=data,
+            etag=etag,
+            last_modified=last_modified,
+            link=link,
+            size=size,
+            validated_at=time.monotonic() - max(time.time() - validated_at, 0.0),
+        )
+
+    def put(self, key: CacheKey, entry: CacheEntry) -> None:
+        self._schedule(key, ("put", entry))
+
+    def touch(self, key: CacheKey, entry: CacheEntry) -> None:
+        op = self._pending.get(key)
+        if op is not None and op[0] == "put":
+            # A gravação completa pendente já levará o novo validated_at
+            return
+        self._schedule(key, ("touch", entry))
+
+    def delete(self, key: CacheKey) -> None:
+        self._schedule(key, ("delete", None))
+
+    async def flush(self) -> None:
+        """Grava em disco, na thread de escrita, o lote de operações pendentes."""
+        if not self._pending or self._writer is None:
+            return
+        batch, self._pending = self._pending, {}
+        await self._run_in(self._writer, self._write, batch, time.time(), time.monotonic())
+
+    def _schedule(self, key: CacheKey, op: PendingOp) -> None:
+        self._pending[key] = op
+        if len(self._pending) >= self.batch_size and self._flush_now is not None:
+            self._flush_now.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+            try:
+                await self.flush()
+            except (sqlite3.Error, OSError) as e:
+                logging.error("Falha ao gravar o cache persistente em %s: %s", self.path, e)
+
+    @staticmethod
+    async def _run_in(executor: ThreadPoolExecutor, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+    async def _shutdown(self) -> None:
+        """Fecha a conexão de cada thread e encerra as threads."""
+        for executor in (self._reader, self._writer):
+            if executor is not None:
+                await self._run_in(executor, self._close_connection)
+                executor.shutdown(wait=False)
+        self._reader = self._writer = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Conexão da thread atual, aberta na primeira operação da thread."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = sqlite3.connect(self.path, timeout=10)
+        return connection
+
+    def _close_connection(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _load(self) -> List[Tuple]:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(SCHEMA)
+        with connection:
+            connection.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+        rows = connection.execute(
+            "SELECT method, endpoint, data, etag, last_modified, link, size, validated_at "
+            "FROM responses ORDER BY validated_at"
+        ).fetchall()
+        # Decodifica o JSON aqui, ainda fora do event loop
+        return [(row[0], row[1], json.loads(row[2])) + tuple(row[3:]) for row in rows]
+
+    def _read(self, key: CacheKey) -> Optional[Tuple]:
+        row = self._connection().execute(
+            "SELECT data, etag, last_modified, link, size, validated_at FROM responses "
+            "WHERE method = ? AND endpoint = ? AND expires_at >= ?",
+            (key[0], key[1], time.time()),
+        ).fetchone()
+        if row is None:
+            return None
+        return (json.loads(row[0]),) + tuple(row[1:])
+
+    def _write(self, batch: Dict[CacheKey, PendingOp], now_wall: float, now_monotonic: float) -> None:
+        connection = self._connection()
+        with connection:
+            for (method, endpoint), (op, entry) in batch.items():
+                if op == "delete":
+                    connection.execute(
+                        "DELETE FROM responses WHERE method = ? AND endpoint = ?",
+                        (method, endpoint),
+                    )
+                    continue
+                validated_at = now_wall - max(now_monotonic - entry.validated_at, 0.0)
+                if op == "touch":
+                    connection.execute(
+                        "UPDATE responses SET validated_at = ?, expires_at = ? "
+                        "WHERE method = ? AND endpoint = ?",
+                        (validated_at, validated_at + self.ttl, method, endpoint),
+                    )
+                    continue
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        method,
+                        endpoint,
+                        json.dumps(entry.data, separators=(",", ":"), default=str),
+                        entry.etag,
+                        entry.last_modified,
+                        entry.link,
+                        entry.size,
+                        validated_at,
+                        validated_at + self.ttl,
+                    ),
+                )
+            self.writes += len(batch)
+            self._evict(connection, now_wall)
+
+    def _evict(self, connection: sqlite3.Connection, now_wall: float) -> None:
+        connection.execute("DELETE FROM responses WHERE expires_at < ?", (now_wall,))
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for method, endpoint, size in connection.execute(
+            "SELECT method, endpoint, size FROM responses ORDER BY validated_at"
+        ).fetchall():
+            connection.execute(
+                "DELETE FROM responses WHERE method = ? AND endpoint = ?", (method, endpoint)
+            )
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
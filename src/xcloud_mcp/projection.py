@@ -0,0 +1,66 @@
+"""
+✂️ Decodificação com projeção de campos
+
+Cada chamada pode declarar os campos que realmente lê (caminhos com ponto,
+ex: ``workflow_runs.actor.login``). A resposta é decodificada com ``orjson``
+(dependência do projeto; sem ele, com o ``json`` padrão) e reduzida a esses campos antes de chegar ao cache e às
+ferramentas, de modo que a memória retida acompanhe o que é usado e não o
+tamanho do payload do GitHub. Listas são atravessadas automaticamente.
+"""
+
+import hashlib
+import json
+from typing import Any, Callable, Dict
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+
+def loads(text) -> Any:
+    """Decodifica JSON (``str`` ou ``bytes``) com o decodificador mais rápido disponível."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+class Projection:
+    """
+    Conjunto de caminhos a manter em uma resposta.
+
+    Campos ausentes na resposta são simplesmente omitidos.
+    """
+
+    def __init__(self, *paths: str):
+        self.paths = tuple(sorted(set(paths)))
+        self.tree: Dict[str, Dict] = {}
+        for path in self.paths:
+            node = self.tree
+            for part in path.split("."):
+                node = node.setdefault(part, {})
+        # Identifica a projeção na chave do cache e da coalescência
+        self.key = hashlib.sha1(",".join(self.paths).encode()).hexdigest()[:12]
+
+    def apply(self, data: Any) -> Any:
+        return _project(data, self.tree) if self.tree else data
+
+    def decoder(self) -> Callable[[str], Any]:
+        """Função ``loads`` que já devolve o payload projetado."""
+        return lambda text: self.apply(loads(text))
+
+    def __repr__(self) -> str:
+        return f"Projection{self.paths!r}"
+
+
+def _project(data: Any, tree: Dict[str, Dict]) -> Any:
+    if isinstance(data, list):
+        return [_project(item, tree) for item in data]
+    if not isinstance(data, dict):
+        return data
+    # Folhas (subárvore vazia) são copiadas sem outra chamada recursiva
+    return {
+        name: _project(data[name], subtree) if subtree else data[name]
+        for name, subtree in tree.items()
+        if name in data
+    }
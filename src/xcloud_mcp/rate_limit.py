@@ -0,0 +1,248 @@
+"""
+⏱️ Agendador de requisições ciente do rate limit do GitHub
+
+Fica na frente de ``github_api_request``: acompanha o orçamento informado
+pelos cabeçalhos ``X-RateLimit-*``, cadencia as saídas com um token bucket,
+respeita o back-off de rate limit secundário (``Retry-After``) e despacha
+as requisições por classe de prioridade.
+
+Com vários workers, o orçamento e o back-off são trocados por um
+``SharedRateLimitState``; o token bucket de cada worker recebe uma fração
+da taxa total.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import time
+from enum import IntEnum
+from typing import Dict, List, Optional, Tuple
+
+from xcloud_mcp.shared_state import SharedRateLimitState
+
+# 🔧 Configuração do agendador
+RATE_LIMIT_RATE = float(os.getenv("X_CLOUD_MCP_RATE_LIMIT_RATE", "10"))
+RATE_LIMIT_BURST = float(os.getenv("X_CLOUD_MCP_RATE_LIMIT_BURST", "20"))
+RATE_LIMIT_RESERVE = int(os.getenv("X_CLOUD_MCP_RATE_LIMIT_RESERVE", "100"))
+RATE_LIMIT_MAX_WAIT = float(os.getenv("X_CLOUD_MCP_RATE_LIMIT_MAX_WAIT", "30"))
+SECONDARY_RATE_LIMIT_BACKOFF = 60.0
+# O GitHub limita a criação de conteúdo (issues, comentários) a ~80 por minuto
+# e recomenda ao menos 1s entre essas requisições
+CONTENT_CREATION_INTERVAL = float(os.getenv("X_CLOUD_MCP_CONTENT_CREATION_INTERVAL", "1"))
+
+
+class Priority(IntEnum):
+    """Classes de prioridade; valores menores são despachados primeiro."""
+
+    INTERACTIVE = 0
+    NORMAL = 1
+    BULK = 2
+
+
+class RateLimitExceeded(Exception):
+    """A espera pelo orçamento do GitHub excederia o limite configurado."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Rate limit do GitHub esgotado; tente novamente em {retry_after:.0f}s.")
+        self.retry_after = retry_after
+
+
+class RateLimitScheduler:
+    """
+    Token bucket com fila de prioridade e acompanhamento do orçamento.
+
+    Requisições ``BULK`` também param quando o orçamento restante cai abaixo
+    da reserva, deixando-a para as chamadas interativas.
+    """
+
+    def __init__(
+        self,
+        rate: float = RATE_LIMIT_RATE,
+        burst: float = RATE_LIMIT_BURST,
+        reserve: int = RATE_LIMIT_RESERVE,
+        max_wait: float = RATE_LIMIT_MAX_WAIT,
+        shared: Optional[SharedRateLimitState] = None,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.shared = shared
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self._observed_at = 0.0
+        self._tokens = burst
+        self._refilled_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._queue: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for _, _, future in self._queue if not future.done())
+
+    def stats(self) -> Dict:
+        by_priority = {priority.name.lower(): 0 for priority in Priority}
+        for priority, _, future in self._queue:
+            if not future.done():
+                by_priority[Priority(priority).name.lower()] += 1
+        return {
+            "queue_depth": sum(by_priority.values()),
+            "queued_by_priority": by_priority,
+            "remaining": self.remaining,
+            "limit": self.limit,
+            "reset_at": self.reset_at,
+            "blocked_for": round(max(self._blocked_until - time.monotonic(), 0.0), 3),
+            "shared": self.shared is not None,
+        }
+
+    async def acquire(self, priority: int = Priority.NORMAL) -> None:
+        """Aguarda a vez de enviar uma requisição com a prioridade dada."""
+        budget_wait = self._budget_wait(priority)
+        if budget_wait > self.max_wait:
+            raise RateLimitExceeded(budget_wait)
+
+        if not self._queue and budget_wait <= 0 and self._take_token():
+            return
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(self._queue, (int(priority), next(self._seq), future))
+        self._ensure_dispatcher(loop)
+        self._wakeup.set()
+        await future
+
+    def update(self, status: int, headers) -> None:
+        """Atualiza o orçamento a partir dos cabeçalhos de uma resposta."""
+        # GraphQL e outros recursos têm orçamentos próprios; só acompanhamos o REST
+        resource = headers.get("X-RateLimit-Resource")
+        remaining = _int_header(headers, "X-RateLimit-Remaining")
+        if resource not in (None, "core"):
+            remaining = None
+        if remaining is not None:
+            self.remaining = remaining
+            self.limit = _int_header(headers, "X-RateLimit-Limit") or self.limit
+            self.reset_at = _int_header(headers, "X-RateLimit-Reset") or self.reset_at
+            self._observed_at = time.time()
+            if self.shared is not None:
+                self.shared.publish_budget(self.remaining, self.limit, self.reset_at, self._observed_at)
+
+        if status in (403, 429):
+            retry_after = _int_header(headers, "Retry-After")
+            if retry_after is not None:
+                self.backoff(retry_after)
+            elif remaining == 0 and self.reset_at:
+                self.backoff(self.reset_at - time.time())
+
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def backoff(self, seconds: float = SECONDARY_RATE_LIMIT_BACKOFF) -> None:
+        """Suspende o despacho por ``seconds`` (rate limit secundário)."""
+        seconds = max(seconds, 0.0)
+        logging.warning("Rate limit do GitHub atingido; pausando requisições por %.0fs.", seconds)
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        if self.shared is not None:
+            self.shared.publish_backoff(time.time() + seconds)
+
+    def _sync_shared(self) -> None:
+        """Adota o orçamento mais recente e o back-off publicados pelos outros workers."""
+        snapshot = self.shared.read()
+        if snapshot.remaining is not None and snapshot.observed_at > self._observed_at:
+            self.remaining = snapshot.remaining
+            self.limit = snapshot.limit or self.limit
+            self.reset_at = snapshot.reset_at or self.reset_at
+            self._observed_at = snapshot.observed_at
+        blocked_for = snapshot.backoff_until - time.time()
+        if blocked_for > 0:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + blocked_for)
+
+    def _budget_wait(self, priority: int) -> float:
+        if self.shared is not None:
+            self._sync_shared()
+        wait = self._blocked_until - time.monotonic()
+        if self.remaining is not None and self.reset_at:
+            exhausted = self.remaining <= 0 or (
+                priority >= Priority.BULK and self.remaining <= self.reserve
+            )
+            until_reset = self.reset_at - time.time()
+            if until_reset <= 0:
+                self.remaining = None
+            elif exhausted:
+                wait = max(wait, until_reset)
+        return max(wait, 0.0)
+
+    def _take_token(self) -> bool:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def _token_wait(self) -> float:
+        return max((1 - self._tokens) / self.rate, 0.0) if self.rate > 0 else 0.0
+
+    def _ensure_dispatcher(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._dispatcher is None or self._dispatcher.done() or self._dispatcher.get_loop() is not loop:
+            self._wakeup = asyncio.Event()
+            self._dispatcher = loop.create_task(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        while self._queue:
+            priority, _, future = self._queue[0]
+            if future.done():
+                heapq.heappop(self._queue)
+                continue
+
+            delay = self._budget_wait(priority)
+            if delay > self.max_wait:
+                heapq.heappop(self._queue)
+                future.set_exception(RateLimitExceeded(delay))
+                continue
+            if delay <= 0 and not self._take_token():
+                delay = self._token_wait()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._queue)
+            future.set_result(None)
+
+
+class ContentPacer:
+    """
+    Espaça o início das requisições que criam conteúdo no GitHub.
+
+    Cada chamador reserva o próximo horário livre e dorme até ele, então as
+    criações podem rodar concorrentes sem ultrapassar uma por ``interval``.
+    """
+
+    def __init__(self, interval: float = CONTENT_CREATION_INTERVAL):
+        self.interval = interval
+        self._next_at = 0.0
+
+    async def wait(self) -> None:
+        now = time.monotonic()
+        start = max(now, self._next_at)
+        self._next_at = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+def _int_header(headers, name: str) -> Optional[int]:
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
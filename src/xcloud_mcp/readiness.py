@@ -0,0 +1,107 @@
+"""
+🚦 Prontidão (readiness) para o balanceador de carga
+
+``/health`` só diz que o processo está vivo. ``/ready`` responde 503 quando
+a instância não deve receber tráfego novo: event loop atrasado, muitas
+ferramentas em andamento, pool HTTP do GitHub saturado ou orçamento de rate
+limit esgotado. O atraso do event loop é medido por um ticker em segundo
+plano, que compara quando acordou com quando deveria ter acordado.
+"""
+
+import asyncio
+import collections
+import os
+from typing import Deque, Dict, List, Optional
+
+# 🔧 Configuração da prontidão (limiar 0 desativa a verificação)
+READY_LAG_INTERVAL = float(os.getenv("X_CLOUD_MCP_READY_LAG_INTERVAL", "0.1"))
+READY_LAG_WINDOW = float(os.getenv("X_CLOUD_MCP_READY_LAG_WINDOW", "10"))
+READY_MAX_LOOP_LAG = float(os.getenv("X_CLOUD_MCP_READY_MAX_LOOP_LAG", "0.5"))
+READY_MAX_TOOLS_IN_FLIGHT = int(os.getenv("X_CLOUD_MCP_READY_MAX_TOOLS_IN_FLIGHT", "0"))
+READY_MAX_POOL_UTILIZATION = float(os.getenv("X_CLOUD_MCP_READY_MAX_POOL_UTILIZATION", "1"))
+READY_MIN_RATE_LIMIT_REMAINING = int(os.getenv("X_CLOUD_MCP_READY_MIN_RATE_LIMIT_REMAINING", "0"))
+
+
+class LoopLagMonitor:
+    """
+    Mede o atraso do event loop com um ticker a cada ``interval`` segundos.
+
+    ``lag()`` considera também um tick atrasado que ainda não rodou, de modo
+    que um loop preso apareça antes de o ticker conseguir acordar.
+    """
+
+    def __init__(self, interval: float = READY_LAG_INTERVAL, window: float = READY_LAG_WINDOW):
+        self.interval = interval
+        self.samples: Deque[float] = collections.deque(maxlen=max(int(window / interval), 1))
+        self.last = 0.0
+        self._due: Optional[float] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def lag(self) -> Optional[float]:
+        """Atraso atual em segundos, ou ``None`` se o ticker não estiver rodando."""
+        if not self.running:
+            return None
+        overdue = self._loop.time() - self._due if self._due is not None else 0.0
+        return max(self.last, overdue, 0.0)
+
+    def stats(self) -> Dict:
+        lag = self.lag()
+        return {
+            "lag": round(lag, 4) if lag is not None else None,
+            "max_recent": round(max(self.samples), 4) if self.samples else None,
+            "interval": self.interval,
+        }
+
+    def start(self) -> None:
+        if not self.running:
+            self._loop = asyncio.get_running_loop()
+            self._task = self._loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._due = None
+
+    async def _run(self) -> None:
+        while True:
+            self._due = self._loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.last = max(self._loop.time() - self._due, 0.0)
+            self.samples.append(self.last)
+
+
+def failing_checks(
+    loop_lag: Optional[float],
+    tools_in_flight: int,
+    pool_utilization: float,
+    rate_limit_remaining: Optional[int],
+    max_loop_lag: float = READY_MAX_LOOP_LAG,
+    max_tools_in_flight: int = READY_MAX_TOOLS_IN_FLIGHT,
+    max_pool_utilization: float = READY_MAX_POOL_UTILIZATION,
+    min_rate_limit_remaining: int = READY_MIN_RATE_LIMIT_REMAINING,
+) -> List[str]:
+    """Nomes das verificações cujo limiar foi cruzado (lista vazia: pronto)."""
+    failing = []
+    if max_loop_lag > 0 and loop_lag is not None and loop_lag > max_loop_lag:
+        failing.append("event_loop_lag")
+    if max_tools_in_flight > 0 and tools_in_flight >= max_tools_in_flight:
+        failing.append("tools_in_flight")
+    if max_pool_utilization > 0 and pool_utilization >= max_pool_utilization:
+        failing.append("http_pool")
+    if (
+        min_rate_limit_remaining > 0
+        and rate_limit_remaining is not None
+        and rate_limit_remaining < min_rate_limit_remaining
+    ):
+        failing.append("rate_limit")
+    return failing
@@ -0,0 +1,97 @@
+"""
+🔄 Atualização em segundo plano do estado da organização
+
+Mantém um snapshot (repositórios ``xcloud-*``, presença de workflows e runs
+recentes) atualizado em intervalos fixos, para que as ferramentas de leitura
+respondam sem ir ao GitHub no caminho da requisição.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+# 🔧 Configuração do refresher (desativado com intervalo 0)
+REFRESH_INTERVAL = float(os.getenv("X_CLOUD_MCP_REFRESH_INTERVAL", "0"))
+REFRESH_RUNS = int(os.getenv("X_CLOUD_MCP_REFRESH_RUNS", "20"))
+SNAPSHOT_MAX_AGE = float(os.getenv("X_CLOUD_MCP_SNAPSHOT_MAX_AGE", str(max(REFRESH_INTERVAL * 2, 60))))
+
+
+class SnapshotRefresher:
+    """
+    Executa ``refresh()`` periodicamente e guarda o último resultado.
+
+    Se ``refresh()`` retornar ``None`` (ex: orçamento de rate limit baixo) ou
+    falhar, o snapshot anterior é mantido até expirar por ``max_age``.
+    """
+
+    def __init__(
+        self,
+        refresh: Callable[[], Awaitable[Optional[Any]]],
+        interval: float = REFRESH_INTERVAL,
+        max_age: float = SNAPSHOT_MAX_AGE,
+    ):
+        self.refresh = refresh
+        self.interval = interval
+        self.max_age = max_age
+        self.data: Optional[Any] = None
+        self.refreshed_at: Optional[float] = None
+        self.refreshes = 0
+        self.failures = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def age(self) -> Optional[float]:
+        if self.refreshed_at is None:
+            return None
+        return time.monotonic() - self.refreshed_at
+
+    def get(self) -> Optional[Tuple[Any, float]]:
+        """Retorna ``(snapshot, idade em segundos)`` se ainda estiver válido."""
+        age = self.age()
+        if self.data is None or age is None or age > self.max_age:
+            return None
+        return self.data, age
+
+    async def refresh_now(self) -> bool:
+        """Executa um ciclo de atualização; retorna se o snapshot mudou."""
+        started = time.monotonic()
+        try:
+            data = await self.refresh()
+        except Exception as e:
+            self.failures += 1
+            logging.error("Falha ao atualizar o snapshot da organização: %s", e)
+            return False
+        if data is None:
+            return False
+        self.data = data
+        self.refreshed_at = time.monotonic()
+        self.refreshes += 1
+        logging.info("Snapshot da organização atualizado em %.2fs.", self.refreshed_at - started)
+        return True
+
+    def start(self) -> None:
+        if self.enabled and not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self.refresh_now()
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,162 @@
+"""
+🛡️ Retentativas e circuit breaker para as chamadas ao GitHub
+
+Falhas transitórias (502/503/504, timeouts, conexões resetadas) em métodos
+idempotentes são repetidas com back-off exponencial e jitter, dentro de um
+orçamento de tempo. Um circuit breaker por host corta as chamadas enquanto o
+GitHub está instável: depois de ``failure_threshold`` falhas seguidas o
+circuito abre e as chamadas falham na hora; passado ``reset_timeout``, uma
+única chamada de sonda (meio-aberto) decide se ele fecha ou reabre.
+"""
+
+import logging
+import os
+import random
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+# 🔧 Configuração das retentativas e do circuit breaker
+RETRY_MAX_ATTEMPTS = int(os.getenv("X_CLOUD_MCP_RETRY_MAX_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = float(os.getenv("X_CLOUD_MCP_RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("X_CLOUD_MCP_RETRY_MAX_DELAY", "5"))
+# Tempo total, desde a primeira tentativa, após o qual não se inicia outra
+RETRY_BUDGET = float(os.getenv("X_CLOUD_MCP_RETRY_BUDGET", "15"))
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("X_CLOUD_MCP_BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_TIMEOUT = float(os.getenv("X_CLOUD_MCP_BREAKER_RESET_TIMEOUT", "30"))
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+TRANSIENT_STATUSES = {"500", "502", "503", "504"}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def backoff_delay(attempt: int, base: float = RETRY_BASE_DELAY, cap: float = RETRY_MAX_DELAY) -> float:
+    """Atraso antes da retentativa ``attempt`` (0, 1, ...): "full jitter" sobre o exponencial."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def is_transient(status: str, payload) -> Optional[bool]:
+    """
+    Classifica o resultado de uma tentativa para o breaker e as retentativas.
+
+    Returns:
+        True para falhas transitórias do GitHub, False para respostas do
+        GitHub (inclusive erros 4xx) e None quando a requisição nem saiu
+        (ex: adiada pelo agendador de rate limit).
+    """
+    if status in TRANSIENT_STATUSES:
+        return True
+    if status != "none":
+        return False
+    error = payload.get("error") if isinstance(payload, dict) else None
+    if isinstance(error, dict) and error.get("type") == "NETWORK_ERROR":
+        return True
+    return None
+
+
+class CircuitBreaker:
+    """Circuito fechado / aberto / meio-aberto para um host."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self.rejected = 0
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return CLOSED
+        if self.probing or self.clock() - self.opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    def before_call(self) -> Tuple[Optional[float], bool]:
+        """
+        Autoriza uma chamada; retorna ``(retry_in, probe)``: ``retry_in`` é
+        ``None`` se ela pode seguir ou os segundos até a próxima sonda se deve
+        falhar na hora, e ``probe`` indica se ela é a sonda do meio-aberto.
+
+        No estado meio-aberto só uma chamada (a sonda) passa por vez; quem
+        é autorizado deve informar o resultado com ``record``, repassando
+        ``probe``.
+        """
+        state = self.state
+        if state == CLOSED:
+            return None, False
+        if state == HALF_OPEN and not self.probing:
+            self.probing = True
+            logging.info("Circuit breaker de %s meio-aberto: enviando sonda.", self.name)
+            return None, True
+        self.rejected += 1
+        return max(self.reset_timeout - (self.clock() - self.opened_at), 0.0), False
+
+    def record(self, transient: Optional[bool], probe: bool = False) -> None:
+        """
+        Registra o resultado de uma chamada autorizada (ver ``is_transient``).
+
+        Com o circuito aberto só a sonda decide o estado: chamadas autorizadas
+        antes de ele abrir não liberam nem ocupam a vaga da sonda.
+        """
+        if probe:
+            self.probing = False
+        if transient is None:
+            return
+        if self.opened_at is not None and not probe:
+            return
+        if not transient:
+            if probe:
+                logging.info("Circuit breaker de %s fechado: GitHub respondeu à sonda.", self.name)
+            self.failures = 0
+            self.opened_at = None
+            return
+        self.failures += 1
+        if probe or self.failures >= self.failure_threshold:
+            self.opened_at = self.clock()
+            self.trips += 1
+            logging.warning(
+                "Circuit breaker de %s aberto após %s falhas seguidas; chamadas falham por %ss.",
+                self.name, self.failures, self.reset_timeout,
+            )
+
+    def stats(self) -> Dict:
+        retry_in = None
+        if self.state == OPEN:
+            retry_in = round(max(self.reset_timeout - (self.clock() - self.opened_at), 0.0), 3)
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "retry_in": retry_in,
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
+
+
+class CircuitBreakers:
+    """Um ``CircuitBreaker`` por host, criado sob demanda."""
+
+    def __init__(self, **options):
+        self.options = options
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, host: str) -> CircuitBreaker:
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(host, **self.options)
+        return breaker
+
+    def stats(self) -> Dict[str, Dict]:
+        return {host: breaker.stats() for host, breaker in self._breakers.items()}
@@ -0,0 +1,199 @@
+"""
+🗄️ Cache de respostas da API do GitHub
+
+Guarda as respostas de GETs junto com os validadores ``ETag`` e
+``Last-Modified`` para que possam ser revalidadas com requisições
+condicionais. Respostas ``304`` não contam no rate limit do GitHub.
+"""
+
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+# 🔧 Configuração do cache
+CACHE_MAX_ENTRIES = int(os.getenv("X_CLOUD_MCP_CACHE_MAX_ENTRIES", "1024"))
+CACHE_MAX_BYTES = int(os.getenv("X_CLOUD_MCP_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+CACHE_TTL = float(os.getenv("X_CLOUD_MCP_CACHE_TTL", "600"))
+CACHE_FRESH_TTL = float(os.getenv("X_CLOUD_MCP_CACHE_FRESH_TTL", "0"))
+
+CacheKey = Tuple[str, str]
+
+
+@dataclass
+class CacheEntry:
+    """Resposta armazenada com seus validadores."""
+
+    data: Any
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    link: Optional[str] = None
+    size: int = 0
+    key: Optional[Tuple[str, str]] = None
+    stored_at: float = field(default_factory=time.monotonic)
+    validated_at: float = field(default_factory=time.monotonic)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Cabeçalhos para revalidar a entrada com o GitHub."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Cache LRU com expiração por TTL e limite de memória.
+
+    As operações não fazem I/O nem ``await``, então são seguras no event loop
+    sem locks. Um ``backend`` opcional (ex: ``PersistentCache``) recebe as
+    gravações, revalidações e remoções para espelhá-las em disco.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        max_bytes: int = CACHE_MAX_BYTES,
+        ttl: float = CACHE_TTL,
+        fresh_ttl: float = CACHE_FRESH_TTL,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.fresh_ttl = fresh_ttl
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self.backend = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, method: str, endpoint: str) -> Optional[CacheEntry]:
+        """Retorna a entrada ainda válida para a requisição, se existir."""
+        key = (method.upper(), endpoint)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.validated_at > self.ttl:
+            self._remove(key)
+            # Num backend compartilhado, outro worker pode ter revalidado a entrada;
+            # o próprio backend descarta o que expirou
+            if self.backend is not None and not getattr(self.backend, "shared", False):
+                self.backend.delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Indica se a entrada pode ser servida sem revalidar no GitHub."""
+        return self.fresh_ttl > 0 and time.monotonic() - entry.validated_at <= self.fresh_ttl
+
+    def record_hit(self) -> None:
+        self.hits += 1
+
+    def record_miss(self) -> None:
+        self.misses += 1
+
+    def mark_revalidated(self, entry: CacheEntry) -> None:
+        """Registra um ``304``: a entrada continua válida por mais um TTL."""
+        entry.validated_at = time.monotonic()
+        self.revalidations += 1
+        if self.backend is not None and entry.key is not None:
+            self.backend.touch(entry.key, entry)
+
+    def store(self, method: str, endpoint: str, data: Any, headers) -> Optional[CacheEntry]:
+        """
+        Armazena uma resposta com seus validadores.
+
+        Respostas sem ``ETag``/``Last-Modified`` só são guardadas quando há
+        janela de frescor configurada, já que não podem ser revalidadas.
+        """
+        if not self.enabled:
+            return None
+
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not (etag or last_modified) and self.fresh_ttl <= 0:
+            return None
+
+        size = len(json.dumps(data, separators=(",", ":"), default=str))
+        if size > self.max_bytes:
+            return None
+
+        key = (method.upper(), endpoint)
+        if key in self._entries:
+            self._remove(key)
+        entry = CacheEntry(
+            data=data,
+            etag=etag,
+            last_modified=last_modified,
+            link=headers.get("Link"),
+            size=size,
+            key=key,
+        )
+        self._entries[key] = entry
+        self._bytes += size
+        self._evict()
+        if self.backend is not None:
+            self.backend.put(key, entry)
+        return entry
+
+    def restore(self, key: CacheKey, entry: CacheEntry) -> None:
+        """Insere uma entrada recarregada do backend, sem regravá-la."""
+        if key in self._entries:
+            self._remove(key)
+        entry.key = key
+        self._entries[key] = entry
+        self._bytes += entry.size
+        self._evict()
+
+    def invalidate(self, prefix: str = "", exact: bool = False) -> int:
+        """
+        Remove as entradas cujo endpoint começa com ``prefix`` (ou é igual, se ``exact``).
+
+        No modo exato, as variantes projetadas do endpoint (``endpoint#fields=...``)
+        também são removidas.
+        """
+        keys = [
+            key for key in self._entries
+            if (key[1] == prefix or key[1].startswith(prefix + "#") if exact else key[1].startswith(prefix))
+        ]
+        for key in keys:
+            self._remove(key)
+            if self.backend is not None:
+                self.backend.delete(key)
+        return len(keys)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+        }
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
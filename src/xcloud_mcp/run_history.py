@@ -0,0 +1,264 @@
+"""
+🗃️ Histórico local de workflow runs em colunas
+
+Cada repositório guarda suas runs em colunas ``array`` (ids, workflow,
+instantes de criação/início/atualização, conclusão, tentativa e commit), em
+vez de uma lista de dicts: ~50 bytes por run, o que permite manter milhares
+de runs por repositório e calcular as estatísticas varrendo as colunas.
+
+A ingestão é incremental: runs já conhecidas são atualizadas no lugar, e
+``watermark()`` indica a partir de quando buscar (``created>=``) para pegar
+runs novas e as que ainda não terminaram.
+"""
+
+import hashlib
+import math
+import os
+import time
+from array import array
+from collections import OrderedDict
+from datetime import datetime
+from itertools import compress
+from typing import Dict, Iterable, List, Optional
+
+# 🔧 Configuração do histórico de runs
+RUN_HISTORY_MAX_RUNS = int(os.getenv("X_CLOUD_MCP_RUN_HISTORY_MAX_RUNS", "5000"))
+RUN_HISTORY_MAX_REPOS = int(os.getenv("X_CLOUD_MCP_RUN_HISTORY_MAX_REPOS", "500"))
+RUN_HISTORY_BACKFILL = int(os.getenv("X_CLOUD_MCP_RUN_HISTORY_BACKFILL", "1000"))
+# Intervalo mínimo entre sincronizações de um mesmo repositório
+RUN_HISTORY_SYNC_INTERVAL = float(os.getenv("X_CLOUD_MCP_RUN_HISTORY_SYNC_INTERVAL", "60"))
+# Runs sem conclusão mais antigas que isso não seguram a janela de sincronização
+RUN_HISTORY_PENDING_HORIZON = 86400.0
+
+# Códigos da coluna de conclusão
+PENDING = 0
+CONCLUSION_CODES = {
+    "success": 1,
+    "failure": 2,
+    "timed_out": 3,
+    "startup_failure": 4,
+    "cancelled": 5,
+    "skipped": 6,
+    "neutral": 7,
+    "action_required": 8,
+    "stale": 9,
+}
+SUCCESS = CONCLUSION_CODES["success"]
+FAILURES = frozenset(CONCLUSION_CODES[name] for name in ("failure", "timed_out", "startup_failure"))
+OTHER = 127
+
+_UNSET = -1.0
+
+
+def parse_timestamp(value: Optional[str]) -> float:
+    """``2024-05-01T12:00:00Z`` -> segundos desde a época (``-1`` se ausente)."""
+    if not value:
+        return _UNSET
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def format_timestamp(value: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(value))
+
+
+def _sha_key(sha: Optional[str]) -> int:
+    """Identificador de 63 bits do commit, para agrupar reexecuções."""
+    if not sha:
+        return 0
+    return int.from_bytes(hashlib.blake2b(sha.encode(), digest_size=8).digest(), "little") >> 1
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Percentil pelo método nearest-rank sobre valores já ordenados."""
+    if not values:
+        return None
+    rank = max(math.ceil(fraction * len(values)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+class RunHistory:
+    """Runs de um repositório, uma coluna por campo."""
+
+    def __init__(self, max_runs: int = RUN_HISTORY_MAX_RUNS):
+        self.max_runs = max_runs
+        self.run_id = array("q")
+        self.workflow_id = array("q")
+        self.created = array("d")
+        self.started = array("d")
+        self.updated = array("d")
+        self.conclusion = array("b")
+        self.attempt = array("H")
+        self.sha = array("q")
+        self._rows: Dict[int, int] = {}
+        self.synced_at: Optional[float] = None
+        # Total de runs do repositório no GitHub (``total_count``), se conhecido
+        self.total_count: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self.run_id)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            column.itemsize * len(column)
+            for column in (
+                self.run_id, self.workflow_id, self.created, self.started,
+                self.updated, self.conclusion, self.attempt, self.sha,
+            )
+        )
+
+    def ingest(self, runs: Iterable[Dict], counted: bool = False) -> int:
+        """
+        Insere ou atualiza runs da API (``/actions/runs``); retorna quantas mudaram.
+
+        Runs novas somam em ``total_count``, exceto quando ``counted`` indica
+        que já estavam no total informado pelo GitHub (ex: páginas antigas).
+        """
+        changed = 0
+        for run in runs:
+            values = (
+                run.get("workflow_id") or 0,
+                parse_timestamp(run.get("created_at")),
+                parse_timestamp(run.get("run_started_at")),
+                parse_timestamp(run.get("updated_at")),
+                CONCLUSION_CODES.get(run.get("conclusion"), OTHER) if run.get("conclusion") else PENDING,
+                min(run.get("run_attempt") or 1, 0xFFFF),
+                _sha_key(run.get("head_sha")),
+            )
+            row = self._rows.get(run["id"])
+            if row is None:
+                self._rows[run["id"]] = len(self.run_id)
+                self.run_id.append(run["id"])
+                for column, value in zip(self._value_columns(), values):
+                    column.append(value)
+                if self.total_count is not None and not counted:
+                    self.total_count += 1
+                changed += 1
+            elif tuple(column[row] for column in self._value_columns()) != values:
+                for column, value in zip(self._value_columns(), values):
+                    column[row] = value
+                changed += 1
+        if len(self.run_id) > self.max_runs:
+            self._trim()
+        return changed
+
+    def watermark(self, now: Optional[float] = None) -> Optional[str]:
+        """
+        Instante (``created>=``) a partir do qual sincronizar: a run pendente
+        recente mais antiga ou, sem pendentes, a run mais nova conhecida.
+        """
+        if not self.run_id:
+            return None
+        horizon = (time.time() if now is None else now) - RUN_HISTORY_PENDING_HORIZON
+        pending = [
+            created for created, code in zip(self.created, self.conclusion)
+            if code == PENDING and created >= horizon
+        ]
+        return format_timestamp(min(pending) if pending else max(self.created))
+
+    def stats(self, workflow_id: Optional[int] = None) -> Dict:
+        """
+        Taxa de falha, duração e fila (p50/p95) e instabilidade das runs concluídas.
+
+        A taxa de falha considera só conclusões decisivas (sucesso ou falha);
+        canceladas e puladas não entram no denominador. Um commit é instável
+        quando o mesmo workflow teve sucesso e falha nele, ou passou só após
+        reexecução.
+        """
+        columns = (self.conclusion, self.created, self.started, self.updated, self.attempt, self.workflow_id, self.sha)
+        if workflow_id is not None:
+            selected = [value == workflow_id for value in self.workflow_id]
+            columns = tuple(list(compress(column, selected)) for column in columns)
+        conclusion, created, started, updated, attempt, workflows, shas = columns
+
+        # Contagens por varredura em C (``count``); o resto percorre as colunas em paralelo
+        runs = len(conclusion)
+        completed = runs - conclusion.count(PENDING)
+        successes = conclusion.count(SUCCESS)
+        failures = sum(conclusion.count(code) for code in FAILURES)
+        durations = sorted(
+            end - begin
+            for code, begin, end in zip(conclusion, started, updated)
+            if code != PENDING and begin >= 0 and end >= begin
+        )
+        queued = sorted(
+            begin - queued_at
+            for queued_at, begin in zip(created, started)
+            if begin >= 0 and queued_at >= 0 and begin >= queued_at
+        )
+
+        outcomes: Dict[tuple, int] = {}
+        for code, run_attempt, workflow, sha in zip(conclusion, attempt, workflows, shas):
+            if code == SUCCESS:
+                flag = 2 if run_attempt > 1 else 1
+            elif code in FAILURES:
+                flag = 4
+            else:
+                continue
+            key = (workflow, sha)
+            outcomes[key] = outcomes.get(key, 0) | flag
+        flaky = sum(1 for flags in outcomes.values() if flags & 2 or (flags & 5) == 5)
+
+        decisive = successes + failures
+        return {
+            "runs": runs,
+            "completed": completed,
+            "successes": successes,
+            "failures": failures,
+            "failure_rate": round(failures / decisive, 4) if decisive else None,
+            "duration_p50": percentile(durations, 0.50),
+            "duration_p95": percentile(durations, 0.95),
+            "queue_p50": percentile(queued, 0.50),
+            "queue_p95": percentile(queued, 0.95),
+            "flaky_commits": flaky,
+            "flaky_rate": round(flaky / len(outcomes), 4) if outcomes else None,
+            "since": format_timestamp(min(created)) if runs else None,
+        }
+
+    def _value_columns(self):
+        return (self.workflow_id, self.created, self.started, self.updated, self.conclusion, self.attempt, self.sha)
+
+    def _trim(self) -> None:
+        """Mantém só as ``max_runs`` runs mais recentes."""
+        keep = sorted(range(len(self.run_id)), key=self.created.__getitem__)[-self.max_runs:]
+        keep.sort()
+        for name in ("run_id", "workflow_id", "created", "started", "updated", "conclusion", "attempt", "sha"):
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, (column[row] for row in keep)))
+        self._rows = {run_id: row for row, run_id in enumerate(self.run_id)}
+
+
+class RunHistoryStore:
+    """
+    Um ``RunHistory`` por repositório (``owner/repo``), em ordem LRU.
+
+    Só históricos sincronizados com sucesso entram (``put``); além de
+    ``max_repos`` repositórios, o usado há mais tempo é descartado.
+    """
+
+    def __init__(self, max_runs: int = RUN_HISTORY_MAX_RUNS, max_repos: int = RUN_HISTORY_MAX_REPOS):
+        self.max_runs = max_runs
+        self.max_repos = max_repos
+        self._histories: "OrderedDict[str, RunHistory]" = OrderedDict()
+        self.evictions = 0
+
+    def get(self, full_name: str) -> Optional[RunHistory]:
+        history = self._histories.get(full_name)
+        if history is not None:
+            self._histories.move_to_end(full_name)
+        return history
+
+    def put(self, full_name: str, history: RunHistory) -> None:
+        self._histories[full_name] = history
+        self._histories.move_to_end(full_name)
+        while len(self._histories) > self.max_repos:
+            self._histories.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict:
+        return {
+            "repositories": len(self._histories),
+            "runs": sum(len(history) for history in self._histories.values()),
+            "bytes": sum(history.nbytes for history in self._histories.values()),
+            "evictions": self.evictions,
+        }
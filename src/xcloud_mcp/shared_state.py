@@ -0,0 +1,71 @@
+"""
+🧮 Estado de rate limit compartilhado entre workers
+
+Um arquivo pequeno mapeado em memória (``mmap``) com o último orçamento
+visto nos cabeçalhos do GitHub e o fim do back-off de rate limit
+secundário. Cada worker publica o que observa e lê o que os outros
+observaram sem syscalls nem locks: os campos são ``double`` alinhados, e
+uma leitura momentaneamente inconsistente só atrasa a convergência.
+"""
+
+import mmap
+import os
+import struct
+from typing import NamedTuple, Optional
+
+# remaining, limit, reset_at, observed_at (wall clock), backoff_until (wall clock)
+_LAYOUT = struct.Struct("<5d")
+# Cada campo tem um único tipo de escritor: o orçamento (4 primeiros) e o
+# back-off (último) são gravados separadamente, sem ler-modificar-gravar
+_BUDGET = struct.Struct("<4d")
+_BACKOFF = struct.Struct("<d")
+_BACKOFF_OFFSET = _BUDGET.size
+_UNSET = -1.0
+
+
+class RateLimitSnapshot(NamedTuple):
+    remaining: Optional[int]
+    limit: Optional[int]
+    reset_at: Optional[float]
+    observed_at: float
+    backoff_until: float
+
+
+class SharedRateLimitState:
+    def __init__(self, path: str):
+        self.path = path
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd).st_size < _LAYOUT.size:
+                os.ftruncate(fd, _LAYOUT.size)
+                os.pwrite(fd, _LAYOUT.pack(_UNSET, _UNSET, _UNSET, 0.0, 0.0), 0)
+            self._map = mmap.mmap(fd, _LAYOUT.size)
+        finally:
+            os.close(fd)
+
+    def read(self) -> RateLimitSnapshot:
+        remaining, limit, reset_at, observed_at, backoff_until = _LAYOUT.unpack_from(self._map, 0)
+        return RateLimitSnapshot(
+            remaining=int(remaining) if remaining >= 0 else None,
+            limit=int(limit) if limit >= 0 else None,
+            reset_at=reset_at if reset_at >= 0 else None,
+            observed_at=observed_at,
+            backoff_until=backoff_until,
+        )
+
+    def publish_budget(self, remaining: int, limit: Optional[int], reset_at: Optional[float], observed_at: float) -> None:
+        _BUDGET.pack_into(
+            self._map,
+            0,
+            float(remaining),
+            float(limit) if limit is not None else _UNSET,
+            float(reset_at) if reset_at is not None else _UNSET,
+            observed_at,
+        )
+
+    def publish_backoff(self, until: float) -> None:
+        if until > self.read().backoff_until:
+            _BACKOFF.pack_into(self._map, _BACKOFF_OFFSET, until)
+
+    def close(self) -> None:
+        self._map.close()
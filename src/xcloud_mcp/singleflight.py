@@ -0,0 +1,53 @@
+"""
+🛫 Coalescência de requisições idênticas em andamento (single-flight)
+
+Chamadas concorrentes com a mesma chave aguardam uma única execução
+compartilhada em vez de repetir a requisição ao GitHub.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Compartilha o resultado de uma execução entre chamadores concorrentes.
+
+    A execução roda em uma task própria, protegida com ``asyncio.shield``:
+    cancelar um chamador não cancela a requisição dos demais.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Executa ``factory()`` ou aguarda a execução já em andamento para ``key``."""
+        task = self._calls.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(factory())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": self.in_flight,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+        }
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Evita o aviso de exceção não recuperada quando todos cancelaram
+            task.exception()
@@ -0,0 +1,164 @@
+"""
+🔬 Rastreamento de chamadas lentas e profiling por amostragem
+
+Com ``X_CLOUD_MCP_TRACE`` ativo, cada chamada de ferramenta MCP vira uma
+árvore de spans (ferramenta → requisições ao GitHub → leitura do corpo →
+decodificação JSON → pós-processamento). Chamadas acima do limiar são
+logadas com o detalhamento completo e guardadas para ``/admin/traces``.
+
+O profiler por amostragem lê a pilha da thread do event loop a intervalos
+fixos e produz pilhas colapsadas (``a;b;c N``), prontas para ferramentas de
+flame graph.
+"""
+
+import contextvars
+import logging
+import os
+import sys
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, List, Optional
+
+from fastmcp.server.middleware import Middleware
+
+# 🔧 Configuração do rastreamento (desativado por padrão)
+TRACE_ENABLED = os.getenv("X_CLOUD_MCP_TRACE", "").lower() in ("1", "true", "yes")
+TRACE_SLOW_THRESHOLD = float(os.getenv("X_CLOUD_MCP_TRACE_SLOW_THRESHOLD", "2"))
+TRACE_KEEP = int(os.getenv("X_CLOUD_MCP_TRACE_KEEP", "50"))
+
+# Limites do profiler sob demanda
+PROFILE_MAX_SECONDS = 60.0
+PROFILE_MIN_INTERVAL = 0.001
+
+
+class Span:
+    def __init__(self, name: str, attrs: Optional[Dict] = None):
+        self.name = name
+        self.attrs = attrs or {}
+        self.started = time.perf_counter()
+        self.ended: Optional[float] = None
+        self.children: List["Span"] = []
+
+    @property
+    def duration(self) -> float:
+        return (self.ended or time.perf_counter()) - self.started
+
+    def self_time(self) -> float:
+        """Tempo não coberto por nenhum filho (filhos concorrentes contam uma vez)."""
+        covered, cursor = 0.0, self.started
+        for child in sorted(self.children, key=lambda span: span.started):
+            end = child.started + child.duration
+            if end > cursor:
+                covered += end - max(child.started, cursor)
+                cursor = end
+        return max(self.duration - covered, 0.0)
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            **({"attrs": self.attrs} if self.attrs else {}),
+            "duration_ms": round(self.duration * 1000, 2),
+            "self_ms": round(self.self_time() * 1000, 2),
+            "children": [child.to_dict() for child in self.children],
+        }
+
+    def render(self, depth: int = 0) -> Iterator[str]:
+        attrs = " ".join(f"{key}={value}" for key, value in self.attrs.items())
+        yield (
+            f"{'  ' * depth}{self.name}{' ' + attrs if attrs else ''}: "
+            f"{self.duration * 1000:.1f}ms (self {self.self_time() * 1000:.1f}ms)"
+        )
+        for child in self.children:
+            yield from child.render(depth + 1)
+
+
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("xcloud_mcp_span", default=None)
+
+# Últimos traces acima do limiar, para /admin/traces
+slow_traces: Deque[Dict] = deque(maxlen=TRACE_KEEP)
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[Optional[Span]]:
+    """
+    Registra um span filho do span atual.
+
+    Fora de um trace (ou com o rastreamento desativado) não faz nada. Tasks
+    criadas dentro de um span herdam o contexto e penduram seus spans nele.
+    """
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(name, attrs)
+    parent.children.append(child)
+    token = _current.set(child)
+    try:
+        yield child
+    finally:
+        child.ended = time.perf_counter()
+        _current.reset(token)
+
+
+@contextmanager
+def trace(name: str, threshold: Optional[float] = None, **attrs) -> Iterator[Optional[Span]]:
+    """Abre o span raiz de uma chamada e loga a árvore se passar do limiar."""
+    if not TRACE_ENABLED or _current.get() is not None:
+        with span(name, **attrs) as nested:
+            yield nested
+        return
+    root = Span(name, attrs)
+    token = _current.set(root)
+    try:
+        yield root
+    finally:
+        root.ended = time.perf_counter()
+        _current.reset(token)
+        limit = TRACE_SLOW_THRESHOLD if threshold is None else threshold
+        if root.duration >= limit:
+            slow_traces.append(root.to_dict())
+            logging.warning(
+                "Chamada lenta (%.0fms, limiar %.0fms):\n%s",
+                root.duration * 1000,
+                limit * 1000,
+                "\n".join(root.render()),
+            )
+
+
+class TracingMiddleware(Middleware):
+    """Abre um trace por chamada de ferramenta MCP."""
+
+    async def on_call_tool(self, context, call_next):
+        with trace(f"tool:{context.message.name}"):
+            return await call_next(context)
+
+
+def sample_stacks(thread_id: int, seconds: float, interval: float) -> Dict[str, int]:
+    """
+    Amostra a pilha de ``thread_id`` por ``seconds`` segundos.
+
+    Roda em uma thread própria; retorna pilhas colapsadas (raiz primeiro) e
+    o número de amostras de cada uma.
+    """
+    seconds = min(max(seconds, 0.0), PROFILE_MAX_SECONDS)
+    interval = max(interval, PROFILE_MIN_INTERVAL)
+    stacks: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        frame = sys._current_frames().get(thread_id)
+        if frame is None:
+            break
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        stacks[";".join(reversed(names))] += 1
+        time.sleep(interval)
+    return dict(stacks)
+
+
+def collapsed(stacks: Dict[str, int]) -> str:
+    """Formato de pilhas colapsadas (flamegraph.pl, speedscope, inferno)."""
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
@@ -0,0 +1,69 @@
+"""
+🪝 Ingestão de webhooks do GitHub
+
+Verifica a assinatura HMAC (``X-Hub-Signature-256``) e traduz cada evento
+nos endpoints do cache que deixaram de ser válidos.
+"""
+
+import hashlib
+import hmac
+import os
+from typing import Dict, List, Optional, Tuple
+
+# 🔧 Segredo compartilhado com o webhook do GitHub (sem segredo, a rota fica desativada)
+WEBHOOK_SECRET = os.getenv("X_CLOUD_MCP_WEBHOOK_SECRET", "")
+
+SUPPORTED_EVENTS = {"workflow_run", "workflow", "repository", "push", "ping"}
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """Confere ``sha256=<hex>`` contra o HMAC-SHA256 do corpo bruto."""
+    if not secret or not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len("sha256="):])
+
+
+def invalidation_targets(event: str, payload: Dict) -> List[Tuple[str, bool]]:
+    """
+    Endpoints do cache afetados pelo evento.
+
+    Returns:
+        Lista de ``(endpoint, exato)``; quando ``exato`` é falso, o endpoint é
+        tratado como prefixo.
+    """
+    repository = payload.get("repository") or {}
+    full_name = repository.get("full_name")
+    if not full_name:
+        return []
+    base = f"/repos/{full_name}"
+
+    if event == "workflow_run":
+        return [(f"{base}/actions/runs", False)]
+    if event == "workflow":
+        return [(f"{base}/actions/workflows", False)]
+    if event == "repository":
+        targets = [(base, True), (f"{base}/", False)]
+        owner = (repository.get("owner") or {}).get("login")
+        if owner:
+            targets.append((f"/orgs/{owner}/repos", False))
+        changes = payload.get("changes") or {}
+        old_name = ((changes.get("repository") or {}).get("name") or {}).get("from")
+        if owner and old_name:
+            targets += [(f"/repos/{owner}/{old_name}", True), (f"/repos/{owner}/{old_name}/", False)]
+        return targets
+    if event == "push":
+        # pushed_at/size mudam; workflows só se algum arquivo de workflow mudou
+        targets = [(base, True)]
+        if _touches_workflows(payload):
+            targets.append((f"{base}/actions/workflows", False))
+        return targets
+    return []
+
+
+def _touches_workflows(payload: Dict) -> bool:
+    for commit in payload.get("commits") or []:
+        for key in ("added", "modified", "removed"):
+            if any(path.startswith(".github/workflows/") for path in commit.get(key) or []):
+                return True
+    return False
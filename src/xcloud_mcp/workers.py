@@ -0,0 +1,142 @@
+"""
+👥 Modo multi-worker
+
+Com ``X_CLOUD_MCP_WORKERS`` maior que 1 (transportes HTTP), o processo
+principal vira um supervisor que inicia N workers. Cada worker escuta a
+mesma porta com ``SO_REUSEPORT``, e o kernel distribui as conexões entre
+eles. Para que mais workers não multipliquem o tráfego nem o consumo de
+quota no GitHub, eles compartilham:
+
+- o cache de respostas, pelo ``PersistentCache`` em SQLite (modo ``shared``);
+- o orçamento de rate limit e o back-off, por um ``SharedRateLimitState``.
+
+O token bucket local de cada worker recebe 1/N da taxa configurada. O
+snapshot da organização (refresher e webhooks), o histórico de runs e as
+métricas ficam na memória de cada processo: com o refresher ou os webhooks
+ativos o servidor roda com um único worker, e as métricas de cada worker
+levam o rótulo ``worker``.
+"""
+
+import logging
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from xcloud_mcp.shared_state import SharedRateLimitState
+
+# 🔧 Configuração do modo multi-worker
+WORKERS = int(os.getenv("X_CLOUD_MCP_WORKERS", "1"))
+
+# Definidos pelo supervisor no ambiente de cada worker
+WORKER_ID = os.getenv("X_CLOUD_MCP_WORKER_ID", "")
+WORKER_COUNT = int(os.getenv("X_CLOUD_MCP_WORKER_COUNT", "1"))
+SHARED_STATE_PATH = os.getenv("X_CLOUD_MCP_SHARED_STATE", "")
+
+# Transportes que funcionam atrás de várias instâncias (sessões sem estado)
+MULTI_WORKER_TRANSPORTS = {"http", "streamable-http"}
+
+RESTART_DELAY = 1.0
+SHUTDOWN_TIMEOUT = 10.0
+POLL_INTERVAL = 0.5
+
+# Os workers trocam entradas do cache pelo SQLite; gravações mais frequentes
+# encurtam a janela em que dois workers buscam o mesmo endpoint
+SHARED_FLUSH_INTERVAL = "0.25"
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+
+def is_worker() -> bool:
+    return WORKER_ID != ""
+
+
+def is_primary() -> bool:
+    """Processo único ou worker 0: responsável pelas tarefas em segundo plano."""
+    return WORKER_ID in ("", "0")
+
+
+def bind_reuseport(host: str, port: int) -> socket.socket:
+    """Socket de escuta que pode ser aberto na mesma porta por todos os workers."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    return sock
+
+
+def worker_environment(worker_id: int, count: int, transport: str, host: str, port: int, state_dir: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update(
+        X_CLOUD_MCP_WORKER_ID=str(worker_id),
+        X_CLOUD_MCP_WORKER_COUNT=str(count),
+        X_CLOUD_MCP_SHARED_STATE=os.path.join(state_dir, "rate-limit.state"),
+        X_CLOUD_MCP_TRANSPORT=transport,
+        X_CLOUD_MCP_HOST=host,
+        X_CLOUD_MCP_PORT=str(port),
+    )
+    if not env.get("X_CLOUD_MCP_CACHE_PATH"):
+        env["X_CLOUD_MCP_CACHE_PATH"] = os.path.join(state_dir, "github-cache.sqlite3")
+    env.setdefault("X_CLOUD_MCP_CACHE_FLUSH_INTERVAL", SHARED_FLUSH_INTERVAL)
+    return env
+
+
+def supervise(transport: str, host: str, port: int, workers: int = WORKERS) -> int:
+    """
+    Inicia ``workers`` processos e os mantém rodando até SIGTERM/SIGINT.
+
+    Workers que encerram inesperadamente são reiniciados. Os sinais são
+    repassados a todos os workers, que encerram de forma graciosa.
+    """
+    state_dir = tempfile.mkdtemp(prefix="xcloud-mcp-")
+    # Cria o estado compartilhado antes que os workers o abram
+    SharedRateLimitState(os.path.join(state_dir, "rate-limit.state")).close()
+
+    def spawn(worker_id: int) -> subprocess.Popen:
+        env = worker_environment(worker_id, workers, transport, host, port, state_dir)
+        # Sessão própria: Ctrl+C chega só ao supervisor, que o repassa uma única vez
+        return subprocess.Popen([sys.executable, WORKER_SCRIPT], env=env, start_new_session=True)
+
+    processes: Dict[int, subprocess.Popen] = {}
+    stopping: List[int] = []
+
+    def forward(signum, frame) -> None:
+        stopping.append(signum)
+        for process in processes.values():
+            if process.poll() is None:
+                process.send_signal(signum)
+
+    previous = {sig: signal.signal(sig, forward) for sig in (signal.SIGTERM, signal.SIGINT)}
+    logging.info("Iniciando %s workers em %s:%s (transporte '%s').", workers, host, port, transport)
+    try:
+        for worker_id in range(workers):
+            processes[worker_id] = spawn(worker_id)
+        while not stopping:
+            for worker_id, process in list(processes.items()):
+                code = process.poll()
+                if code is not None and not stopping:
+                    logging.warning("Worker %s encerrou com código %s; reiniciando.", worker_id, code)
+                    time.sleep(RESTART_DELAY)
+                    processes[worker_id] = spawn(worker_id)
+            time.sleep(POLL_INTERVAL)
+    finally:
+        for process in processes.values():
+            if process.poll() is None and not stopping:
+                process.terminate()
+        for worker_id, process in processes.items():
+            try:
+                process.wait(timeout=SHUTDOWN_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                logging.warning("Worker %s não encerrou em %ss; forçando.", worker_id, SHUTDOWN_TIMEOUT)
+                process.kill()
+                process.wait()
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+        shutil.rmtree(state_dir, ignore_errors=True)
+    return 0
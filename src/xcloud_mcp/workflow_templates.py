@@ -0,0 +1,139 @@
+"""
+📝 Templates das issues de implementação de workflows
+
+Ficam fora de ``main.py`` e são importados só na primeira chamada de
+``create_workflow_issue``, para não pesar na partida do servidor.
+
+Cada issue criada leva no corpo um marcador invisível (comentário HTML) com
+o tipo do workflow e a chave de idempotência, usado para reconhecer issues
+já existentes antes de criar outra.
+"""
+
+import hashlib
+from typing import Dict, List, Optional
+
+# Label presente em todos os templates; filtra a busca por issues existentes
+LOOKUP_LABEL = "workflow"
+
+MARKER_PREFIX = "<!-- xcloud-mcp:workflow-issue"
+
+WORKFLOW_TEMPLATES = {
+    "ci": {
+        "title": "🔄 Implementar Workflow CI (Integração Contínua)",
+        "labels": ["enhancement", "ci-cd", "workflow", "priority-high"],
+        "body": """## 🔄 Implementar Workflow CI
+
+### 📋 Objetivo
+Implementar workflow de Integração Contínua seguindo o padrão xCloud.
+
+### ✅ Checklist de Implementação
+- [ ] Criar arquivo `.github/workflows/ci.yml`
+- [ ] Configurar triggers (push/PR para main/develop)
+- [ ] Implementar quality checks (lint, format, audit)
+- [ ] Configurar build do projeto
+- [ ] Adicionar execução de testes
+- [ ] Upload de artefatos de build
+- [ ] Configurar coverage reports
+
+### 🎯 Referência
+- [Padrão de Workflows xCloud](../xcloud-docs/docs/guides/github-actions-workflows.md)
+- [Implementação de Referência](../xcloud-bot/.github/workflows/ci.yml)
+
+### 📊 Critérios de Aceite
+- [ ] Workflow executado em push/PR
+- [ ] Quality checks passando
+- [ ] Build gerado com sucesso
+- [ ] Testes executados
+- [ ] Cobertura reportada
+- [ ] Documentação atualizada
+
+_Issue criada automaticamente pelo xCloud Bot_"""
+    },
+    "cd": {
+        "title": "🚀 Implementar Workflow CD (Entrega Contínua)",
+        "labels": ["enhancement", "ci-cd", "workflow", "deployment"],
+        "body": """## 🚀 Implementar Workflow CD
+
+### 📋 Objetivo
+Implementar workflow de Entrega Contínua para deploy automático.
+
+### ✅ Checklist de Implementação
+- [ ] Criar arquivo `.github/workflows/cd.yml`
+- [ ] Configurar trigger pós-CI
+- [ ] Implementar deploy para staging
+- [ ] Configurar deploy manual para production
+- [ ] Adicionar notificações
+- [ ] Configurar environments no GitHub
+
+### 🎯 Ambientes
+- **Staging**: Deploy automático após CI
+- **Production**: Deploy manual com aprovação
+
+### 📊 Critérios de Aceite
+- [ ] Deploy staging automático
+- [ ] Deploy production manual
+- [ ] Notificações funcionando
+- [ ] Rollback em caso de falha
+
+_Issue criada automaticamente pelo xCloud Bot_"""
+    },
+    "build": {
+        "title": "🏗️ Implementar Workflow Build Especializado",
+        "labels": ["enhancement", "build", "workflow"],
+        "body": """## 🏗️ Implementar Workflow Build
+
+### 📋 Objetivo
+Implementar workflow especializado para builds reutilizáveis.
+
+### ✅ Checklist de Implementação
+- [ ] Criar arquivo `.github/workflows/build.yml`
+- [ ] Configurar `workflow_call`
+- [ ] Implementar build otimizado
+- [ ] Análise de artefatos
+- [ ] Build de documentação
+- [ ] Cache inteligente
+
+### 📊 Critérios de Aceite
+- [ ] Reutilizável por outros workflows
+- [ ] Build otimizado e rápido
+- [ ] Artefatos bem organizados
+- [ ] Documentação gerada
+
+_Issue criada automaticamente pelo xCloud Bot_"""
+    }
+}
+
+
+def default_key(workflow_type: str, title: str) -> str:
+    """Chave de idempotência padrão: a mesma para o mesmo template e título."""
+    return hashlib.sha1(f"{workflow_type}:{title}".encode()).hexdigest()[:12]
+
+
+def marker(workflow_type: str, key: str) -> str:
+    return f"{MARKER_PREFIX} type={workflow_type} key={key} -->"
+
+
+def issue_data(workflow_type: str, title: Optional[str] = None, key: Optional[str] = None) -> Dict:
+    """Corpo da requisição de criação da issue, com o marcador de idempotência."""
+    template = WORKFLOW_TEMPLATES[workflow_type]
+    title = title or template["title"]
+    key = key or default_key(workflow_type, title)
+    return {
+        "title": title,
+        "body": f"{template['body']}\n\n{marker(workflow_type, key)}",
+        "labels": template["labels"],
+    }
+
+
+def find_existing(issues: List[Dict], workflow_type: str, title: str, key: str) -> Optional[Dict]:
+    """
+    Primeira issue aberta da mesma rodada: com o marcador completo (tipo e
+    chave) ou, para issues criadas antes do marcador, com o mesmo título.
+    Issues com o marcador de outra chave são de outra rodada e não contam.
+    """
+    expected = marker(workflow_type, key)
+    for issue in issues:
+        body = issue.get("body") or ""
+        if expected in body or (MARKER_PREFIX not in body and issue.get("title") == title):
+            return issue
+    return None
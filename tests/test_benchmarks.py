@@ -0,0 +1,121 @@
+import asyncio
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, ROOT)
+
+import aiohttp
+import pytest
+
+from benchmarks import load, run, startup
+from benchmarks.stats import percentile
+from benchmarks.github_stub import GitHubStub, StubConfig
+
+# Mark all tests in this file as async
+pytestmark = pytest.mark.asyncio
+
+
+async def test_stub_paginates_and_revalidates_etags():
+    """
+    Tests the stub's Link pagination, ETag 304s and rate-limit headers.
+    """
+    async with GitHubStub(StubConfig(org_size=5, latency=0)) as stub:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"{stub.base_url}/orgs/PageCloudv1/repos?per_page=2") as response:
+                page = await response.json()
+                etag = response.headers["ETag"]
+                assert len(page) == 2
+                assert 'page=2>; rel="next"' in response.headers["Link"]
+                assert response.headers["X-RateLimit-Remaining"] == "4999"
+
+            async with session.get(
+                f"{stub.base_url}/orgs/PageCloudv1/repos?per_page=2", headers={"If-None-Match": etag}
+            ) as response:
+                assert response.status == 304
+                assert response.headers["X-RateLimit-Remaining"] == "4999"
+
+    assert stub.not_modified == 1
+
+
+async def test_suite_runs_every_tool_without_errors():
+    """
+    Tests a tiny benchmark matrix end to end against the stub.
+    """
+    results = await run.run_suite(list(run.TOOLS), org_sizes=[10], concurrency_levels=[2], calls=4, latency=0)
+
+    assert [result["tool"] for result in results] == list(run.TOOLS)
+    assert all(result["errors"] == 0 for result in results)
+    assert all(result["p99_ms"] >= result["p50_ms"] > 0 for result in results)
+    assert any(result["upstream_not_modified"] > 0 for result in results)
+
+
+async def test_compare_flags_regressions():
+    """
+    Tests the regression gate against a baseline run.
+    """
+    baseline = [{"tool": "t", "org_size": 1, "concurrency": 1, "p50_ms": 10.0, "throughput": 100.0, "errors": 0}]
+    slower = [{"tool": "t", "org_size": 1, "concurrency": 1, "p50_ms": 13.0, "throughput": 75.0, "errors": 0}]
+    within = [{"tool": "t", "org_size": 1, "concurrency": 1, "p50_ms": 11.0, "throughput": 95.0, "errors": 0}]
+
+    assert len(run.compare(slower, baseline, max_regression=0.2)) == 2
+    assert run.compare(within, baseline, max_regression=0.2) == []
+
+
+async def test_percentile_is_nearest_rank():
+    """
+    Tests percentiles against known nearest-rank values.
+    """
+    values = list(range(1, 101))
+
+    assert percentile([6, 1, 5, 2, 4, 3], 0.50) == 3
+    assert percentile(values, 0.50) == 50
+    assert percentile(values, 0.95) == 95
+    assert percentile(values, 0.99) == 99
+    assert percentile(values, 1.0) == 100
+    assert percentile([7.0], 0.0) == 7.0
+    assert percentile([], 0.5) == 0.0
+
+
+async def test_load_mix_parsing_and_arguments():
+    """
+    Tests the tool-mix syntax and that generated arguments target stub repos.
+    """
+    mix = load.parse_mix(load.DEFAULT_MIX)
+    rng = load.random.Random(0)
+
+    assert mix["monitor_ci_status"] == 5
+    assert set(mix) <= set(run.TOOLS)
+    assert load.tool_arguments("analyze_repository", rng, 10)["repo_url"].startswith("PageCloudv1/xcloud-")
+    assert load.tool_arguments("create_workflow_issue", rng, 10)["workflow_type"] in ("ci", "cd", "build")
+
+
+async def test_load_runs_sessions_against_server_subprocess():
+    """
+    Tests a minimal load run: server subprocess, stub backend, two HTTP sessions.
+    """
+    results = await load.run_load(["http"], [2], {"monitor_ci_status": 1}, calls=2, org_size=5, latency=0)
+
+    assert len(results) == 1
+    result = results[0]
+    assert result["calls"] == 4
+    assert result["error_rate"] == 0
+    assert result["session_errors"] == 0
+    assert result["tools"]["monitor_ci_status"]["calls"] == 4
+
+
+async def test_startup_benchmark_measures_stdio_cold_start():
+    """
+    Tests that the stdio cold-start benchmark answers initialize and tools/list
+    without the server importing the HTTP client stack.
+    """
+    result = await asyncio.to_thread(startup.run_startup, 1)
+
+    assert result["tools"] == len(await run.main.app.get_tools())
+    assert 0 < result["initialize_p50_ms"] <= result["list_tools_p50_ms"]
+    assert result["import_ms"] > 0
+    assert "aiohttp" not in {item["module"] for item in result["heaviest_imports"]}
+    assert startup.compare(result, {**result, "import_ms": result["import_ms"] / 2}, 0.2) == [
+        f"import_ms: {result['import_ms'] / 2}ms -> {result['import_ms']}ms"
+    ]
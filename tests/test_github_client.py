@@ -0,0 +1,135 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import pytest
+
+from xcloud_mcp import github_client
+
+# Mark all tests in this file as async
+pytestmark = pytest.mark.asyncio
+
+
+async def test_get_session_reuses_pooled_session():
+    """
+    Tests that consecutive calls share the same pooled ClientSession.
+    """
+    try:
+        first = await github_client.get_session()
+        second = await github_client.get_session()
+
+        assert first is second
+        assert not first.closed
+        assert first.connector.limit_per_host == github_client.HTTP_POOL_LIMIT_PER_HOST
+        assert first.timeout.connect == github_client.HTTP_CONNECT_TIMEOUT
+        assert first.timeout.sock_read == github_client.HTTP_READ_TIMEOUT
+    finally:
+        await github_client.close_session()
+
+
+async def test_close_session_closes_and_recreates():
+    """
+    Tests that close_session closes the pool and a new one is created afterwards.
+    """
+    first = await github_client.get_session()
+    await github_client.close_session()
+
+    assert first.closed
+
+    second = await github_client.get_session()
+    try:
+        assert second is not first
+        assert not second.closed
+    finally:
+        await github_client.close_session()
+
+
+async def test_get_session_recreates_session_on_another_loop():
+    """
+    Tests that a different event loop never receives the session bound to the previous loop.
+    """
+    import asyncio
+
+    await github_client.close_session()
+    first = await github_client.get_session()
+
+    async def from_other_loop():
+        session = await github_client.get_session()
+        loop_is_own = session._loop is asyncio.get_running_loop()
+        await session.close()
+        return session, loop_is_own
+
+    try:
+        second, loop_is_own = await asyncio.to_thread(asyncio.run, from_other_loop())
+
+        assert second is not first
+        assert loop_is_own
+        assert not first.closed
+    finally:
+        await first.close()
+        await github_client.close_session()
+
+
+async def test_pool_stats_counts_connections_in_use():
+    """
+    Tests that pool_stats reports an empty pool and then the acquired connections.
+    """
+    await github_client.close_session()
+    assert github_client.pool_stats()["in_use"] == 0
+    try:
+        session = await github_client.get_session()
+        session.connector._acquired.add(object())
+        session.connector._acquired_per_host["api.github.com"].add(object())
+
+        stats = github_client.pool_stats()
+
+        assert stats["in_use"] == 1
+        assert stats["busiest_host_in_use"] == 1
+        assert stats["utilization"] == round(1 / github_client.HTTP_POOL_LIMIT_PER_HOST, 3)
+        session.connector._acquired.clear()
+        session.connector._acquired_per_host.clear()
+    finally:
+        await github_client.close_session()
+
+
+async def test_github_api_request_uses_shared_session(mocker):
+    """
+    Tests that github_api_request goes through the shared session.
+    """
+    from xcloud_mcp.main import github_api_request
+
+    mocker.patch("xcloud_mcp.main.GITHUB_TOKEN", "test-token")
+    mock_request = mocker.patch("aiohttp.ClientSession.request")
+    mock_response = mock_request.return_value.__aenter__.return_value
+    mock_response.status = 200
+    mock_response.headers = {}
+    mock_response.json.return_value = {"ok": True}
+    get_session = mocker.spy(github_client, "get_session")
+
+    try:
+        await github_api_request("/a")
+        await github_api_request("/b")
+    finally:
+        await github_client.close_session()
+
+    assert get_session.call_count == 2
+    assert get_session.spy_return_list[0] is get_session.spy_return_list[1]
+
+
+async def test_parse_link_header():
+    """
+    Tests parsing of GitHub pagination Link headers.
+    """
+    header = (
+        '<https://api.github.com/orgs/x/repos?page=2>; rel="next", '
+        '<https://api.github.com/orgs/x/repos?page=5>; rel="last"'
+    )
+
+    links = github_client.parse_link_header(header)
+
+    assert links == {
+        "next": "https://api.github.com/orgs/x/repos?page=2",
+        "last": "https://api.github.com/orgs/x/repos?page=5",
+    }
+    assert github_client.parse_link_header(None) == {}
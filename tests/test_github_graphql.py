@@ -0,0 +1,84 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from xcloud_mcp import github_graphql
+
+
+def test_build_repositories_query_uses_aliases_and_variables():
+    """
+    Tests that one aliased selection is generated per repository.
+    """
+    query, variables = github_graphql.build_repositories_query(
+        ["PageCloudv1/xcloud-mcp", "PageCloudv1/xcloud-docs"]
+    )
+
+    assert "r0: repository(owner: $o0, name: $n0)" in query
+    assert "r1: repository(owner: $o1, name: $n1)" in query
+    assert "fragment RepoFields on Repository" in query
+    assert "checkSuites" not in query and "stargazerCount" not in query
+    assert variables == {
+        "o0": "PageCloudv1",
+        "n0": "xcloud-mcp",
+        "o1": "PageCloudv1",
+        "n1": "xcloud-docs",
+    }
+
+
+def test_chunked_respects_batch_size():
+    """
+    Tests that repositories are split into bounded query batches.
+    """
+    names = [f"PageCloudv1/xcloud-{i}" for i in range(7)]
+
+    chunks = list(github_graphql.chunked(names, size=3))
+
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert sum(chunks, []) == names
+
+
+def test_parse_repositories_response_normalizes_nodes():
+    """
+    Tests normalization of repository nodes and missing repositories.
+    """
+    data = {
+        "r0": {"workflowFiles": {"entries": [{"name": "ci.yml"}, {"name": "README.md"}]}},
+        "r1": None,
+    }
+
+    result = github_graphql.parse_repositories_response(
+        ["PageCloudv1/xcloud-mcp", "PageCloudv1/missing"], data
+    )
+
+    repo = result["PageCloudv1/xcloud-mcp"]
+    assert repo == {"workflow_files": ["ci.yml"]}
+    assert result["PageCloudv1/missing"] is None
+
+
+def test_open_issues_query_and_response():
+    """
+    Tests the batched open-issues query and its normalization.
+    """
+    names = ["PageCloudv1/xcloud-mcp", "PageCloudv1/missing"]
+    query, variables = github_graphql.build_open_issues_query(names, ["workflow"], first=10)
+
+    assert "fragment OpenIssues on Repository" in query
+    assert variables["labels"] == ["workflow"] and variables["first"] == 10
+    assert variables["n1"] == "missing"
+
+    parsed = github_graphql.parse_open_issues_response(names, {
+        "r0": {"issues": {"nodes": [{"number": 1, "title": "CI", "url": "https://x/1", "body": "b"}]}},
+        "r1": None,
+    })
+    assert parsed == {
+        "PageCloudv1/xcloud-mcp": [{"number": 1, "title": "CI", "html_url": "https://x/1", "body": "b"}],
+        "PageCloudv1/missing": None,
+    }
+
+    # More open issues than one page: left for the paginated REST lookup
+    truncated = github_graphql.parse_open_issues_response(names[:1], {
+        "r0": {"issues": {"pageInfo": {"hasNextPage": True}, "nodes": [{"number": 1}]}},
+    })
+    assert truncated == {"PageCloudv1/xcloud-mcp": None}
+
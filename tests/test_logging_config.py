@@ -0,0 +1,121 @@
+import io
+import json
+import logging
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from xcloud_mcp import logging_config
+
+
+def _pipeline(name, **kwargs):
+    """Builds an isolated logger wired to the queue pipeline."""
+    logger = logging.getLogger(f"xcloud_mcp.tests.{name}")
+    logger.propagate = False
+    logger.handlers.clear()
+    stream = io.StringIO()
+    listener = logging_config.configure_logging(stream=stream, logger=logger, **kwargs)
+    return logger, listener, stream
+
+
+def test_records_are_formatted_on_the_listener_thread():
+    """
+    Tests that %-arguments are interpolated off the calling thread.
+    """
+    formatted_on = []
+
+    # A str subclass counts as an immutable scalar, so formatting is deferred
+    class Probe(str):
+        def __str__(self):
+            formatted_on.append(threading.current_thread())
+            return "probe"
+
+    logger, listener, stream = _pipeline("lazy")
+    logger.info("valor: %s", Probe("probe"))
+    listener.stop()
+
+    assert "valor: probe" in stream.getvalue()
+    assert formatted_on and formatted_on[0] is not threading.current_thread()
+
+
+def test_mutable_arguments_and_tracebacks_are_snapshotted():
+    """
+    Tests that mutable arguments are formatted at the call and tracebacks rendered before queueing.
+    """
+    logger, listener, stream = _pipeline("snapshot")
+    state = {"pending": 1}
+    logger.warning("Estado: %s", state)
+    state["pending"] = 2
+    try:
+        raise ValueError("falhou")
+    except ValueError:
+        logger.exception("Erro %s", "x")
+    listener.stop()
+
+    output = stream.getvalue()
+    assert "Estado: {'pending': 1}" in output
+    assert "ValueError: falhou" in output
+
+
+def test_json_output():
+    """
+    Tests the structured JSON formatter.
+    """
+    logger, listener, stream = _pipeline("json", fmt="json")
+    logger.warning("Repositório %s sem workflows", "PageCloudv1/xcloud-a")
+    listener.stop()
+
+    entry = json.loads(stream.getvalue().splitlines()[0])
+    assert entry["level"] == "WARNING"
+    assert entry["message"] == "Repositório PageCloudv1/xcloud-a sem workflows"
+
+
+def test_repetitive_messages_are_rate_limited(monkeypatch):
+    """
+    Tests per-template rate limiting, the suppressed count and that errors always pass.
+    """
+    clock = [0.0]
+    monkeypatch.setattr(logging_config.time, "monotonic", lambda: clock[0])
+    logger, listener, stream = _pipeline("rate", rate_limit=2, rate_window=60)
+
+    for index in range(5):
+        logger.warning("Não foi possível verificar workflows para %s", f"repo-{index}")
+    for _ in range(3):
+        logger.error("Falha persistente")
+    clock[0] = 61.0
+    logger.warning("Não foi possível verificar workflows para %s", "repo-9")
+    listener.stop()
+
+    lines = stream.getvalue().splitlines()
+    assert sum("verificar workflows" in line for line in lines) == 3
+    assert sum("Falha persistente" in line for line in lines) == 3
+    assert lines[-1].endswith("repo-9 (+3 mensagens semelhantes suprimidas)")
+
+
+def test_expired_templates_are_pruned(monkeypatch):
+    """
+    Tests that one-off messages are forgotten after their window while
+    templates with a pending suppressed count are kept.
+    """
+    clock = [0.0]
+    monkeypatch.setattr(logging_config.time, "monotonic", lambda: clock[0])
+    rate_filter = logging_config.RateLimitFilter(limit=1, window=60)
+
+    def record(msg):
+        return logging.LogRecord("xcloud_mcp", logging.WARNING, __file__, 1, msg, None, None)
+
+    for index in range(100):
+        assert rate_filter.filter(record(f"Repositório repo-{index} sem workflows"))
+    assert rate_filter.filter(record("Falha transitória"))
+    assert not rate_filter.filter(record("Falha transitória"))
+    assert len(rate_filter._windows) == 101
+
+    clock[0] = 61.0
+    assert rate_filter.filter(record("Nova mensagem"))
+    assert set(key[2] for key in rate_filter._windows) == {"Falha transitória", "Nova mensagem"}
+
+    repeated = record("Falha transitória")
+    assert rate_filter.filter(repeated)
+    assert repeated.suppressed == 1
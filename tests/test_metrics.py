@@ -0,0 +1,118 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import pytest
+from fastmcp import Client
+
+from xcloud_mcp import metrics
+from xcloud_mcp.main import app
+
+# Mark all tests in this file as async
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.mark.parametrize(
+    "endpoint, template",
+    [
+        ("/repos/PageCloudv1/xcloud-a", "/repos/{owner}/{repo}"),
+        ("/repos/PageCloudv1/xcloud-a/actions/runs?per_page=10&page=2", "/repos/{owner}/{repo}/actions/runs"),
+        ("/repos/PageCloudv1/xcloud-a/actions/runs/123/jobs", "/repos/{owner}/{repo}/actions/runs/{id}/jobs"),
+        ("/repos/o/r/contents/.github/workflows/ci.yml", "/repos/{owner}/{repo}/contents/{path}"),
+        ("/orgs/PageCloudv1/repos?per_page=100", "/orgs/{org}/repos"),
+        ("/graphql", "/graphql"),
+    ],
+)
+async def test_endpoint_template(endpoint, template):
+    """
+    Tests that owner, repo, ids and query strings are normalized out.
+    """
+    assert metrics.endpoint_template(endpoint) == template
+
+
+async def test_histogram_renders_cumulative_buckets():
+    """
+    Tests the Prometheus text rendering of a histogram.
+    """
+    histogram = metrics.Histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    histogram.observe(0.05, tool="a")
+    histogram.observe(0.5, tool="a")
+    histogram.observe(3.0, tool="a")
+
+    lines = list(histogram.render())
+
+    assert 'latency_seconds_bucket{tool="a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{tool="a",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{tool="a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_sum{tool="a"} 3.55' in lines
+    assert 'latency_seconds_count{tool="a"} 3' in lines
+
+
+async def test_github_requests_counted_by_status_and_error_type():
+    """
+    Tests request counting with normalized endpoints and the rate limit gauge.
+    """
+    registry = metrics.Metrics(rate_limit_remaining=lambda: 4321)
+    registry.observe_github("GET", "/repos/o/a", 0.2, "200")
+    registry.observe_github("GET", "/repos/o/b", 0.3, "404", "GITHUB_API_ERROR")
+
+    text = registry.render()
+
+    assert (
+        'xcloud_mcp_github_requests_total{endpoint="/repos/{owner}/{repo}",error_type="",method="GET",status="200"} 1'
+        in text
+    )
+    assert 'error_type="GITHUB_API_ERROR",method="GET",status="404"} 1' in text
+    assert 'xcloud_mcp_github_request_duration_seconds_count{endpoint="/repos/{owner}/{repo}",method="GET"} 2' in text
+    assert "xcloud_mcp_github_rate_limit_remaining 4321" in text
+
+
+async def test_tool_middleware_records_outcome(mocker):
+    """
+    Tests that tool calls through the server are timed and labelled by outcome.
+    """
+    registry = metrics.Metrics()
+    mocker.patch.object(app, "middleware", [metrics.ToolMetricsMiddleware(registry)])
+    mocker.patch(
+        "xcloud_mcp.main.github_api_request",
+        return_value={"error": {"type": "GITHUB_API_ERROR", "message": "Not Found"}},
+    )
+
+    async with Client(app) as client:
+        await client.call_tool("analyze_repository", {"repo_url": "PageCloudv1/missing"})
+
+    text = registry.render()
+    assert 'xcloud_mcp_tool_calls_total{outcome="GITHUB_API_ERROR",tool="analyze_repository"} 1' in text
+    assert 'xcloud_mcp_tool_duration_seconds_count{tool="analyze_repository"} 1' in text
+    assert 'xcloud_mcp_tools_in_flight{tool="analyze_repository"} 0' in text
+
+
+async def test_tool_middleware_counts_string_errors(mocker):
+    """
+    Tests that tools returning {"error": "<message>"} are not counted as ok.
+    """
+    registry = metrics.Metrics()
+    mocker.patch.object(app, "middleware", [metrics.ToolMetricsMiddleware(registry)])
+
+    async with Client(app) as client:
+        await client.call_tool("analyze_repository", {"repo_url": "invalid-url"})
+
+    assert metrics.error_type({"error": "URL inválida"}) == "TOOL_ERROR"
+    assert metrics.error_type({"status": "ok"}) == ""
+    assert 'xcloud_mcp_tool_calls_total{outcome="TOOL_ERROR",tool="analyze_repository"} 1' in registry.render()
+
+
+async def test_worker_label_is_added_to_every_series():
+    """
+    Tests that multi-worker metrics carry the worker label.
+    """
+    registry = metrics.Metrics(rate_limit_remaining=lambda: 10, worker="2")
+    registry.observe_github("GET", "/repos/a/b", 0.01, "200")
+    registry.tool_calls.inc(tool="analyze_repository", outcome="ok")
+
+    output = registry.render()
+
+    assert 'xcloud_mcp_tool_calls_total{worker="2",outcome="ok",tool="analyze_repository"} 1' in output
+    assert 'xcloud_mcp_github_request_duration_seconds_bucket{worker="2",endpoint="/repos/{owner}/{repo}",method="GET",le="+Inf"} 1' in output
+    assert 'xcloud_mcp_github_rate_limit_remaining{worker="2"} 10' in output
@@ -0,0 +1,123 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import pytest
+
+from xcloud_mcp.persistent_cache import PersistentCache
+from xcloud_mcp.response_cache import ResponseCache
+
+# Mark all tests in this file as async
+pytestmark = pytest.mark.asyncio
+
+
+async def test_entries_survive_a_restart(tmp_path):
+    """
+    Tests that cached responses and validators are reloaded after a restart.
+    """
+    path = str(tmp_path / "cache" / "github.sqlite3")
+
+    # First process: store a response and shut down
+    cache = ResponseCache(max_entries=10, max_bytes=10_000, ttl=600)
+    persistent = PersistentCache(path, max_bytes=10_000, flush_interval=60, batch_size=100)
+    await persistent.open(cache)
+    cache.store("GET", "/repos/a/b", {"id": 1}, {"ETag": '"v1"', "Link": '<https://x>; rel="next"'})
+    await persistent.close()
+
+    # Second process: the entry is back and can be revalidated
+    restarted = ResponseCache(max_entries=10, max_bytes=10_000, ttl=600)
+    loaded = await PersistentCache(path).open(restarted)
+
+    entry = restarted.get("GET", "/repos/a/b")
+    assert loaded == 1
+    assert entry.data == {"id": 1}
+    assert entry.conditional_headers() == {"If-None-Match": '"v1"'}
+    assert entry.link == '<https://x>; rel="next"'
+
+
+async def test_invalidated_entries_are_removed_from_disk(tmp_path):
+    """
+    Tests that invalidations are mirrored to the on-disk store.
+    """
+    path = str(tmp_path / "github.sqlite3")
+    cache = ResponseCache(max_entries=10, max_bytes=10_000, ttl=600)
+    persistent = PersistentCache(path, flush_interval=60)
+    await persistent.open(cache)
+    cache.store("GET", "/repos/a/b", {"id": 1}, {"ETag": "a"})
+    cache.store("GET", "/repos/c/d", {"id": 2}, {"ETag": "c"})
+    await persistent.flush()
+    cache.invalidate("/repos/a/")
+    await persistent.close()
+
+    restarted = ResponseCache(max_entries=10, max_bytes=10_000, ttl=600)
+    await PersistentCache(path).open(restarted)
+
+    assert restarted.get("GET", "/repos/a/b") is None
+    assert restarted.get("GET", "/repos/c/d").data == {"id": 2}
+
+
+async def test_size_based_eviction_keeps_newest(tmp_path):
+    """
+    Tests that the disk budget evicts the least recently validated entries.
+    """
+    path = str(tmp_path / "github.sqlite3")
+    cache = ResponseCache(max_entries=10, max_bytes=10_000, ttl=600)
+    persistent = PersistentCache(path, max_bytes=60, flush_interval=60)
+    await persistent.open(cache)
+    for name in ["a", "b", "c"]:
+        cache.store("GET", f"/{name}", {"payload": name * 15}, {"ETag": name})
+        await persistent.flush()
+    await persistent.close()
+
+    restarted = ResponseCache(max_entries=10, max_bytes=10_000, ttl=600)
+    await PersistentCache(path).open(restarted)
+
+    assert restarted.get("GET", "/a") is None
+    assert restarted.get("GET", "/c") is not None
+    assert persistent.evictions >= 1
+
+
+async def test_shared_cache_serves_entries_written_by_another_worker(tmp_path):
+    """
+    Tests that a worker can read an entry another worker stored after startup.
+    """
+    path = str(tmp_path / "github.sqlite3")
+    writer_cache = ResponseCache(max_entries=10, max_bytes=10_000, ttl=600)
+    writer = PersistentCache(path, flush_interval=60, shared=True)
+    reader = PersistentCache(path, flush_interval=60, shared=True)
+    await writer.open(writer_cache)
+    await reader.open(ResponseCache(max_entries=10, max_bytes=10_000, ttl=600))
+
+    writer_cache.store("GET", "/repos/a/b", {"id": 1}, {"ETag": '"v1"'})
+    assert await reader.fetch(("GET", "/repos/a/b")) is None
+    await writer.flush()
+
+    entry = await reader.fetch(("GET", "/repos/a/b"))
+    assert entry.data == {"id": 1}
+    assert entry.etag == '"v1"'
+    assert await reader.fetch(("GET", "/repos/c/d")) is None
+    await writer.close()
+    await reader.close()
+
+
+async def test_connections_are_opened_once_per_thread(tmp_path, mocker):
+    """
+    Tests that reads and flushes reuse one connection per thread instead of reconnecting.
+    """
+    import sqlite3
+
+    connect = mocker.spy(sqlite3, "connect")
+    cache = ResponseCache(max_entries=10, max_bytes=10_000, ttl=600)
+    persistent = PersistentCache(str(tmp_path / "github.sqlite3"), flush_interval=60, shared=True)
+    await persistent.open(cache)
+
+    for index in range(3):
+        cache.store("GET", f"/repos/a/{index}", {"id": index}, {"ETag": f'"v{index}"'})
+        await persistent.flush()
+        assert (await persistent.fetch(("GET", f"/repos/a/{index}"))).data == {"id": index}
+
+    # One for the writer thread (which also ran the schema setup), one for the reader
+    assert connect.call_count == 2
+    await persistent.close()
+    assert await persistent.fetch(("GET", "/repos/a/0")) is None
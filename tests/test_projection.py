@@ -0,0 +1,70 @@
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, ROOT)
+
+import pytest
+
+from benchmarks.github_stub import GitHubStub, StubConfig
+from xcloud_mcp import github_client, main
+from xcloud_mcp.projection import Projection
+from xcloud_mcp.response_cache import ResponseCache
+
+# Mark all tests in this file as async
+pytestmark = pytest.mark.asyncio
+
+
+async def test_projection_keeps_only_requested_paths():
+    """
+    Tests nested projection through lists, with missing fields omitted.
+    """
+    projection = Projection("total_count", "workflow_runs.id", "workflow_runs.actor.login")
+    payload = {
+        "total_count": 2,
+        "workflow_runs": [
+            {"id": 1, "actor": {"login": "a", "avatar_url": "x"}, "repository": {"id": 9}},
+            {"id": 2, "head_commit": {"message": "m"}},
+        ],
+    }
+
+    assert projection.apply(payload) == {
+        "total_count": 2,
+        "workflow_runs": [{"id": 1, "actor": {"login": "a"}}, {"id": 2}],
+    }
+    assert projection.decoder()('{"total_count": 0, "extra": [1, 2]}') == {"total_count": 0}
+    assert Projection("b", "a").key == Projection("a", "b", "a").key
+
+
+async def test_github_api_request_projects_and_caches_separately(mocker):
+    """
+    Tests that projected responses are trimmed, cached under their own key
+    and that error payloads are never projected.
+    """
+    cache = ResponseCache(max_entries=10, max_bytes=10_000_000, ttl=600)
+    mocker.patch("xcloud_mcp.main.github_cache", cache)
+    mocker.patch("xcloud_mcp.main.GITHUB_TOKEN", "token")
+
+    async with GitHubStub(StubConfig(org_size=3, latency=0, runs_per_repo=5)) as stub:
+        mocker.patch("xcloud_mcp.main.GITHUB_API_BASE", stub.base_url)
+        try:
+            endpoint = "/repos/PageCloudv1/xcloud-0001/actions/runs?per_page=5"
+            projected = await main.github_api_request(endpoint, fields=main.RUNS_FIELDS)
+            full = await main.github_api_request(endpoint)
+            missing = await main.github_api_request("/repos/PageCloudv1/nope", fields=main.REPO_FIELDS)
+        finally:
+            await github_client.close_session()
+
+    run = projected["workflow_runs"][0]
+    assert set(run) == {"id", "name", "status", "conclusion", "head_branch", "head_sha", "actor", "created_at", "html_url"}
+    assert run["actor"] == {"login": "xcloud-bot"}
+    assert "repository" not in run and "avatar_url" not in run["actor"]
+    assert len(full["workflow_runs"]) == 5
+    assert missing["error"]["message"] == "Not Found"
+
+    projected_entry = cache.get("GET", f"{endpoint}#fields={main.RUNS_FIELDS.key}")
+    assert projected_entry is not None and cache.get("GET", endpoint) is not None
+    assert projected_entry.size < cache.get("GET", endpoint).size
+
+    assert cache.invalidate(endpoint, exact=True) == 2
@@ -0,0 +1,137 @@
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import pytest
+
+from xcloud_mcp.rate_limit import ContentPacer, Priority, RateLimitExceeded, RateLimitScheduler
+from xcloud_mcp.shared_state import SharedRateLimitState
+
+# Mark all tests in this file as async
+pytestmark = pytest.mark.asyncio
+
+
+async def test_interactive_requests_jump_the_queue():
+    """
+    Tests that queued interactive requests are dispatched before bulk ones.
+    """
+    # Arrange: an empty bucket that refills quickly forces everything into the queue
+    scheduler = RateLimitScheduler(rate=200, burst=1, reserve=0, max_wait=5)
+    await scheduler.acquire()
+    order = []
+
+    async def request(name, priority):
+        await scheduler.acquire(priority)
+        order.append(name)
+
+    # Act
+    tasks = [asyncio.create_task(request(f"bulk-{i}", Priority.BULK)) for i in range(3)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(request("interactive", Priority.INTERACTIVE)))
+    await asyncio.sleep(0)
+    depth = scheduler.queue_depth
+    await asyncio.gather(*tasks)
+
+    # Assert
+    assert depth == 4
+    assert order[0] == "interactive"
+    assert scheduler.queue_depth == 0
+
+
+async def test_reserve_is_kept_for_interactive_calls():
+    """
+    Tests that bulk requests stop at the reserve while interactive ones proceed.
+    """
+    scheduler = RateLimitScheduler(rate=100, burst=10, reserve=50, max_wait=1)
+    scheduler.update(200, {
+        "X-RateLimit-Remaining": "20",
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Reset": str(int(time.time()) + 600),
+    })
+
+    await scheduler.acquire(Priority.INTERACTIVE)
+    with pytest.raises(RateLimitExceeded) as exc_info:
+        await scheduler.acquire(Priority.BULK)
+
+    assert exc_info.value.retry_after > 500
+    assert scheduler.stats()["remaining"] == 20
+
+
+async def test_retry_after_pauses_dispatch():
+    """
+    Tests that a secondary rate limit Retry-After header pauses all requests.
+    """
+    scheduler = RateLimitScheduler(rate=100, burst=10, reserve=0, max_wait=0.5)
+
+    scheduler.update(403, {"Retry-After": "0"})
+    await asyncio.wait_for(scheduler.acquire(), timeout=1)
+
+    scheduler.update(429, {"Retry-After": "120"})
+    with pytest.raises(RateLimitExceeded):
+        await scheduler.acquire(Priority.INTERACTIVE)
+    assert scheduler.stats()["blocked_for"] > 100
+
+
+async def test_github_api_request_reports_rate_limited(mocker):
+    """
+    Tests that github_api_request fails fast when the budget is exhausted.
+    """
+    from xcloud_mcp import main
+
+    mocker.patch("xcloud_mcp.main.GITHUB_TOKEN", "test-token")
+    scheduler = RateLimitScheduler(rate=100, burst=10, reserve=0, max_wait=1)
+    scheduler.update(200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()) + 300)})
+    mocker.patch("xcloud_mcp.main.github_scheduler", scheduler)
+    mock_request = mocker.patch("aiohttp.ClientSession.request")
+
+    result = await main.github_api_request("/repos/a/b")
+
+    assert result["error"]["type"] == "RATE_LIMITED"
+    assert result["error"]["retry_after"] > 200
+    mock_request.assert_not_called()
+
+
+async def test_workers_share_budget_and_backoff(tmp_path):
+    """
+    Tests that a budget or back-off seen by one worker applies to the others.
+    """
+    path = str(tmp_path / "rate-limit.state")
+    first = RateLimitScheduler(rate=100, burst=10, reserve=50, max_wait=0.5, shared=SharedRateLimitState(path))
+    second = RateLimitScheduler(rate=100, burst=10, reserve=50, max_wait=0.5, shared=SharedRateLimitState(path))
+
+    # Budget observed by the first worker reaches the second
+    first.update(200, {
+        "X-RateLimit-Remaining": "20",
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Reset": str(int(time.time()) + 600),
+    })
+    with pytest.raises(RateLimitExceeded):
+        await second.acquire(Priority.BULK)
+    assert second.stats()["remaining"] == 20
+
+    # A secondary rate limit hit by the second worker pauses the first
+    second.update(429, {"Retry-After": "120"})
+    with pytest.raises(RateLimitExceeded):
+        await first.acquire(Priority.INTERACTIVE)
+    assert first.stats()["blocked_for"] > 100
+
+
+async def test_content_pacer_spaces_concurrent_creations():
+    """
+    Tests that concurrent content creations start at least one interval apart.
+    """
+    pacer = ContentPacer(interval=0.05)
+    starts = []
+
+    async def create():
+        await pacer.wait()
+        starts.append(time.monotonic())
+
+    await asyncio.gather(*(create() for _ in range(4)))
+
+    gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+    assert all(gap >= 0.045 for gap in gaps)
+
@@ -0,0 +1,51 @@
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import pytest
+
+from xcloud_mcp.readiness import LoopLagMonitor, failing_checks
+
+# Mark all tests in this file as async
+pytestmark = pytest.mark.asyncio
+
+
+async def test_loop_lag_monitor_detects_blocked_loop():
+    """
+    Tests that a blocking call on the event loop shows up as lag.
+    """
+    monitor = LoopLagMonitor(interval=0.01, window=1)
+    assert monitor.lag() is None
+
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        assert monitor.lag() < 0.1
+
+        # Enquanto o loop está preso, o tick vencido já conta como atraso
+        time.sleep(0.2)
+        assert monitor.lag() >= 0.15
+
+        await asyncio.sleep(0.02)
+        assert monitor.stats()["max_recent"] >= 0.15
+    finally:
+        await monitor.stop()
+
+    assert monitor.lag() is None
+
+
+async def test_failing_checks_applies_thresholds():
+    """
+    Tests that each threshold fails its own check and zero disables it.
+    """
+    thresholds = dict(max_loop_lag=0.5, max_tools_in_flight=10, max_pool_utilization=0.9, min_rate_limit_remaining=50)
+
+    assert failing_checks(0.1, 3, 0.5, 4000, **thresholds) == []
+    assert failing_checks(None, 0, 0.0, None, **thresholds) == []
+    assert failing_checks(0.8, 10, 0.95, 20, **thresholds) == [
+        "event_loop_lag", "tools_in_flight", "http_pool", "rate_limit",
+    ]
+    assert failing_checks(0.8, 10, 0.95, 20, 0, 0, 0, 0) == []
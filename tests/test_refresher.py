@@ -0,0 +1,75 @@
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import pytest
+
+from xcloud_mcp.refresher import SnapshotRefresher
+
+# Mark all tests in this file as async
+pytestmark = pytest.mark.asyncio
+
+
+async def test_refresh_keeps_previous_snapshot_on_skip_or_failure():
+    """
+    Tests that skipped or failed cycles keep the last good snapshot.
+    """
+    results = [{"v": 1}, None, RuntimeError("boom")]
+
+    async def refresh():
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    snapshot = SnapshotRefresher(refresh, interval=60, max_age=60)
+
+    assert await snapshot.refresh_now() is True
+    assert await snapshot.refresh_now() is False
+    assert await snapshot.refresh_now() is False
+
+    data, age = snapshot.get()
+    assert data == {"v": 1}
+    assert age >= 0
+    assert snapshot.failures == 1
+
+
+async def test_snapshot_expires_after_max_age(mocker):
+    """
+    Tests that a stale snapshot is no longer served.
+    """
+    clock = mocker.patch("xcloud_mcp.refresher.time.monotonic", return_value=100.0)
+
+    async def refresh():
+        return {"v": 1}
+
+    snapshot = SnapshotRefresher(refresh, interval=10, max_age=30)
+    await snapshot.refresh_now()
+
+    clock.return_value = 120.0
+    assert snapshot.get() == ({"v": 1}, 20.0)
+    clock.return_value = 131.0
+    assert snapshot.get() is None
+
+
+async def test_background_task_refreshes_on_schedule():
+    """
+    Tests that start() runs refresh cycles until stop() is called.
+    """
+    calls = 0
+
+    async def refresh():
+        nonlocal calls
+        calls += 1
+        return {"calls": calls}
+
+    snapshot = SnapshotRefresher(refresh, interval=0.01, max_age=60)
+    snapshot.start()
+    await asyncio.sleep(0.05)
+    await snapshot.stop()
+
+    assert calls >= 2
+    assert not snapshot.running
+    assert SnapshotRefresher(refresh, interval=0).enabled is False
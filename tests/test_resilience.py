@@ -0,0 +1,156 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import pytest
+
+from xcloud_mcp import resilience
+from xcloud_mcp.rate_limit import RateLimitScheduler
+from xcloud_mcp.resilience import CircuitBreaker, CircuitBreakers
+from xcloud_mcp.response_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_breaker_opens_probes_and_recovers():
+    """
+    Tests closed -> open -> half-open (single probe) -> open -> closed transitions.
+    """
+    clock = FakeClock()
+    breaker = CircuitBreaker("api.github.com", failure_threshold=3, reset_timeout=30, clock=clock)
+
+    for _ in range(3):
+        assert breaker.before_call() == (None, False)
+        breaker.record(True)
+    assert breaker.state == resilience.OPEN
+    assert breaker.before_call() == (30, False)
+
+    # After the reset timeout only one probe goes through
+    clock.now += 30
+    assert breaker.state == resilience.HALF_OPEN
+    assert breaker.before_call() == (None, True)
+    assert breaker.before_call()[0] is not None
+
+    # A failed probe reopens the circuit for another full timeout
+    breaker.record(True, probe=True)
+    assert breaker.state == resilience.OPEN
+    assert breaker.stats()["trips"] == 2
+
+    # A cancelled probe releases the slot; a successful one closes the circuit
+    clock.now += 30
+    assert breaker.before_call() == (None, True)
+    breaker.record(None, probe=True)
+    assert breaker.before_call() == (None, True)
+    breaker.record(False, probe=True)
+    assert breaker.state == resilience.CLOSED
+    assert breaker.stats()["consecutive_failures"] == 0
+    assert breaker.stats()["rejected"] == 2
+
+
+def test_breaker_calls_authorized_while_closed_do_not_touch_the_probe():
+    """
+    Tests that a call started before the circuit opened cannot release,
+    take over or settle the half-open probe when it finishes late.
+    """
+    clock = FakeClock()
+    breaker = CircuitBreaker("api.github.com", failure_threshold=1, reset_timeout=30, clock=clock)
+
+    slow_call = breaker.before_call()
+    assert slow_call == (None, False)
+    breaker.before_call()
+    breaker.record(True)
+    assert breaker.state == resilience.OPEN
+
+    clock.now += 30
+    assert breaker.before_call() == (None, True)
+
+    # The slow call finishing (either way) leaves the probe in charge
+    breaker.record(None, probe=slow_call[1])
+    breaker.record(False, probe=slow_call[1])
+    assert breaker.state == resilience.HALF_OPEN
+    assert breaker.before_call()[0] is not None
+
+    breaker.record(False, probe=True)
+    assert breaker.state == resilience.CLOSED
+
+
+def test_transient_classification_and_backoff_bounds():
+    """
+    Tests which outcomes count as transient and that delays stay within the cap.
+    """
+    assert resilience.is_transient("503", {"error": {}}) is True
+    assert resilience.is_transient("none", {"error": {"type": "NETWORK_ERROR"}}) is True
+    assert resilience.is_transient("404", {"error": {}}) is False
+    assert resilience.is_transient("200", {"id": 1}) is False
+    assert resilience.is_transient("none", {"error": {"type": "RATE_LIMITED"}}) is None
+    assert all(0 <= resilience.backoff_delay(attempt, base=0.5, cap=2) <= 2 for attempt in range(10))
+
+
+@pytest.fixture
+def github_server(mocker):
+    """Isolated GitHub client state with a mocked aiohttp request."""
+    from xcloud_mcp import main
+
+    mocker.patch("xcloud_mcp.main.GITHUB_TOKEN", "test-token")
+    mocker.patch("xcloud_mcp.main.github_cache", ResponseCache(max_entries=0))
+    mocker.patch("xcloud_mcp.main.github_scheduler", RateLimitScheduler(rate=1e6, burst=1e6, reserve=0))
+    mocker.patch("xcloud_mcp.main.github_breakers", CircuitBreakers(failure_threshold=2, reset_timeout=60))
+    mocker.patch("xcloud_mcp.resilience.backoff_delay", return_value=0.001)
+    request = mocker.patch("aiohttp.ClientSession.request")
+    response = request.return_value.__aenter__.return_value
+    response.headers = {}
+    response.reason = "Bad Gateway"
+    return main, request, response
+
+
+@pytest.mark.asyncio
+async def test_idempotent_requests_are_retried_and_breaker_fails_fast(github_server):
+    """
+    Tests that a GET survives one 502, a POST is not retried, and an open
+    circuit answers without touching the network.
+    """
+    from xcloud_mcp import github_client
+
+    main, request, response = github_server
+    statuses = iter([502, 200])
+
+    async def json(loads=None, content_type="application/json"):
+        return {"id": 1} if response.status == 200 else None
+
+    def status_side_effect(*args, **kwargs):
+        response.status = next(statuses)
+        return request.return_value
+
+    request.side_effect = status_side_effect
+    response.json.side_effect = json
+    try:
+        assert await main.github_api_request("/repos/a/b") == {"id": 1}
+        assert request.call_count == 2
+
+        # POST: a single attempt, never retried
+        statuses = iter([502])
+        created = await main.github_api_request("/repos/a/b/issues", method="POST", data={})
+        assert created["error"]["status_code"] == 502
+        assert created["error"]["message"] == "Bad Gateway"
+        assert request.call_count == 3
+
+        # Second consecutive failure trips the breaker; the retry is cut short
+        statuses = iter([502])
+        tripped = await main.github_api_request("/repos/a/c")
+        assert request.call_count == 4
+        rejected = await main.github_api_request("/repos/a/d")
+    finally:
+        await github_client.close_session()
+
+    assert tripped["error"]["type"] == "CIRCUIT_OPEN"
+    assert rejected["error"]["type"] == "CIRCUIT_OPEN"
+    assert rejected["error"]["retry_after"] == 60
+    assert request.call_count == 4
+    assert main.github_breakers.stats()["api.github.com"]["state"] == "open"
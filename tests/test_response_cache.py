@@ -0,0 +1,105 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import pytest
+
+from xcloud_mcp.response_cache import ResponseCache
+
+
+def test_store_and_conditional_headers():
+    """
+    Tests that validators are stored and replayed as conditional headers.
+    """
+    cache = ResponseCache(max_entries=10, max_bytes=10_000, ttl=60)
+
+    cache.store("GET", "/repos/a/b", {"id": 1}, {"ETag": 'W/"abc"', "Last-Modified": "Mon"})
+    entry = cache.get("GET", "/repos/a/b")
+
+    assert entry.data == {"id": 1}
+    assert entry.conditional_headers() == {
+        "If-None-Match": 'W/"abc"',
+        "If-Modified-Since": "Mon",
+    }
+
+
+def test_responses_without_validators_are_not_stored():
+    """
+    Tests that responses that cannot be revalidated are skipped.
+    """
+    cache = ResponseCache(max_entries=10, max_bytes=10_000, ttl=60)
+
+    cache.store("GET", "/repos/a/b", {"id": 1}, {})
+
+    assert cache.get("GET", "/repos/a/b") is None
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    """
+    Tests LRU eviction on both the entry count and the memory bound.
+    """
+    cache = ResponseCache(max_entries=2, max_bytes=10_000, ttl=60)
+    for name in ["a", "b"]:
+        cache.store("GET", f"/{name}", {"name": name}, {"ETag": name})
+    cache.get("GET", "/a")  # /a becomes the most recently used
+    cache.store("GET", "/c", {"name": "c"}, {"ETag": "c"})
+
+    assert cache.get("GET", "/b") is None
+    assert cache.get("GET", "/a") is not None
+    assert cache.evictions == 1
+
+    small = ResponseCache(max_entries=10, max_bytes=40, ttl=60)
+    small.store("GET", "/x", {"payload": "x" * 10}, {"ETag": "x"})
+    small.store("GET", "/y", {"payload": "y" * 10}, {"ETag": "y"})
+
+    assert small.get("GET", "/x") is None
+    assert small.stats()["bytes"] <= 40
+
+
+def test_ttl_expiry(mocker):
+    """
+    Tests that entries expire after the TTL and are refreshed by revalidation.
+    """
+    clock = mocker.patch("xcloud_mcp.response_cache.time.monotonic", return_value=100.0)
+    cache = ResponseCache(max_entries=10, max_bytes=10_000, ttl=30)
+    entry = cache.store("GET", "/a", {"id": 1}, {"ETag": "a"})
+
+    clock.return_value = 125.0
+    cache.mark_revalidated(entry)
+    clock.return_value = 150.0
+    assert cache.get("GET", "/a") is entry
+
+    clock.return_value = 160.0
+    assert cache.get("GET", "/a") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_github_api_request_serves_304_from_cache(mocker):
+    """
+    Tests that github_api_request replays validators and serves 304 responses from cache.
+    """
+    from xcloud_mcp import github_client, main
+
+    mocker.patch("xcloud_mcp.main.GITHUB_TOKEN", "test-token")
+    mocker.patch("xcloud_mcp.main.github_cache", ResponseCache(max_entries=10, max_bytes=10_000, ttl=60))
+    mock_request = mocker.patch("aiohttp.ClientSession.request")
+    mock_response = mock_request.return_value.__aenter__.return_value
+    mock_response.status = 200
+    mock_response.headers = {"ETag": '"v1"'}
+    mock_response.json.return_value = {"id": 42}
+
+    try:
+        first = await main.github_api_request("/repos/a/b")
+        mock_response.status = 304
+        second = await main.github_api_request("/repos/a/b")
+    finally:
+        await github_client.close_session()
+
+    assert first == second == {"id": 42}
+    assert mock_request.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+    assert mock_response.json.call_count == 1
+    stats = main.github_cache.stats()
+    assert stats["misses"] == 1
+    assert stats["revalidations"] == 1
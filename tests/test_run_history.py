@@ -0,0 +1,107 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import pytest
+
+from xcloud_mcp.run_history import RunHistory, RunHistoryStore
+
+# Mark all tests in this file as async
+pytestmark = pytest.mark.asyncio
+
+
+def _run(run_id, conclusion, minute, duration=60, queue=10, workflow_id=1, sha=None, attempt=1):
+    """Builds a run created at 2024-05-01T10:<minute>:00Z (durations in whole minutes)."""
+    return {
+        "id": run_id,
+        "workflow_id": workflow_id,
+        "conclusion": conclusion,
+        "created_at": f"2024-05-01T10:{minute:02d}:00Z",
+        "run_started_at": f"2024-05-01T10:{minute:02d}:{queue:02d}Z",
+        "updated_at": f"2024-05-01T10:{minute + duration // 60:02d}:{queue:02d}Z",
+        "run_attempt": attempt,
+        "head_sha": sha or f"sha-{run_id}",
+    }
+
+
+async def test_ingest_upserts_and_watermark_follows_pending_runs():
+    """
+    Tests that known runs are updated in place and the watermark waits for pending runs.
+    """
+    history = RunHistory()
+    now = 1714557600 + 3600  # 2024-05-01T11:00:00Z
+
+    assert history.watermark(now) is None
+    assert history.ingest([_run(1, "success", 0), _run(2, None, 5), _run(3, "failure", 10)]) == 3
+    assert history.watermark(now) == "2024-05-01T10:05:00Z"
+
+    assert history.ingest([_run(2, "success", 5), _run(3, "failure", 10)]) == 1
+    assert len(history) == 3
+    assert history.watermark(now) == "2024-05-01T10:10:00Z"
+    # Runs pending for longer than the horizon no longer hold the window back
+    history.ingest([_run(4, None, 0)])
+    assert history.watermark(now + 2 * 86400) == "2024-05-01T10:10:00Z"
+
+
+async def test_stats_over_columns():
+    """
+    Tests failure rate over decisive runs, duration/queue percentiles and flakiness.
+    """
+    history = RunHistory()
+    history.ingest([
+        _run(1, "success", 0, duration=60, queue=5),
+        _run(2, "failure", 1, duration=120, queue=10, sha="abc"),
+        _run(3, "success", 2, duration=180, queue=15, sha="abc"),
+        _run(4, "cancelled", 3),
+        _run(5, "success", 4, duration=240, queue=20, attempt=2),
+        _run(6, None, 5),
+        _run(7, "timed_out", 6, workflow_id=2),
+    ])
+
+    stats = history.stats()
+
+    assert stats["runs"] == 7
+    assert stats["completed"] == 6
+    assert (stats["successes"], stats["failures"]) == (3, 2)
+    assert stats["failure_rate"] == 0.4
+    # Cancelled and timed-out runs still took 60s each
+    assert stats["duration_p50"] == 60
+    assert stats["duration_p95"] == 240
+    assert stats["queue_p50"] == 10
+    # "abc" failed and passed; run 5 passed only on a re-run
+    assert stats["flaky_commits"] == 2
+    assert stats["since"] == "2024-05-01T10:00:00Z"
+    assert history.stats(workflow_id=2)["failure_rate"] == 1.0
+
+
+async def test_trim_keeps_newest_runs():
+    """
+    Tests that the history is capped at max_runs, dropping the oldest runs.
+    """
+    history = RunHistory(max_runs=3)
+    history.ingest([_run(run_id, "success", minute) for run_id, minute in ((1, 30), (2, 10), (3, 20), (4, 40))])
+
+    assert sorted(history.run_id) == [1, 3, 4]
+    assert history.ingest([_run(3, "failure", 20)]) == 1
+    assert len(history) == 3
+    assert history.stats()["failures"] == 1
+
+
+async def test_store_evicts_least_recently_used_repositories():
+    """
+    Tests that the store holds at most max_repos histories, evicting the least recently used.
+    """
+    store = RunHistoryStore(max_repos=2)
+    histories = {name: RunHistory() for name in ("a/1", "a/2", "a/3")}
+    histories["a/1"].ingest([_run(1, "success", 0)])
+
+    assert store.get("a/1") is None
+    store.put("a/1", histories["a/1"])
+    store.put("a/2", histories["a/2"])
+    assert store.get("a/1") is histories["a/1"]  # a/2 is now the least recently used
+    store.put("a/3", histories["a/3"])
+
+    assert store.get("a/2") is None
+    assert store.get("a/1") is histories["a/1"] and store.get("a/3") is histories["a/3"]
+    assert store.stats() == {"repositories": 2, "runs": 1, "bytes": histories["a/1"].nbytes, "evictions": 1}
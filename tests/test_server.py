@@ -30,4 +30,70 @@ pytestmark = pytest.mark.asyncio
 #                     "Is it running and accessible at http://localhost:8000?"
 #                 )
             
-#             await asyncio.sleep(wait_interval)
\ No newline at end of file
+#             await asyncio.sleep(wait_interval)
+
+def _http_client():
+    """Builds a Starlette test client around the FastMCP HTTP app."""
+    import os
+    import sys
+
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+    from starlette.testclient import TestClient
+
+    from xcloud_mcp.main import app
+
+    return TestClient(app.http_app())
+
+
+async def test_health_check_reports_rate_limit_queue():
+    """
+    Tests that /health answers ok and exposes the scheduler queue depth.
+    """
+    with _http_client() as client:
+        response = client.get("/health")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ok"
+    assert data["rate_limit"]["queue_depth"] == 0
+    assert data["coalescing"]["in_flight"] == 0
+    assert isinstance(data["circuit_breakers"], dict)
+    assert data["run_history"]["repositories"] >= 0
+
+
+async def test_metrics_endpoint_serves_prometheus_text():
+    """
+    Tests that /metrics answers in the Prometheus text format.
+    """
+    with _http_client() as client:
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE xcloud_mcp_tool_duration_seconds histogram" in response.text
+    assert "# TYPE xcloud_mcp_github_requests_in_flight gauge" in response.text
+    assert "# TYPE xcloud_mcp_event_loop_lag_seconds gauge" in response.text
+
+
+async def test_readiness_reports_checks_and_sheds_on_saturated_pool(mocker):
+    """
+    Tests that /ready answers 200 with its checks and 503 once the HTTP pool is saturated.
+    """
+    with _http_client() as client:
+        response = client.get("/ready")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "ready"
+        assert data["failing"] == []
+        assert set(data["checks"]) == {"event_loop", "tools_in_flight", "http_pool", "cache", "rate_limit"}
+
+        from xcloud_mcp import github_client
+
+        saturated = dict(github_client.pool_stats(), in_use=20, busiest_host_in_use=20, utilization=1.0)
+        mocker.patch.object(github_client, "pool_stats", return_value=saturated)
+        response = client.get("/ready")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "not_ready"
+    assert response.json()["failing"] == ["http_pool"]
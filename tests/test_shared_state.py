@@ -0,0 +1,52 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from xcloud_mcp.shared_state import SharedRateLimitState
+
+
+def test_state_is_visible_across_mappings(tmp_path):
+    """
+    Tests that values published through one mapping are read through another.
+    """
+    path = str(tmp_path / "rate-limit.state")
+    first = SharedRateLimitState(path)
+    second = SharedRateLimitState(path)
+
+    empty = second.read()
+    assert empty.remaining is None and empty.limit is None and empty.backoff_until == 0.0
+
+    first.publish_budget(42, 5000, 1_700_000_000, observed_at=123.0)
+    first.publish_backoff(500.0)
+    first.publish_backoff(400.0)  # an earlier deadline never shortens the back-off
+
+    snapshot = second.read()
+    assert (snapshot.remaining, snapshot.limit, snapshot.reset_at) == (42, 5000, 1_700_000_000)
+    assert snapshot.observed_at == 123.0
+    assert snapshot.backoff_until == 500.0
+
+    # Reopening an existing file keeps its contents
+    assert SharedRateLimitState(path).read().remaining == 42
+    first.close()
+    second.close()
+
+
+def test_publish_budget_never_overwrites_backoff(tmp_path, mocker):
+    """
+    Tests that a budget update cannot clobber a back-off written concurrently by another worker.
+    """
+    path = str(tmp_path / "rate-limit.state")
+    first = SharedRateLimitState(path)
+    second = SharedRateLimitState(path)
+    stale = first.read()
+
+    second.publish_backoff(900.0)
+    # Worker A read the state before B's back-off landed
+    mocker.patch.object(first, "read", return_value=stale)
+    first.publish_budget(10, 5000, None, observed_at=1.0)
+
+    assert second.read().backoff_until == 900.0
+    assert second.read().remaining == 10
+    first.close()
+    second.close()
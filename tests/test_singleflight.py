@@ -0,0 +1,87 @@
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import pytest
+
+from xcloud_mcp.singleflight import SingleFlight
+
+# Mark all tests in this file as async
+pytestmark = pytest.mark.asyncio
+
+
+async def test_concurrent_callers_share_one_execution():
+    """
+    Tests that concurrent calls with the same key run the factory once.
+    """
+    flight = SingleFlight()
+    release = asyncio.Event()
+    executions = 0
+
+    async def fetch():
+        nonlocal executions
+        executions += 1
+        await release.wait()
+        return {"id": 1}
+
+    callers = [asyncio.create_task(flight.do(("GET", "/a"), fetch)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*callers)
+
+    assert executions == 1
+    assert all(result == {"id": 1} for result in results)
+    assert flight.stats() == {"in_flight": 0, "executions": 1, "coalesced": 4}
+
+
+async def test_cancelling_one_caller_keeps_the_others():
+    """
+    Tests that cancelling one caller does not cancel the shared request.
+    """
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(flight.do("key", fetch))
+    second = asyncio.create_task(flight.do("key", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == "done"
+    assert first.cancelled()
+
+
+async def test_github_api_request_coalesces_identical_gets(mocker):
+    """
+    Tests that identical concurrent GETs reach GitHub only once.
+    """
+    from xcloud_mcp import github_client, main
+
+    mocker.patch("xcloud_mcp.main.GITHUB_TOKEN", "test-token")
+    mocker.patch("xcloud_mcp.main.github_singleflight", SingleFlight())
+    mock_request = mocker.patch("aiohttp.ClientSession.request")
+    mock_response = mock_request.return_value.__aenter__.return_value
+    mock_response.status = 200
+    mock_response.headers = {}
+
+    async def slow_json(**kwargs):
+        await asyncio.sleep(0.01)
+        return {"id": 7}
+
+    mock_response.json.side_effect = slow_json
+
+    try:
+        results = await asyncio.gather(*(main.github_api_request("/repos/a/b") for _ in range(3)))
+    finally:
+        await github_client.close_session()
+
+    assert results == [{"id": 7}] * 3
+    assert mock_request.call_count == 1
+    assert main.github_singleflight.coalesced == 2
@@ -1,13 +1,21 @@
+import asyncio
 import os
+import re
 import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
 
 import pytest
+from collections import OrderedDict
 
+from xcloud_mcp.rate_limit import ContentPacer
+from xcloud_mcp.run_history import RunHistoryStore
+from xcloud_mcp.singleflight import SingleFlight
 from xcloud_mcp.main import (
+    analyze_repositories,
     analyze_repository,
     create_workflow_issue,
+    create_workflow_issues,
     get_xcloud_repositories,
     monitor_ci_status,
 )
@@ -19,6 +27,12 @@ pytestmark = pytest.mark.asyncio
 @pytest.fixture
 def mock_github_api(mocker):
     """Mocks the github_api_request function."""
+    # Sem espaçamento entre criações de issue nos testes
+    mocker.patch("xcloud_mcp.main.content_pacer", ContentPacer(0))
+    mocker.patch("xcloud_mcp.main.recent_issue_creations", OrderedDict())
+    mocker.patch("xcloud_mcp.main.run_history_store", RunHistoryStore())
+    mocker.patch("xcloud_mcp.main.run_history_backfills", {})
+    mocker.patch("xcloud_mcp.main.run_history_syncs", SingleFlight())
     return mocker.patch("xcloud_mcp.main.github_api_request", autospec=True)
 
 
@@ -36,8 +50,12 @@ async def test_analyze_repository_success(mock_github_api):
     }
     mock_workflows_data = {"total_count": 1, "workflows": [{"state": "active"}]}
     mock_runs_data = {
-        "total_count": 2,
-        "workflow_runs": [{"conclusion": "success"}, {"conclusion": "failure"}],
+        # Repository-wide total, beyond the runs on the first page
+        "total_count": 40,
+        "workflow_runs": [
+            _history_run(2, "failure", "2024-05-01T11:00:00Z"),
+            _history_run(1, "success", "2024-05-01T10:00:00Z"),
+        ],
     }
 
     # Configure the mock to return different values on subsequent calls
@@ -51,7 +69,16 @@ async def test_analyze_repository_success(mock_github_api):
     assert result["repository"] == "PageCloudv1/xcloud-mcp"
     assert result["language"] == "Python"
     assert result["workflows"]["total"] == 1
+    assert result["recent_activity"]["total_runs"] == 40
+    # Each endpoint is decoded with its own projection
+    from xcloud_mcp import main
+
+    projections = {call.args[0]: call.kwargs.get("fields") for call in mock_github_api.call_args_list}
+    assert projections["/repos/PageCloudv1/xcloud-mcp"] is main.REPO_FIELDS
+    assert projections["/repos/PageCloudv1/xcloud-mcp/actions/workflows"] is main.WORKFLOWS_FIELDS
     assert result["recent_activity"]["failed_runs"] == 1
+    assert result["ci_statistics"]["failure_rate"] == 0.5
+    assert result["ci_statistics"]["duration_p50"] == 300
     assert len(result["suggestions"]) == 1
     assert result["suggestions"][0]["type"] == "reliability"
 
@@ -80,6 +107,241 @@ async def test_analyze_repository_not_found(mock_github_api):
     assert result["error"]["message"] == "Not Found"
 
 
+async def test_analyze_repository_fetches_concurrently(mock_github_api):
+    """
+    Tests that analyze_repository fetches the repo, its workflows and its run history concurrently.
+    """
+    # Arrange: every request waits until all three are in flight
+    in_flight = 0
+    all_started = asyncio.Event()
+    responses = {
+        "/repos/PageCloudv1/xcloud-mcp": {"description": "Test repo"},
+        "/repos/PageCloudv1/xcloud-mcp/actions/workflows": {"total_count": 0},
+        "/repos/PageCloudv1/xcloud-mcp/actions/runs?per_page=100": {"total_count": 0},
+    }
+
+    async def fake_request(endpoint, method="GET", data=None, **kwargs):
+        nonlocal in_flight
+        in_flight += 1
+        if in_flight == 3:
+            all_started.set()
+        await asyncio.wait_for(all_started.wait(), timeout=1)
+        return responses[endpoint]
+
+    mock_github_api.side_effect = fake_request
+
+    # Act
+    result = await analyze_repository.fn("PageCloudv1/xcloud-mcp")
+
+    # Assert
+    assert "error" not in result
+    assert result["description"] == "Test repo"
+    assert mock_github_api.call_count == 3
+
+
+def _history_run(run_id, conclusion, created_at, sha=None, attempt=1, workflow_id=7):
+    """Builds a workflow run with the fields kept by the run history."""
+    return {
+        "id": run_id,
+        "workflow_id": workflow_id,
+        "conclusion": conclusion,
+        "created_at": created_at,
+        "run_started_at": created_at[:-3] + "30Z",
+        "updated_at": created_at[:-6] + "05:30Z",
+        "run_attempt": attempt,
+        "head_sha": sha or f"{run_id:040x}",
+    }
+
+
+async def test_analyze_repository_syncs_run_history_incrementally(mock_github_api, mocker):
+    """
+    Tests that later analyses only fetch runs created since the history watermark.
+    """
+    mocker.patch("xcloud_mcp.run_history.RUN_HISTORY_SYNC_INTERVAL", 0)
+    runs_requested = []
+    pages = [
+        {"total_count": 2, "workflow_runs": [
+            _history_run(2, None, "2024-05-01T11:00:00Z"),
+            _history_run(1, "failure", "2024-05-01T10:00:00Z", sha="a" * 40),
+        ]},
+        # The pending run finished and a re-run of the failed commit passed
+        {"workflow_runs": [
+            _history_run(3, "success", "2024-05-01T12:00:00Z", sha="a" * 40, attempt=2),
+            _history_run(2, "success", "2024-05-01T11:00:00Z"),
+        ]},
+    ]
+
+    async def fake_request(endpoint, method="GET", data=None, **kwargs):
+        if "/actions/runs" in endpoint:
+            runs_requested.append(endpoint)
+            return pages.pop(0)
+        if endpoint.endswith("/actions/workflows"):
+            return {"total_count": 1, "workflows": [{"state": "active"}]}
+        return {"description": "Test repo"}
+
+    mock_github_api.side_effect = fake_request
+    mocker.patch("xcloud_mcp.run_history.time.time", return_value=1714564800)  # 2024-05-01T12:00:00Z
+
+    first = await analyze_repository.fn("PageCloudv1/xcloud-mcp")
+    second = await analyze_repository.fn("PageCloudv1/xcloud-mcp")
+
+    assert runs_requested == [
+        "/repos/PageCloudv1/xcloud-mcp/actions/runs?per_page=100",
+        "/repos/PageCloudv1/xcloud-mcp/actions/runs?per_page=100&created=%3E%3D2024-05-01T11%3A00%3A00Z",
+    ]
+    assert first["ci_statistics"]["completed"] == 1
+    assert second["ci_statistics"]["runs"] == 3
+    # The new run is added to the total GitHub reported on the first sync
+    assert second["recent_activity"]["total_runs"] == 3
+    assert second["ci_statistics"]["successes"] == 2
+    assert second["ci_statistics"]["flaky_commits"] == 1
+    assert [s["title"] for s in second["suggestions"]] == [
+        "Melhorar confiabilidade dos workflows",
+        "Investigar workflows instáveis",
+    ]
+
+
+async def test_analyze_repository_backfills_run_history_in_background(mock_github_api, mocker):
+    """
+    Tests that the first analysis answers from the first page and backfills the rest as BULK.
+    """
+    from xcloud_mcp import main
+    from xcloud_mcp.rate_limit import Priority
+
+    release = asyncio.Event()
+    first_page = "/repos/PageCloudv1/xcloud-mcp/actions/runs?per_page=100"
+    second_page = "/repos/PageCloudv1/xcloud-mcp/actions/runs?per_page=100&page=2"
+    priorities = {}
+
+    async def fake_request(endpoint, method="GET", data=None, priority=None, links=None, fields=None):
+        if endpoint == first_page:
+            links["next"] = f"{main.GITHUB_API_BASE}{second_page}"
+            return {"workflow_runs": [_history_run(2, "success", "2024-05-01T11:00:00Z")]}
+        if endpoint == second_page:
+            priorities[endpoint] = priority
+            await release.wait()
+            return {"workflow_runs": [_history_run(1, "failure", "2024-05-01T10:00:00Z")]}
+        if endpoint.endswith("/actions/workflows"):
+            return {"total_count": 1, "workflows": [{"state": "active"}]}
+        return {"description": "Test repo"}
+
+    mock_github_api.side_effect = fake_request
+
+    result = await analyze_repository.fn("PageCloudv1/xcloud-mcp")
+
+    assert result["ci_statistics"]["runs"] == 1
+    assert result["ci_statistics"]["backfilling"] is True
+    backfill = main.run_history_backfills["PageCloudv1/xcloud-mcp"]
+    release.set()
+    await backfill
+
+    assert priorities == {second_page: Priority.BULK}
+    assert main.run_history_store.get("PageCloudv1/xcloud-mcp").stats()["runs"] == 2
+    assert main.run_history_backfills == {}
+
+
+async def test_concurrent_first_analyses_share_one_run_history(mock_github_api):
+    """
+    Tests that concurrent first analyses of a repository sync once and that
+    the background backfill fills the history kept in the store.
+    """
+    from xcloud_mcp import main
+
+    release = asyncio.Event()
+    first_page = "/repos/PageCloudv1/xcloud-mcp/actions/runs?per_page=100"
+    second_page = "/repos/PageCloudv1/xcloud-mcp/actions/runs?per_page=100&page=2"
+    runs_requested = []
+
+    async def fake_request(endpoint, method="GET", data=None, priority=None, links=None, fields=None):
+        if "/actions/runs" in endpoint:
+            runs_requested.append(endpoint)
+        if endpoint == first_page:
+            await release.wait()
+            links["next"] = f"{main.GITHUB_API_BASE}{second_page}"
+            return {"workflow_runs": [_history_run(2, "success", "2024-05-01T11:00:00Z")]}
+        if endpoint == second_page:
+            return {"workflow_runs": [_history_run(1, "failure", "2024-05-01T10:00:00Z")]}
+        if endpoint.endswith("/actions/workflows"):
+            return {"total_count": 1, "workflows": [{"state": "active"}]}
+        return {"description": "Test repo"}
+
+    mock_github_api.side_effect = fake_request
+
+    analyses = asyncio.gather(
+        analyze_repository.fn("PageCloudv1/xcloud-mcp"),
+        analyze_repository.fn("PageCloudv1/xcloud-mcp"),
+    )
+    await asyncio.sleep(0.01)
+    release.set()
+    first, second = await analyses
+    await asyncio.gather(*main.run_history_backfills.values())
+
+    assert "error" not in first and "error" not in second
+    assert runs_requested == [first_page, second_page]
+    assert main.run_history_store.get("PageCloudv1/xcloud-mcp").stats()["runs"] == 2
+
+
+async def test_analyze_repository_error_cancels_pending(mock_github_api):
+    """
+    Tests that the first error is returned and pending requests are cancelled.
+    """
+    # Arrange
+    cancelled = asyncio.Event()
+    error = {"error": {"type": "GITHUB_API_ERROR", "status_code": 404, "message": "Not Found"}}
+
+    async def fake_request(endpoint, method="GET", data=None, **kwargs):
+        if endpoint.endswith("/actions/workflows"):
+            return error
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    mock_github_api.side_effect = fake_request
+
+    # Act
+    result = await analyze_repository.fn("PageCloudv1/xcloud-mcp")
+    await asyncio.sleep(0)
+
+    # Assert
+    assert result == error
+    assert cancelled.is_set()
+
+
+async def test_analyze_repository_runs_error_first_cancels_pending(mock_github_api):
+    """
+    Tests that a failing run-history sync is returned at once and cancels the other requests.
+    """
+    cancelled = []
+    error = {"error": {"type": "GITHUB_API_ERROR", "status_code": 403, "message": "Forbidden"}}
+
+    async def fake_request(endpoint, method="GET", data=None, **kwargs):
+        if "/actions/runs" in endpoint:
+            return error
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(endpoint)
+            raise
+        return {"error": {"type": "GITHUB_API_ERROR", "status_code": 404, "message": "Not Found"}}
+
+    mock_github_api.side_effect = fake_request
+
+    result = await asyncio.wait_for(analyze_repository.fn("PageCloudv1/xcloud-mcp"), timeout=2)
+    await asyncio.sleep(0)
+
+    assert result == error
+    # A failed sync leaves nothing behind in the run-history store
+    from xcloud_mcp import main
+
+    assert main.run_history_store.stats()["repositories"] == 0
+    assert sorted(cancelled) == [
+        "/repos/PageCloudv1/xcloud-mcp",
+        "/repos/PageCloudv1/xcloud-mcp/actions/workflows",
+    ]
+
+
 async def test_analyze_repository_invalid_url():
     """
     Tests the analyze_repository tool with an invalid URL format.
@@ -273,6 +535,18 @@ async def test_monitor_ci_status_empty_runs(mock_github_api):
     assert len(result) == 0
 
 
+async def test_monitor_ci_status_zero_limit(mock_github_api):
+    """
+    Tests that a non-positive limit returns no runs without calling GitHub.
+    """
+    # Act
+    result = await monitor_ci_status.fn("PageCloudv1/test-repo", 0)
+
+    # Assert
+    assert result == []
+    mock_github_api.assert_not_called()
+
+
 async def test_monitor_ci_status_exception(mock_github_api):
     """
     Tests the monitor_ci_status tool when an exception occurs.
@@ -291,6 +565,96 @@ async def test_monitor_ci_status_exception(mock_github_api):
     assert "Erro: Connection error" in result["error"]
 
 
+def _run(run_id, status, conclusion, created_at):
+    """Builds a minimal workflow run payload."""
+    return {
+        "id": run_id,
+        "name": "CI",
+        "status": status,
+        "conclusion": conclusion,
+        "head_branch": "main",
+        "head_sha": f"{run_id:040d}",
+        "actor": {"login": "testuser"},
+        "created_at": created_at,
+        "html_url": f"https://github.com/PageCloudv1/test-repo/actions/runs/{run_id}",
+    }
+
+
+async def test_monitor_ci_status_incremental_cursor(mock_github_api):
+    """
+    Tests that a cursor returns only new runs or runs whose status changed.
+    """
+    # Arrange
+    repo = "PageCloudv1/test-repo"
+    first_page = {
+        "workflow_runs": [
+            _run(2, "in_progress", None, "2025-09-29T11:00:00Z"),
+            _run(1, "completed", "success", "2025-09-29T10:00:00Z"),
+        ]
+    }
+    mock_github_api.return_value = first_page
+
+    # Act: start watching
+    first = await monitor_ci_status.fn(repo, 2, cursor="")
+
+    # Assert: everything is new on the first call
+    assert [run["id"] for run in first["runs"]] == [2, 1]
+    assert first["changed"] is True
+
+    # Act: nothing changed
+    mock_github_api.return_value = {"workflow_runs": [_run(2, "in_progress", None, "2025-09-29T11:00:00Z")]}
+    second = await monitor_ci_status.fn(repo, 2, cursor=first["cursor"])
+
+    # Assert: the window starts at the oldest open run
+    assert second["runs"] == []
+    assert second["changed"] is False
+    assert "created=%3E%3D2025-09-29T11%3A00%3A00Z" in mock_github_api.call_args.args[0]
+
+    # Act: the open run finished and a new one started
+    mock_github_api.return_value = {
+        "workflow_runs": [
+            _run(3, "queued", None, "2025-09-29T12:00:00Z"),
+            _run(2, "completed", "failure", "2025-09-29T11:00:00Z"),
+        ]
+    }
+    third = await monitor_ci_status.fn(repo, 2, cursor=second["cursor"])
+
+    # Assert
+    assert [(run["id"], run["status"]) for run in third["runs"]] == [(3, "queued"), (2, "completed")]
+
+
+async def test_monitor_ci_status_long_poll(mock_github_api, mocker):
+    """
+    Tests that wait holds the call open until a change shows up.
+    """
+    # Arrange
+    mocker.patch("xcloud_mcp.ci_watch.WATCH_POLL_INTERVAL", 0.01)
+    repo = "PageCloudv1/test-repo"
+    open_run = {"workflow_runs": [_run(1, "in_progress", None, "2025-09-29T10:00:00Z")]}
+    mock_github_api.return_value = open_run
+    start = await monitor_ci_status.fn(repo, 1, cursor="")
+    done_run = {"workflow_runs": [_run(1, "completed", "success", "2025-09-29T10:00:00Z")]}
+    mock_github_api.return_value = None
+    mock_github_api.side_effect = [open_run, open_run, done_run]
+
+    # Act
+    result = await monitor_ci_status.fn(repo, 1, cursor=start["cursor"], wait=5)
+
+    # Assert
+    assert mock_github_api.call_count == 4
+    assert result["runs"][0]["conclusion"] == "success"
+
+
+async def test_monitor_ci_status_invalid_cursor(mock_github_api):
+    """
+    Tests that a malformed cursor is rejected without calling GitHub.
+    """
+    result = await monitor_ci_status.fn("PageCloudv1/test-repo", cursor="not-a-cursor")
+
+    assert "Cursor inválido" in result["error"]
+    mock_github_api.assert_not_called()
+
+
 async def test_get_xcloud_repositories_success(mock_github_api):
     """
     Tests the get_xcloud_repositories tool with successful repository listing.
@@ -341,6 +705,84 @@ async def test_get_xcloud_repositories_success(mock_github_api):
     assert "regular-repo" not in [repo["name"] for repo in result]
 
 
+async def test_get_xcloud_repositories_probes_concurrently(mock_github_api, mocker):
+    """
+    Tests that workflow probes respect the concurrency limit and keep input order.
+    """
+    # Arrange
+    mocker.patch("xcloud_mcp.main.WORKFLOW_PROBE_CONCURRENCY", 2)
+    names = [f"xcloud-{i}" for i in range(6)]
+    mock_repos_data = [
+        {
+            "name": name,
+            "full_name": f"PageCloudv1/{name}",
+            "description": "",
+            "language": "Python",
+            "html_url": f"https://github.com/PageCloudv1/{name}",
+        }
+        for name in names
+    ]
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_request(endpoint, method="GET", data=None, **kwargs):
+        nonlocal in_flight, max_in_flight
+        if endpoint.startswith("/orgs/"):
+            return mock_repos_data
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # Later repos answer first to check that order is preserved
+        await asyncio.sleep(0.01 * (6 - int(endpoint.split("-")[1].split("/")[0])))
+        in_flight -= 1
+        return {"total_count": 1 if endpoint.split("/")[3] == "xcloud-3" else 0}
+
+    mock_github_api.side_effect = fake_request
+
+    # Act
+    result = await get_xcloud_repositories.fn()
+
+    # Assert
+    assert [repo["name"] for repo in result] == names
+    assert max_in_flight == 2
+    assert [repo["has_workflows"] for repo in result] == [False, False, False, True, False, False]
+
+
+async def test_get_xcloud_repositories_probe_timeout(mock_github_api, mocker):
+    """
+    Tests that a slow workflow probe falls back to error_checking_workflows.
+    """
+    # Arrange
+    mocker.patch("xcloud_mcp.main.WORKFLOW_PROBE_TIMEOUT", 0.05)
+    mock_repos_data = [
+        {
+            "name": name,
+            "full_name": f"PageCloudv1/{name}",
+            "description": "",
+            "language": "Python",
+            "html_url": f"https://github.com/PageCloudv1/{name}",
+        }
+        for name in ["xcloud-slow", "xcloud-fast"]
+    ]
+
+    async def fake_request(endpoint, method="GET", data=None, **kwargs):
+        if endpoint.startswith("/orgs/"):
+            return mock_repos_data
+        if "xcloud-slow" in endpoint:
+            await asyncio.sleep(10)
+        return {"total_count": 3}
+
+    mock_github_api.side_effect = fake_request
+
+    # Act
+    result = await get_xcloud_repositories.fn()
+
+    # Assert
+    assert result[0]["has_workflows"] is False
+    assert result[0]["error_checking_workflows"]["type"] == "NETWORK_ERROR"
+    assert result[1]["has_workflows"] is True
+    assert "error_checking_workflows" not in result[1]
+
+
 async def test_get_xcloud_repositories_api_error(mock_github_api):
     """
     Tests the get_xcloud_repositories tool when GitHub API returns an error.
@@ -444,6 +886,7 @@ async def test_github_api_request_method_validation(mocker):
     mock_session = mocker.patch("aiohttp.ClientSession.request")
     mock_response = mock_session.return_value.__aenter__.return_value
     mock_response.status = 200
+    mock_response.headers = {}
     mock_response.json.return_value = {"status": "ok"}
 
     # Act & Assert for supported methods
@@ -466,3 +909,425 @@ async def test_github_api_request_url_construction():
     endpoint = "/repos/test/repo"
     expected_url = f"{GITHUB_API_BASE}{endpoint}"
     assert expected_url == "https://api.github.com/repos/test/repo"
+
+
+# ==========================================
+# Tests for github_api_paginate
+# ==========================================
+
+
+def _paged_fake(pages):
+    """Builds a fake github_api_request serving pages linked by rel=next."""
+    calls = []
+
+    async def fake_request(endpoint, method="GET", data=None, priority=None, links=None, fields=None):
+        calls.append(endpoint)
+        match = re.search(r"[?&]page=(\d+)", endpoint)
+        index = int(match.group(1)) if match else 1
+        if index < len(pages) and links is not None:
+            links["next"] = f"https://api.github.com/orgs/PageCloudv1/repos?page={index + 1}"
+        return pages[index - 1]
+
+    return fake_request, calls
+
+
+async def test_github_api_paginate_follows_next_links(mock_github_api):
+    """
+    Tests that the paginator yields items across pages following Link headers.
+    """
+    from xcloud_mcp.main import github_api_paginate
+
+    fake_request, calls = _paged_fake([[{"id": 1}, {"id": 2}], [{"id": 3}], [{"id": 4}]])
+    mock_github_api.side_effect = fake_request
+
+    items = [item["id"] async for item in github_api_paginate("/orgs/PageCloudv1/repos")]
+
+    assert items == [1, 2, 3, 4]
+    assert calls == [
+        "/orgs/PageCloudv1/repos",
+        "/orgs/PageCloudv1/repos?page=2",
+        "/orgs/PageCloudv1/repos?page=3",
+    ]
+
+
+async def test_github_api_paginate_stops_at_limit(mock_github_api):
+    """
+    Tests that the paginator stops fetching once the limit is reached.
+    """
+    from xcloud_mcp.main import github_api_paginate
+
+    pages = [{"workflow_runs": [{"id": 1}, {"id": 2}]}, {"workflow_runs": [{"id": 3}, {"id": 4}]}]
+    fake_request, calls = _paged_fake(pages + [{"workflow_runs": [{"id": 5}]}])
+    mock_github_api.side_effect = fake_request
+
+    items = [
+        item["id"]
+        async for item in github_api_paginate("/runs", items_key="workflow_runs", limit=3)
+    ]
+
+    assert items == [1, 2, 3]
+    assert len(calls) == 2
+
+
+async def test_github_api_paginate_raises_on_error_page(mock_github_api):
+    """
+    Tests that an error payload on a later page surfaces as GitHubAPIError.
+    """
+    from xcloud_mcp.main import GitHubAPIError, github_api_paginate
+
+    error = {"error": {"type": "GITHUB_API_ERROR", "status_code": 502, "message": "Bad Gateway"}}
+    fake_request, _ = _paged_fake([[{"id": 1}], error])
+    mock_github_api.side_effect = fake_request
+
+    items = []
+    with pytest.raises(GitHubAPIError) as exc_info:
+        async for item in github_api_paginate("/orgs/PageCloudv1/repos"):
+            items.append(item)
+
+    assert items == [{"id": 1}]
+    assert exc_info.value.payload == error
+
+
+async def test_get_xcloud_repositories_reads_every_page(mock_github_api):
+    """
+    Tests that repositories beyond the first page are no longer dropped.
+    """
+    def repo(name):
+        return {
+            "name": name,
+            "full_name": f"PageCloudv1/{name}",
+            "description": "",
+            "language": "Python",
+            "html_url": f"https://github.com/PageCloudv1/{name}",
+        }
+
+    fake_pages, _ = _paged_fake([[repo("xcloud-a"), repo("other")], [repo("xcloud-b")]])
+
+    async def fake_request(endpoint, method="GET", data=None, priority=None, links=None, fields=None):
+        if endpoint.endswith("/actions/workflows"):
+            return {"total_count": 1}
+        return await fake_pages(endpoint, method, data, priority, links)
+
+    mock_github_api.side_effect = fake_request
+
+    result = await get_xcloud_repositories.fn()
+
+    assert [repo["name"] for repo in result] == ["xcloud-a", "xcloud-b"]
+
+
+async def test_get_xcloud_repositories_graphql_backend(mock_github_api, mocker):
+    """
+    Tests that the GraphQL backend replaces per-repo probes, with REST fallback.
+    """
+    mocker.patch("xcloud_mcp.github_graphql.GRAPHQL_ENABLED", True)
+    repos = [
+        {
+            "name": name,
+            "full_name": f"PageCloudv1/{name}",
+            "description": "",
+            "language": "Python",
+            "html_url": f"https://github.com/PageCloudv1/{name}",
+        }
+        for name in ["xcloud-a", "xcloud-b"]
+    ]
+    calls = []
+
+    async def fake_request(endpoint, method="GET", data=None, **kwargs):
+        calls.append(endpoint)
+        if endpoint.startswith("/orgs/"):
+            return repos
+        if endpoint == "/graphql":
+            return {
+                "data": {
+                    "r0": {
+                        "name": "xcloud-a",
+                        "nameWithOwner": "PageCloudv1/xcloud-a",
+                        "workflowFiles": {"entries": [{"name": "ci.yml"}]},
+                    },
+                    "r1": None,
+                }
+            }
+        return {"total_count": 0}
+
+    mock_github_api.side_effect = fake_request
+
+    result = await get_xcloud_repositories.fn()
+
+    assert [repo["has_workflows"] for repo in result] == [True, False]
+    assert calls.count("/graphql") == 1
+    assert calls[-1] == "/repos/PageCloudv1/xcloud-b/actions/workflows"
+
+
+# ==========================================
+# Tests for the background org snapshot
+# ==========================================
+
+
+async def test_refresh_org_snapshot_collects_repos_and_runs(mock_github_api):
+    """
+    Tests that a refresh cycle stores repositories and their recent runs.
+    """
+    from xcloud_mcp.main import _refresh_org_snapshot
+
+    repos = [
+        {
+            "name": name,
+            "full_name": f"PageCloudv1/{name}",
+            "description": "",
+            "language": "Python",
+            "html_url": f"https://github.com/PageCloudv1/{name}",
+        }
+        for name in ["xcloud-a", "xcloud-b"]
+    ]
+
+    async def fake_request(endpoint, method="GET", data=None, **kwargs):
+        if endpoint.startswith("/orgs/"):
+            return repos
+        if endpoint.endswith("/actions/workflows"):
+            return {"total_count": 1 if "xcloud-a" in endpoint else 0}
+        return {"workflow_runs": [_run(1, "completed", "success", "2025-09-29T10:00:00Z")]}
+
+    mock_github_api.side_effect = fake_request
+
+    snapshot = await _refresh_org_snapshot()
+
+    assert [repo["has_workflows"] for repo in snapshot["repositories"]] == [True, False]
+    assert snapshot["runs"]["PageCloudv1/xcloud-a"][0]["id"] == 1
+    assert snapshot["runs"]["PageCloudv1/xcloud-b"] == []
+
+
+async def test_read_tools_answer_from_snapshot(mock_github_api, mocker):
+    """
+    Tests that read tools serve the snapshot with its age and skip GitHub.
+    """
+    from xcloud_mcp.refresher import SnapshotRefresher
+
+    run = {"id": 1, "workflow": "CI", "status": "completed", "conclusion": "success"}
+    data = {
+        "repositories": [{"name": "xcloud-a", "full_name": "PageCloudv1/xcloud-a", "has_workflows": True}],
+        "runs": {"PageCloudv1/xcloud-a": [run]},
+    }
+
+    async def refresh():
+        return data
+
+    snapshot = SnapshotRefresher(refresh, interval=60, max_age=60)
+    await snapshot.refresh_now()
+    mocker.patch("xcloud_mcp.main.org_refresher", snapshot)
+
+    repos = await get_xcloud_repositories.fn()
+    runs = await monitor_ci_status.fn("PageCloudv1/xcloud-a", 5)
+
+    assert repos[0]["full_name"] == "PageCloudv1/xcloud-a"
+    assert repos[0]["snapshot_age"] >= 0
+    assert runs[0]["workflow"] == "CI"
+    assert "id" not in runs[0]
+    mock_github_api.assert_not_called()
+
+
+# ==========================================
+# Tests for analyze_repositories
+# ==========================================
+
+
+def _analysis_fake(failing_repo=None):
+    """Fake github_api_request answering the three analyze_repository calls."""
+
+    async def fake_request(endpoint, method="GET", data=None, **kwargs):
+        if failing_repo and f"/repos/{failing_repo}" in endpoint:
+            return {"error": {"type": "GITHUB_API_ERROR", "status_code": 404, "message": "Not Found"}}
+        if endpoint.endswith("/actions/workflows"):
+            return {"total_count": 0, "workflows": []}
+        if "/actions/runs" in endpoint:
+            return {"total_count": 0, "workflow_runs": []}
+        return {"description": endpoint, "language": "Python"}
+
+    return fake_request
+
+
+async def test_analyze_repositories_keeps_errors_separate(mock_github_api):
+    """
+    Tests the batch tool with one failing repository among successful ones.
+    """
+    mock_github_api.side_effect = _analysis_fake(failing_repo="PageCloudv1/missing")
+
+    result = await analyze_repositories.fn(
+        ["PageCloudv1/xcloud-a", "PageCloudv1/missing", "PageCloudv1/xcloud-b", "PageCloudv1/xcloud-a"]
+    )
+
+    assert result["total"] == 3
+    assert result["succeeded"] == 2
+    assert list(result["results"]) == ["PageCloudv1/xcloud-a", "PageCloudv1/xcloud-b"]
+    assert result["errors"]["PageCloudv1/missing"]["status_code"] == 404
+    # Same suggestion logic as the single-repo tool
+    single = await analyze_repository.fn("PageCloudv1/xcloud-a")
+    assert result["results"]["PageCloudv1/xcloud-a"]["suggestions"] == single["suggestions"]
+
+
+async def test_analyze_repositories_streams_progress(mock_github_api):
+    """
+    Tests that each finished repository is reported as a progress notification.
+    """
+    import json
+
+    from fastmcp import Client
+
+    from xcloud_mcp.main import app
+
+    mock_github_api.side_effect = _analysis_fake()
+    notifications = []
+
+    async def on_progress(progress, total, message):
+        notifications.append((progress, total, json.loads(message)["repo"]))
+
+    async with Client(app) as client:
+        await client.call_tool(
+            "analyze_repositories",
+            {"repos": ["PageCloudv1/xcloud-a", "PageCloudv1/xcloud-b"]},
+            progress_handler=on_progress,
+        )
+
+    assert [(progress, total) for progress, total, _ in notifications] == [(1, 2), (2, 2)]
+    assert {repo for _, _, repo in notifications} == {"PageCloudv1/xcloud-a", "PageCloudv1/xcloud-b"}
+
+
+async def test_create_workflow_issues_skips_existing_and_creates_missing(mock_github_api):
+    """
+    Tests the bulk rollout: one batched lookup, then created/skipped/failed per repo.
+    """
+    created = []
+
+    async def fake_request(endpoint, method="GET", data=None, priority=None, links=None, fields=None):
+        if endpoint == "/graphql":
+            return {"data": {
+                # Legacy issue without the marker, matched by title
+                "r0": {"issues": {"nodes": [{
+                    "number": 7,
+                    "title": "🔄 Implementar Workflow CI (Integração Contínua)",
+                    "url": "https://github.com/PageCloudv1/has-ci/issues/7",
+                    "body": "...",
+                }]}},
+                "r1": {"issues": {"nodes": [{"number": 3, "title": "Outra", "url": "u", "body": "sem marcador"}]}},
+                "r2": {"issues": {"nodes": []}},
+            }}
+        created.append((endpoint, data))
+        if "broken" in endpoint:
+            return {"error": {"type": "GITHUB_API_ERROR", "status_code": 410, "message": "Issues are disabled"}}
+        return {"number": 1, "html_url": f"https://github.com{endpoint}/1"}
+
+    mock_github_api.side_effect = fake_request
+
+    result = await create_workflow_issues.fn(
+        ["PageCloudv1/has-ci", "PageCloudv1/needs-ci", "PageCloudv1/broken", "not-a-repo"], "ci"
+    )
+
+    assert (result["created"], result["skipped"], result["failed"]) == (1, 1, 2)
+    assert result["results"]["PageCloudv1/has-ci"] == {
+        "status": "skipped", "issue_number": 7, "issue_url": "https://github.com/PageCloudv1/has-ci/issues/7",
+    }
+    assert result["results"]["PageCloudv1/needs-ci"]["status"] == "created"
+    assert result["results"]["PageCloudv1/broken"]["error"]["status_code"] == 410
+    assert result["results"]["not-a-repo"]["status"] == "failed"
+    # A single lookup for all repositories, then one POST per missing issue
+    assert [call.args[0] for call in mock_github_api.call_args_list].count("/graphql") == 1
+    assert sorted(endpoint for endpoint, _ in created) == [
+        "/repos/PageCloudv1/broken/issues", "/repos/PageCloudv1/needs-ci/issues",
+    ]
+    assert f"key={result['idempotency_key']} -->" in created[0][1]["body"]
+
+
+async def test_create_workflow_issues_retry_never_double_posts(mock_github_api):
+    """
+    Tests that retrying with the same key reuses the issue instead of posting again,
+    and that an issue carrying the marker is recognized by the lookup.
+    """
+    posted = []
+
+    async def fake_request(endpoint, method="GET", data=None, priority=None, links=None, fields=None):
+        if endpoint == "/graphql":
+            # The lookup does not see the new issue yet
+            return {"data": {"r0": {"issues": {"nodes": []}}}}
+        posted.append(data)
+        await asyncio.sleep(0.01)
+        return {"number": 5, "html_url": "https://github.com/PageCloudv1/repo/issues/5"}
+
+    mock_github_api.side_effect = fake_request
+
+    first, concurrent_retry = await asyncio.gather(
+        create_workflow_issues.fn(["PageCloudv1/repo"], "cd", idempotency_key="rollout-1"),
+        create_workflow_issues.fn(["PageCloudv1/repo"], "cd", idempotency_key="rollout-1"),
+    )
+    later_retry = await create_workflow_issues.fn(["PageCloudv1/repo"], "cd", idempotency_key="rollout-1")
+
+    assert len(posted) == 1
+    assert first["results"]["PageCloudv1/repo"]["issue_number"] == 5
+    assert concurrent_retry["results"]["PageCloudv1/repo"]["issue_number"] == 5
+    assert later_retry["results"]["PageCloudv1/repo"]["status"] == "skipped"
+
+    # A fresh process finds the issue through its marker, whatever the title,
+    # but only for the same rollout key
+    mock_github_api.side_effect = None
+    mock_github_api.return_value = {"data": {"r0": {"issues": {"nodes": [
+        {"number": 5, "title": "Renomeada", "url": "u", "body": posted[0]["body"]},
+    ]}}}}
+    from xcloud_mcp import main
+
+    main.recent_issue_creations.clear()
+    assert (await create_workflow_issues.fn(["PageCloudv1/repo"], "cd", idempotency_key="rollout-1"))["skipped"] == 1
+    mock_github_api.return_value = {"data": {"r0": {"issues": {"nodes": [
+        {"number": 5, "title": "🚀 Implementar Workflow CD (Entrega Contínua)", "url": "u", "body": posted[0]["body"]},
+    ]}}}}
+    other_rollout = await create_workflow_issues.fn(["PageCloudv1/repo"], "cd", idempotency_key="rollout-2")
+    assert other_rollout["skipped"] == 0
+
+
+async def test_create_workflow_issues_falls_back_to_rest_lookup(mock_github_api):
+    """
+    Tests that a failed GraphQL lookup falls back to the REST issues endpoint.
+    """
+    async def fake_request(endpoint, method="GET", data=None, priority=None, links=None, fields=None):
+        if endpoint == "/graphql":
+            return {"error": {"type": "GITHUB_API_ERROR", "status_code": 502, "message": "Bad Gateway"}}
+        if method == "GET":
+            assert "state=open&labels=workflow" in endpoint
+            return [
+                {"number": 2, "title": "🏗️ Implementar Workflow Build Especializado", "html_url": "pr", "pull_request": {"url": "x"}},
+                {"number": 1, "title": "🏗️ Implementar Workflow Build Especializado", "html_url": "issue", "body": None},
+            ]
+        raise AssertionError("nothing should be created")
+
+    mock_github_api.side_effect = fake_request
+
+    result = await create_workflow_issues.fn(["PageCloudv1/repo"], "build")
+
+    assert result["results"]["PageCloudv1/repo"] == {"status": "skipped", "issue_number": 1, "issue_url": "issue"}
+
+
+
+async def test_create_workflow_issues_finds_existing_issue_past_first_page(mock_github_api):
+    """
+    Tests that a lookup with more open issues than one page follows the REST pages.
+    """
+    from xcloud_mcp import main, workflow_templates
+
+    first_page = "/repos/PageCloudv1/repo/issues?state=open&labels=workflow&per_page=100"
+    existing_body = workflow_templates.issue_data("ci", key="rollout-1")["body"]
+
+    async def fake_request(endpoint, method="GET", data=None, priority=None, links=None, fields=None):
+        if endpoint == "/graphql":
+            return {"data": {"r0": {"issues": {
+                "pageInfo": {"hasNextPage": True},
+                "nodes": [{"number": 9, "title": "Outra", "url": "u9", "body": "sem marcador"}],
+            }}}}
+        if endpoint == first_page:
+            links["next"] = f"{main.GITHUB_API_BASE}{first_page}&page=2"
+            return [{"number": 9, "title": "Outra", "html_url": "u9", "body": "sem marcador"}]
+        if endpoint == f"{first_page}&page=2":
+            return [{"number": 4, "title": "Renomeada", "html_url": "u4", "body": existing_body}]
+        raise AssertionError("nothing should be created")
+
+    mock_github_api.side_effect = fake_request
+
+    result = await create_workflow_issues.fn(["PageCloudv1/repo"], "ci", idempotency_key="rollout-1")
+
+    assert result["results"]["PageCloudv1/repo"] == {"status": "skipped", "issue_number": 4, "issue_url": "u4"}
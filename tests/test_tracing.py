@@ -0,0 +1,132 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import pytest
+from fastmcp import Client
+from starlette.testclient import TestClient
+
+from xcloud_mcp import tracing
+from xcloud_mcp.main import app
+
+# Mark all tests in this file as async
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def tracing_enabled(mocker):
+    mocker.patch("xcloud_mcp.tracing.TRACE_ENABLED", True)
+    mocker.patch("xcloud_mcp.tracing.TRACE_SLOW_THRESHOLD", 0.0)
+    tracing.slow_traces.clear()
+
+
+async def test_spans_are_noops_outside_a_trace():
+    """
+    Tests that spans cost nothing when tracing is disabled.
+    """
+    with tracing.trace("tool:x") as root, tracing.span("github") as child:
+        assert root is None
+        assert child is None
+    assert not tracing.slow_traces
+
+
+async def test_concurrent_children_attach_to_parent(tracing_enabled):
+    """
+    Tests that spans opened in tasks hang off the span that created them.
+    """
+    async def call(name):
+        with tracing.span("github", endpoint=name):
+            await asyncio.sleep(0.02)
+
+    with tracing.trace("tool:demo") as root:
+        await asyncio.gather(call("/a"), call("/b"))
+
+    assert [child.attrs["endpoint"] for child in root.children] == ["/a", "/b"]
+    # Filhos concorrentes não são descontados duas vezes do tempo próprio
+    assert root.self_time() < 0.015
+    assert tracing.slow_traces[-1]["name"] == "tool:demo"
+
+
+async def test_slow_call_logs_breakdown(tracing_enabled, caplog):
+    """
+    Tests that calls over the threshold are logged with the span tree.
+    """
+    with tracing.trace("tool:slow"):
+        with tracing.span("json.decode"):
+            pass
+
+    assert "Chamada lenta" in caplog.text
+    assert "  json.decode" in caplog.text
+
+
+async def test_tool_trace_covers_github_calls(tracing_enabled, mocker):
+    """
+    Tests the tool -> GitHub call -> body/JSON decode -> post-processing tree.
+    """
+    mocker.patch("xcloud_mcp.main.GITHUB_TOKEN", "test-token")
+    mock_session = mocker.patch("aiohttp.ClientSession.request")
+    mock_response = mock_session.return_value.__aenter__.return_value
+    mock_response.status = 200
+    mock_response.headers = {}
+    mock_response.json.return_value = {"total_count": 0, "workflows": [], "workflow_runs": []}
+
+    async with Client(app) as client:
+        await client.call_tool("analyze_repository", {"repo_url": "PageCloudv1/xcloud-traced"})
+
+    trace = tracing.slow_traces[-1]
+    assert trace["name"] == "tool:analyze_repository"
+    names = [child["name"] for child in trace["children"]]
+    assert names.count("github") == 3
+    assert names[-1] == "postprocess"
+    github = trace["children"][0]
+    assert [child["name"] for child in github["children"]] == ["rate_limit.acquire", "http.body", "json.decode"]
+
+
+async def test_sample_stacks_collapses_busy_thread():
+    """
+    Tests that the sampling profiler attributes samples to the busy function.
+    """
+    stop = threading.Event()
+
+    def busy_loop():
+        while not stop.is_set():
+            sum(range(1000))
+
+    worker = threading.Thread(target=busy_loop)
+    worker.start()
+    try:
+        stacks = tracing.sample_stacks(worker.ident, 0.05, 0.001)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert sum(stacks.values()) > 0
+    assert any(stack.endswith("test_tracing.py:busy_loop") for stack in stacks)
+    line = tracing.collapsed(stacks).splitlines()[0]
+    assert line.rsplit(" ", 1)[1].isdigit()
+
+
+async def test_admin_routes_require_token(mocker):
+    """
+    Tests that admin routes are off without a token and reject wrong tokens.
+    """
+    with TestClient(app.http_app()) as client:
+        assert client.get("/admin/traces").status_code == 503
+
+        mocker.patch("xcloud_mcp.main.ADMIN_TOKEN", "s3cret")
+        assert client.get("/admin/traces").status_code == 401
+        response = client.get("/admin/traces", headers={"Authorization": "Bearer s3cret"})
+        assert response.status_code == 200
+        assert "traces" in response.json()
+
+        started = time.monotonic()
+        response = client.get(
+            "/admin/profile?seconds=0.05&interval=0.005", headers={"Authorization": "Bearer s3cret"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert time.monotonic() - started < 5
@@ -0,0 +1,161 @@
+import hashlib
+import hmac
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import pytest
+from starlette.testclient import TestClient
+
+from xcloud_mcp import webhooks
+from xcloud_mcp.main import app
+from xcloud_mcp.refresher import SnapshotRefresher
+from xcloud_mcp.response_cache import ResponseCache
+
+SECRET = "test-secret"
+
+WORKFLOW_RUN_PAYLOAD = {
+    "action": "completed",
+    "repository": {"full_name": "PageCloudv1/xcloud-a", "name": "xcloud-a", "owner": {"login": "PageCloudv1"}},
+    "workflow_run": {
+        "id": 2,
+        "name": "CI",
+        "status": "completed",
+        "conclusion": "failure",
+        "head_branch": "main",
+        "head_sha": "abcdef1234567",
+        "actor": {"login": "dev"},
+        "created_at": "2025-09-29T12:00:00Z",
+        "html_url": "https://github.com/PageCloudv1/xcloud-a/actions/runs/2",
+    },
+}
+
+
+def _sign(body: bytes, secret: str = SECRET) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+@pytest.fixture
+def webhook_state(mocker):
+    """Patches the secret, cache and snapshot used by the webhook route."""
+    mocker.patch("xcloud_mcp.webhooks.WEBHOOK_SECRET", SECRET)
+    cache = ResponseCache(max_entries=10, max_bytes=10_000, ttl=600)
+    for endpoint in [
+        "/repos/PageCloudv1/xcloud-a/actions/runs?per_page=10",
+        "/repos/PageCloudv1/xcloud-a/actions/workflows",
+        "/repos/PageCloudv1/xcloud-a",
+        "/repos/PageCloudv1/xcloud-ab",
+    ]:
+        cache.store("GET", endpoint, {"endpoint": endpoint}, {"ETag": endpoint})
+    mocker.patch("xcloud_mcp.main.github_cache", cache)
+
+    snapshot = SnapshotRefresher(None, interval=60, max_age=600)
+    snapshot.data = {
+        "repositories": [{"name": "xcloud-a", "full_name": "PageCloudv1/xcloud-a", "has_workflows": False}],
+        "runs": {"PageCloudv1/xcloud-a": [{"id": 1, "created_at": "2025-09-29T10:00:00Z"}]},
+    }
+    mocker.patch("xcloud_mcp.main.org_refresher", snapshot)
+    return cache, snapshot
+
+
+def _post(event: str, payload: dict, signature: str = None):
+    body = json.dumps(payload).encode()
+    headers = {"X-GitHub-Event": event, "X-Hub-Signature-256": signature or _sign(body)}
+    with TestClient(app.http_app()) as client:
+        return client.post("/webhooks/github", content=body, headers=headers)
+
+
+def test_verify_signature():
+    """
+    Tests HMAC signature verification.
+    """
+    body = b'{"zen": "Keep it logically awesome."}'
+
+    assert webhooks.verify_signature(SECRET, body, _sign(body))
+    assert not webhooks.verify_signature(SECRET, body, _sign(body, "other"))
+    assert not webhooks.verify_signature(SECRET, body, None)
+    assert not webhooks.verify_signature("", body, _sign(body, ""))
+
+
+def test_webhook_rejects_bad_signature(webhook_state):
+    """
+    Tests that unsigned deliveries are rejected and nothing is invalidated.
+    """
+    cache, _ = webhook_state
+
+    response = _post("workflow_run", WORKFLOW_RUN_PAYLOAD, signature="sha256=deadbeef")
+
+    assert response.status_code == 401
+    assert len(cache) == 4
+
+
+def test_workflow_run_updates_snapshot_and_invalidates_runs(webhook_state):
+    """
+    Tests that a workflow_run delivery updates CI state in place.
+    """
+    cache, snapshot = webhook_state
+
+    response = _post("workflow_run", WORKFLOW_RUN_PAYLOAD)
+
+    assert response.status_code == 200
+    assert response.json()["invalidated"] == 1
+    assert cache.get("GET", "/repos/PageCloudv1/xcloud-a/actions/runs?per_page=10") is None
+    assert cache.get("GET", "/repos/PageCloudv1/xcloud-a/actions/workflows") is not None
+    runs = snapshot.data["runs"]["PageCloudv1/xcloud-a"]
+    assert [run["id"] for run in runs] == [2, 1]
+    assert runs[0]["conclusion"] == "failure"
+    assert snapshot.data["repositories"][0]["has_workflows"] is True
+
+
+def test_workflow_run_for_repo_outside_snapshot_only_invalidates(webhook_state):
+    """
+    Tests that a workflow_run for a repo without snapshot runs does not seed a partial run list.
+    """
+    _, snapshot = webhook_state
+    payload = {
+        **WORKFLOW_RUN_PAYLOAD,
+        "repository": {"full_name": "PageCloudv1/xcloud-ab", "name": "xcloud-ab", "owner": {"login": "PageCloudv1"}},
+    }
+
+    response = _post("workflow_run", payload)
+
+    assert response.json()["snapshot_updated"] is False
+    assert "PageCloudv1/xcloud-ab" not in snapshot.data["runs"]
+    assert [run["id"] for run in snapshot.data["runs"]["PageCloudv1/xcloud-a"]] == [1]
+
+
+def test_push_invalidates_repo_and_touched_workflows(webhook_state):
+    """
+    Tests that a push invalidates the repo entry only, plus workflows when touched.
+    """
+    cache, _ = webhook_state
+    payload = {
+        "repository": {"full_name": "PageCloudv1/xcloud-a"},
+        "commits": [{"added": [], "modified": [".github/workflows/ci.yml"], "removed": []}],
+    }
+
+    response = _post("push", payload)
+
+    assert response.json()["invalidated"] == 2
+    assert cache.get("GET", "/repos/PageCloudv1/xcloud-a") is None
+    assert cache.get("GET", "/repos/PageCloudv1/xcloud-ab") is not None
+    assert cache.get("GET", "/repos/PageCloudv1/xcloud-a/actions/runs?per_page=10") is not None
+
+
+def test_repository_deleted_removes_it_from_snapshot(webhook_state):
+    """
+    Tests that a deleted repository disappears from the snapshot.
+    """
+    _, snapshot = webhook_state
+    payload = {
+        "action": "deleted",
+        "repository": {"full_name": "PageCloudv1/xcloud-a", "name": "xcloud-a", "owner": {"login": "PageCloudv1"}},
+    }
+
+    response = _post("repository", payload)
+
+    assert response.json()["snapshot_updated"] is True
+    assert snapshot.data["repositories"] == []
+    assert "PageCloudv1/xcloud-a" not in snapshot.data["runs"]
@@ -0,0 +1,77 @@
+import asyncio
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, ROOT)
+
+import pytest
+from fastmcp import Client
+
+from benchmarks import load
+from benchmarks.github_stub import StubConfig, repo_name
+from xcloud_mcp import workers
+
+
+def test_worker_environment_defaults_to_a_shared_cache(tmp_path, monkeypatch):
+    """
+    Tests that workers get an id, the shared state and a shared cache path.
+    """
+    monkeypatch.delenv("X_CLOUD_MCP_CACHE_PATH", raising=False)
+    env = workers.worker_environment(1, 4, "http", "127.0.0.1", 8000, str(tmp_path))
+
+    assert env["X_CLOUD_MCP_WORKER_ID"] == "1"
+    assert env["X_CLOUD_MCP_WORKER_COUNT"] == "4"
+    assert env["X_CLOUD_MCP_CACHE_PATH"].startswith(str(tmp_path))
+    assert env["X_CLOUD_MCP_SHARED_STATE"].startswith(str(tmp_path))
+
+
+def test_snapshot_features_run_single_process(mocker):
+    """
+    Tests that the refresher or webhooks keep the server in one process.
+    """
+    from xcloud_mcp import main
+
+    mocker.patch("xcloud_mcp.workers.WORKERS", 4)
+    mocker.patch("xcloud_mcp.refresher.REFRESH_INTERVAL", 60)
+    supervise = mocker.patch("xcloud_mcp.workers.supervise")
+    serve = mocker.patch("xcloud_mcp.main.asyncio.run")
+
+    main.run_server("http", "127.0.0.1", 8000)
+
+    supervise.assert_not_called()
+    serve.assert_called_once()
+    serve.call_args.args[0].close()
+
+    mocker.patch("xcloud_mcp.refresher.REFRESH_INTERVAL", 0)
+    mocker.patch("xcloud_mcp.webhooks.WEBHOOK_SECRET", "")
+    main.run_server("http", "127.0.0.1", 8000)
+
+    supervise.assert_called_once_with("http", "127.0.0.1", 8000)
+
+
+@pytest.mark.asyncio
+async def test_workers_share_github_responses():
+    """
+    Tests that sessions spread over two workers trigger a single upstream request.
+    """
+    stub = load.StubThread(StubConfig(org_size=5, latency=0))
+    api_base = stub.start()
+    process, base_url = await load.start_server(
+        "http", api_base, None, {"X_CLOUD_MCP_WORKERS": "2", "X_CLOUD_MCP_CACHE_FRESH_TTL": "60"}
+    )
+    try:
+        for _ in range(4):
+            # A new session per call, so connections land on both workers
+            async with Client(base_url + "/mcp") as client:
+                result = await client.call_tool(
+                    "monitor_ci_status", {"repo": f"PageCloudv1/{repo_name(0)}", "limit": 5}, raise_on_error=False
+                )
+                assert not result.is_error
+            await asyncio.sleep(float(workers.SHARED_FLUSH_INTERVAL) * 2)
+    finally:
+        load.stop_server(process)
+        stub.stop()
+
+    assert stub.stub.requests == 1